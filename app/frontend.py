@@ -19,6 +19,8 @@ class AuthorFrontend(frontend.ModelFrontend):
     toolbar_button = ('everything', 'everything_everything')
     # description = f"everything_everything everything_everything everything_everything "
     sortable_by = ('name', 'title')  # List of fields available for sorting
+    export_formats = ('csv', 'jsonl')
+    import_formats = ('csv', 'jsonl')
 
     @frontend.action(description='Do Everything')
     def everything(self):
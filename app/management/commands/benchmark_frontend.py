@@ -0,0 +1,308 @@
+import asyncio
+import time
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+from types import ModuleType
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.db import connections, transaction
+from django.db.models import Count
+from django.template import engines
+from django.template.loader import get_template
+from django.test import AsyncClient, Client, RequestFactory, override_settings
+from django.urls import get_resolver, path
+
+import frontend
+from app.models import Author
+from frontend import site
+from frontend.filters import facet_counts
+from frontend.forms import _build_form_class, generate_form_for_model
+from frontend.sites.plan import ModelViewPlan
+from frontend.urls import get_urlpatterns
+from frontend.views import AsyncFrontendModelView, FrontendModelView
+
+
+# the per-cell row loop of frontend/_table.html before rows were rendered by RowRenderer
+LEGACY_TABLE_ROWS = """{% load django_bootstrap5 %}
+{% for object in table.objects %}
+    <tr>
+        {% for key, value in object.items %}
+            {% if 'id' in table.fields %}
+                <td>{{ value }}</td>
+            {% else %}
+                {% if not key == 'id' %}
+                    <td>{{ value }}</td>
+                {% endif %}
+            {% endif %}
+        {% endfor %}
+        {% if option.table.inline_button %}
+            {% for inline_action in table.inline_actions %}
+                <td>
+                    <form method="post" class="needs-validation" novalidate action="{% url 'frontend' app_name=segments.1 model_name=segments.2 action=inline_action.name id=object.id %}">
+                        {% csrf_token %}
+                        {% bootstrap_button button_type="submit" content=inline_action.label %}
+                    </form>
+                </td>
+            {% endfor %}
+        {% endif %}
+        {% if option.table.change %}
+            <td>
+                <a href="{% url 'frontend' app_name=segments.1 model_name=segments.2 action="table_change" id=object.id %}">{% bootstrap_button button_type="button" content="<i class='bi bi-pencil'></i> Edit" %}</a>
+            </td>
+        {% endif %}
+    </tr>
+{% endfor %}
+"""
+
+
+class Command(BaseCommand):
+    help = "Micro-benchmarks for django-fast-frontend request paths on the demo Author model."
+
+    scenarios = ("plan", "form", "auth", "facets", "rows", "jinja2", "asgi")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scenario", choices=self.scenarios, action="append")
+        parser.add_argument("--iterations", type=int, default=10000)
+        parser.add_argument("--rows", type=int, default=1_000_000, help="Rows seeded for table scenarios.")
+        parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients of the asgi scenario.")
+
+    def handle(self, *args, **options):
+        self.rows = options["rows"]
+        self.concurrency = options["concurrency"]
+        for scenario in options["scenario"] or self.scenarios:
+            self.stdout.write(self.style.MIGRATE_HEADING(f"Scenario: {scenario}"))
+            getattr(self, f"benchmark_{scenario}")(options["iterations"])
+
+    def report(self, label, seconds, iterations):
+        self.stdout.write(f"  {label:<40} {seconds / iterations * 1e6:10.2f} us/op")
+
+    def compare(self, before, after, iterations):
+        before_seconds = timeit.timeit(before[1], number=iterations)
+        after_seconds = timeit.timeit(after[1], number=iterations)
+        self.report(before[0], before_seconds, iterations)
+        self.report(after[0], after_seconds, iterations)
+        self.stdout.write(self.style.SUCCESS(f"  speedup: {before_seconds / after_seconds:.1f}x"))
+
+    def benchmark_plan(self, iterations):
+        """Per-request derivation of view metadata vs. the precompiled plan."""
+
+        self.compare(
+            ("derive per request", lambda: ModelViewPlan.compile(site.get_model_config(Author))),
+            ("precompiled plan", lambda: site.get_model_plan(Author)),
+            iterations,
+        )
+
+    def benchmark_form(self, iterations):
+        """ModelForm class construction vs. the cached form class."""
+
+        fields = site.get_model_plan(Author).form_fields
+        self.compare(
+            ("build form class", lambda: _build_form_class.__wrapped__(Author, fields, ())),
+            ("cached form class", lambda: generate_form_for_model(Author, fields)),
+            iterations,
+        )
+
+    def benchmark_auth(self, iterations):
+        """Per-request authentication resolution vs. the memoized site attributes.
+
+        The old path instantiated the global config and checked the URL
+        resolver for the global check, the model check and the sidebar.
+        """
+
+        request = RequestFactory().get("/app/author/")
+        request.user = User(username="benchmark")
+        model_config = site.get_model_config(Author)
+
+        def resolve_per_request():
+            global_config = site.get_global_config()
+            for _ in range(3):
+                global_config()
+                authentication = global_config.login_required and settings.AUTHENTICATION_BACKENDS and \
+                    "account_login" in get_resolver(None).reverse_dict.keys()
+            return authentication and request.user.is_authenticated
+
+        def memoized():
+            FrontendModelView._check_global_auth(request)
+            FrontendModelView._check_model_auth(request, model_config)
+            return site.get_sidebar_registry(request=request)
+
+        self.compare(
+            ("resolve per request", resolve_per_request),
+            ("memoized site attributes", memoized),
+            iterations,
+        )
+
+    def seed_authors(self, rows, batch_size=10000):
+        """Bulk-inserts `rows` authors spread over 500 names and 5 titles."""
+
+        titles = ("Dr", "Mr", "Ms", "Mrs", "Drs")
+        for start in range(0, rows, batch_size):
+            Author.objects.bulk_create(
+                Author(name=f"Author {index % 500}", title=titles[index % len(titles)])
+                for index in range(start, min(start + batch_size, rows))
+            )
+
+    def benchmark_facets(self, iterations):
+        """One query per filter field vs. a single UNION ALL facet query.
+
+        Seeds `--rows` authors inside a transaction that is rolled back, and
+        caps iterations at 10 because every run scans the whole table.
+        """
+
+        iterations = min(iterations, 10)
+        fields = ("name", "title")
+        with transaction.atomic():
+            self.seed_authors(self.rows)
+            objects = Author.objects.filter(name__startswith="Author 1")
+
+            def per_field():
+                return {
+                    field: dict(objects.order_by().values_list(field).annotate(count=Count("pk")))
+                    for field in fields
+                }
+
+            self.compare(
+                (f"query per field ({self.rows} rows)", per_field),
+                (f"single union query ({self.rows} rows)", lambda: facet_counts({field: objects for field in fields})),
+                iterations,
+            )
+            transaction.set_rollback(True)
+
+    def benchmark_rows(self, iterations):
+        """Template-tag row loop vs. the RowRenderer at 100 and 1000 rows per page.
+
+        Caps iterations at 100 because every run renders a whole page.
+        """
+
+        iterations = min(iterations, 100)
+        plan = site.get_model_plan(Author)
+        legacy = engines["django"].from_string(LEGACY_TABLE_ROWS)
+        compiled = get_template("frontend/_table.html")
+        for rows in (100, 1000):
+            context = {
+                "option": plan.option,
+                "segments": ["", "app", "author", ""],
+                "csrf_token": "benchmark",
+                "table": {
+                    "objects": [{"name": f"Author {index}", "title": "Dr", "id": index} for index in range(rows)],
+                    "columns": ("name", "title"),
+                    "fields": ("name", "title", *plan.inline_button),
+                    "inline_actions": plan.inline_actions,
+                },
+            }
+            self.compare(
+                (f"template tags per row ({rows} rows)", lambda: legacy.render(context)),
+                (f"row renderer ({rows} rows)", lambda: compiled.render(context)),
+                iterations,
+            )
+
+    def benchmark_jinja2(self, iterations):
+        """DTL vs. Jinja2 rendering of a whole list page at 100 and 1000 rows.
+
+        Skipped without Jinja2; caps iterations at 100 like `rows`.
+        """
+
+        from importlib.util import find_spec
+
+        if find_spec("jinja2") is None:
+            self.stdout.write(self.style.WARNING("  skipped: pip install django-fast-frontend[jinja2]"))
+            return
+
+        from frontend.jinja import get_jinja2_engine
+
+        iterations = min(iterations, 100)
+        plan = site.get_model_plan(Author)
+        request = RequestFactory().get("/app/author/")
+        request.user = User(username="benchmark")
+        dtl = get_template("frontend/site.html")
+        jinja2 = get_jinja2_engine().get_template("frontend/site.html")
+        for rows in (100, 1000):
+            objects = [{"name": f"Author {index}", "title": "Dr", "id": index} for index in range(rows)]
+            context = site.get_site_meta({
+                "option": plan.option,
+                "site": plan.site,
+                "table": {
+                    "objects": Paginator(objects, rows).get_page(1),
+                    "columns": ("name", "title"),
+                    "fields": ("name", "title", *plan.inline_button),
+                    "inline_actions": plan.inline_actions,
+                    "toolbar_actions": plan.toolbar_actions,
+                    "sort_fields": plan.sortable_by,
+                    "filter_specs": (),
+                },
+            }, request=request)
+            # compile the included templates before timing
+            dtl.render(context, request)
+            jinja2.render(context, request)
+            self.compare(
+                (f"django templates ({rows} rows)", lambda: dtl.render(context, request)),
+                (f"jinja2 templates ({rows} rows)", lambda: jinja2.render(context, request)),
+                iterations,
+            )
+
+    def benchmark_asgi(self, iterations):
+        """Sync view under WSGI threads vs. the async view under ASGI.
+
+        Serves `iterations` list pages (capped at 200) to `--concurrency`
+        clients at once: test clients in a thread pool against
+        FrontendModelView, and async test clients in one event loop against
+        AsyncFrontendModelView. The authors (`--rows`, capped at 10000) are
+        committed so every thread sees them, and deleted afterwards.
+        """
+
+        iterations = min(iterations, 200)
+        rows = min(self.rows, 10000)
+        concurrency = self.concurrency
+        urlconfs = {}
+        for view_class in (FrontendModelView, AsyncFrontendModelView):
+            urlconfs[view_class] = ModuleType(f"benchmark_{view_class.__name__}")
+            urlconfs[view_class].urlpatterns = [
+                path("accounts/", frontend.accounts.urls),
+                path("", (get_urlpatterns(view_class), "", site.name)),
+            ]
+        hosts = [*settings.ALLOWED_HOSTS, "testserver"]
+        url = "/app/author/?q=Author+1&s=-name&page=2"
+        user = User.objects.create_user("benchmark-asgi")
+        last_pk = Author.objects.order_by("-pk").values_list("pk", flat=True).first() or 0
+
+        def wsgi_worker(count):
+            client = Client()
+            client.force_login(user)
+            try:
+                for _ in range(count):
+                    assert client.get(url).status_code == 200
+            finally:
+                connections.close_all()
+
+        async def asgi_worker(count):
+            client = AsyncClient()
+            await client.aforce_login(user)
+            for _ in range(count):
+                assert (await client.get(url)).status_code == 200
+
+        async def asgi_load(counts):
+            await asyncio.gather(*(asgi_worker(count) for count in counts))
+
+        counts = [iterations // concurrency + (index < iterations % concurrency) for index in range(concurrency)]
+        try:
+            self.seed_authors(rows)
+            with override_settings(ROOT_URLCONF=urlconfs[FrontendModelView], ALLOWED_HOSTS=hosts):
+                start = time.perf_counter()
+                with ThreadPoolExecutor(concurrency) as executor:
+                    list(executor.map(wsgi_worker, counts))
+                wsgi_seconds = time.perf_counter() - start
+            with override_settings(ROOT_URLCONF=urlconfs[AsyncFrontendModelView], ALLOWED_HOSTS=hosts):
+                start = time.perf_counter()
+                asyncio.run(asgi_load(counts))
+                asgi_seconds = time.perf_counter() - start
+        finally:
+            Author.objects.filter(pk__gt=last_pk).delete()
+            user.delete()
+
+        self.report(f"wsgi threads ({concurrency} clients, {rows} rows)", wsgi_seconds, iterations)
+        self.report(f"asgi async view ({concurrency} clients, {rows} rows)", asgi_seconds, iterations)
+        self.stdout.write(f"  requests/s: {iterations / wsgi_seconds:.0f} wsgi, {iterations / asgi_seconds:.0f} asgi")
+        self.stdout.write(self.style.SUCCESS(f"  speedup: {wsgi_seconds / asgi_seconds:.1f}x"))
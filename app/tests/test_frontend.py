@@ -1,6 +1,7 @@
 import pytest
 from django.contrib.admin.utils import display_for_field
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import Client
 
 from app.models import Author
@@ -161,3 +162,69 @@ def test_add_page_omits_non_editable_fields_from_generated_form():
     assert b'name="title"' in response.content
     assert b'name="created_at"' not in response.content
     assert b"Created at" not in response.content
+
+
+def _author_queries(captured):
+    return [query["sql"] for query in captured if '"app_author"' in query["sql"]]
+
+
+@pytest.mark.django_db
+def test_add_page_skips_list_queries(django_assert_max_num_queries):
+    """The add form must not run filter-option, count or page queries."""
+    user = User.objects.create_user(username="addqueries", password="top_secret")
+    Author.objects.create(name="Ada", title="Dr")
+
+    client = Client()
+    client.force_login(user)
+
+    # at most the session + user lookup
+    with django_assert_max_num_queries(2) as captured:
+        response = client.get("/app/author/table_add")
+
+    assert response.status_code == 200
+    assert b'name="name"' in response.content
+    assert _author_queries(captured) == []
+
+
+@pytest.mark.django_db
+def test_change_page_runs_only_the_object_lookup(django_assert_max_num_queries):
+    user = User.objects.create_user(username="changequeries", password="top_secret")
+    author = Author.objects.create(name="Ada", title="Dr")
+
+    client = Client()
+    client.force_login(user)
+
+    with django_assert_max_num_queries(3) as captured:
+        response = client.get(f"/app/author/table_change/{author.id}")
+
+    author_queries = _author_queries(captured)
+    assert response.status_code == 200
+    assert b'value="Ada"' in response.content
+    assert len(author_queries) == 1
+    assert "DISTINCT" not in author_queries[0]
+    assert "COUNT(" not in author_queries[0]
+
+
+@pytest.mark.django_db
+def test_list_page_still_runs_list_queries(django_assert_max_num_queries):
+    """Regression guard: the list page keeps its filter, count and page queries."""
+    cache.clear()
+    user = User.objects.create_user(username="listqueries", password="top_secret")
+    Author.objects.create(name="Ada", title="Dr")
+
+    client = Client()
+    client.force_login(user)
+
+    with django_assert_max_num_queries(6) as captured:
+        response = client.get("/app/author/")
+
+    author_queries = _author_queries(captured)
+    assert response.status_code == 200
+    assert b"Ada" in response.content
+    assert len([sql for sql in author_queries if "DISTINCT" in sql]) == 2
+    assert len([sql for sql in author_queries if "COUNT(" in sql]) == 1
+
+    with django_assert_max_num_queries(6) as captured:
+        client.get("/app/author/")
+
+    assert not [sql for sql in _author_queries(captured) if "DISTINCT" in sql]
@@ -1,3 +1,5 @@
+__version__ = '0.5.0'
+
 from .sites import  site, \
                     FrontendSite, \
                     ModelFrontend, \
@@ -0,0 +1,35 @@
+from django.http import QueryDict
+from frontend.filters import invalidate_filter_options
+from frontend.search import reindex_rows
+from frontend.versions import bump_model_version
+
+ACTION_KINDS = ('toolbar', 'inline', 'bulk')
+
+
+def call_action(model_config, request, kind, handler, object_id=None, ids=(), query=''):
+    """
+    Calls an action handler with the arguments of its kind and returns what
+    it returns: toolbar handlers get nothing, or with `filtered` the rows
+    matching the list query string `query`; inline handlers get the object
+    `object_id`; bulk handlers get the queryset of `ids`, or each of its
+    objects with `per_object`. Rows are scoped by get_queryset(request).
+    """
+
+    if kind == 'inline':
+        return handler(model_config.get_queryset(request).get(pk=object_id))
+    if kind == 'bulk':
+        queryset = model_config.get_queryset(request).filter(pk__in=ids)
+        if getattr(handler, 'per_object', False) is True:
+            for object in queryset.iterator():
+                handler(object)
+            return None
+    elif getattr(handler, 'filtered', False) is True:
+        queryset = model_config.get_filtered_queryset(request, QueryDict(query)).order_by()
+    else:
+        return handler()
+    # set-based writes such as update() send no signals
+    with reindex_rows(queryset):
+        result = handler(queryset)
+    bump_model_version(model_config.model)
+    invalidate_filter_options(model_config.model)
+    return result
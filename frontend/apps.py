@@ -1,11 +1,21 @@
 import importlib
 
 from django.apps import AppConfig
+from django.core import checks
+from django.core.signals import request_started
 from django.conf import settings
 from django.urls import include, path
 from django.apps import apps
 
 import frontend.sites
+from frontend.filters import connect_filter_option_signals
+from frontend.search import connect_search_index_signals
+from frontend.versions import check_version_cache, connect_model_version_signals
+
+
+def compile_navigation(sender=None, **kwargs):
+    request_started.disconnect(dispatch_uid='frontend_compile_navigation')
+    frontend.site.compile_navigation()
 
 
 class FrontendConfig(AppConfig):
@@ -20,6 +30,25 @@ class FrontendConfig(AppConfig):
         # autodiscover frontend.py in installed apps
         frontend.site.autodiscover_modules()
 
+        # precompile per-model view plans once the registry is complete
+        frontend.site.compile_model_plans()
+
+        # precompute the navbar, home cards and per-visibility sidebars on the
+        # first request; they read the URLConf, which is not imported while apps load
+        request_started.connect(compile_navigation, dispatch_uid='frontend_compile_navigation')
+
+        # keep cached list_filter options in sync with model writes
+        connect_filter_option_signals()
+
+        # keep full-text search indexes (SQLite FTS5) in sync with model writes
+        connect_search_index_signals()
+
+        # move per-model change versions (conditional GET validators) forward on writes
+        connect_model_version_signals()
+
+        # change versions have to be shared by all worker processes
+        checks.register(check_version_cache)
+
         # add frontend urlpatterns
         def get_frontend_url():
             frontend_url = getattr(settings, 'FRONTEND_URL', '')
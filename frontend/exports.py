@@ -0,0 +1,117 @@
+import csv
+from itertools import islice
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+# cells starting with these are read as formulas by spreadsheet applications
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class _Echo:
+    """
+    A file-like object whose write() returns the line csv.writer gives it.
+    """
+
+    def write(self, value):
+        return value
+
+
+def _csv_cell(value):
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _batches(rows, size):
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+async def _abatches(rows, size):
+    batch = []
+    async for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _csv_lines(writer, batch, fields):
+    return ''.join(writer.writerow([_csv_cell(row[field]) for field in fields]) for row in batch)
+
+
+def _jsonl_lines(encoder, batch, fields):
+    return ''.join(encoder.encode({field: row[field] for field in fields}) + '\n' for row in batch)
+
+
+def stream_csv(rows, fields, chunk_size):
+    """
+    Yields a header line and then one string of up to `chunk_size` CSV lines
+    per batch of rows.
+    """
+
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for batch in _batches(rows, chunk_size):
+        yield _csv_lines(writer, batch, fields)
+
+
+async def astream_csv(rows, fields, chunk_size):
+    """
+    stream_csv() over an async iterator of rows, such as QuerySet.aiterator().
+    """
+
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    async for batch in _abatches(rows, chunk_size):
+        yield _csv_lines(writer, batch, fields)
+
+
+def stream_jsonl(rows, fields, chunk_size):
+    """
+    Yields one string of up to `chunk_size` JSON lines per batch of rows.
+    """
+
+    encoder = DjangoJSONEncoder()
+    for batch in _batches(rows, chunk_size):
+        yield _jsonl_lines(encoder, batch, fields)
+
+
+async def astream_jsonl(rows, fields, chunk_size):
+    """
+    stream_jsonl() over an async iterator of rows, such as QuerySet.aiterator().
+    """
+
+    encoder = DjangoJSONEncoder()
+    async for batch in _abatches(rows, chunk_size):
+        yield _jsonl_lines(encoder, batch, fields)
+
+
+EXPORT_FORMATS = {
+    'csv': (stream_csv, 'text/csv; charset=utf-8'),
+    'jsonl': (stream_jsonl, 'application/x-ndjson; charset=utf-8'),
+}
+
+# streams of async row iterators, so ASGI servers do not buffer the whole export
+ASYNC_EXPORT_STREAMS = {
+    'csv': astream_csv,
+    'jsonl': astream_jsonl,
+}
+
+
+def export_response(rows, fields, export_format, filename, chunk_size=2000):
+    """
+    Returns a StreamingHttpResponse that writes `rows` (dicts) as they are
+    read, so memory use does not grow with the number of rows. `rows` may
+    also be an async iterator, for async views.
+    """
+
+    stream, content_type = EXPORT_FORMATS[export_format]
+    if hasattr(rows, '__aiter__'):
+        stream = ASYNC_EXPORT_STREAMS[export_format]
+    response = StreamingHttpResponse(stream(rows, fields, chunk_size), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    return response
@@ -0,0 +1,262 @@
+import datetime
+from django import forms
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.db.models import Count, F, Q, Value
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+FILTER_OPTIONS_CACHE_PREFIX = 'frontend:filter_options'
+
+
+def filter_options_cache_key(model, field_name):
+    return f'{FILTER_OPTIONS_CACHE_PREFIX}:{model._meta.label_lower}:{field_name}'
+
+
+# (field class, HTML input type) for fields filtered by a min/max range; order matters for subclasses
+RANGE_FIELD_INPUT_TYPES = (
+    (models.DateTimeField, 'date'),
+    (models.DateField, 'date'),
+    (models.TimeField, 'time'),
+    (models.DecimalField, 'number'),
+    (models.FloatField, 'number'),
+    (models.IntegerField, 'number'),
+)
+
+
+def get_range_input_type(model_field):
+    for field_class, input_type in RANGE_FIELD_INPUT_TYPES:
+        if isinstance(model_field, field_class):
+            return input_type
+    return None
+
+
+def get_filter_type(model_field):
+    """
+    Returns how a list_filter field is filtered: 'choice' (exact `__in` over
+    selected values, for choices, relations and text), 'boolean' or 'range'
+    (`__gte`/`__lte` bounds, for numbers, dates and times).
+    """
+
+    if model_field.choices:
+        return 'choice'
+    if isinstance(model_field, models.BooleanField):
+        return 'boolean'
+    if get_range_input_type(model_field):
+        return 'range'
+    return 'choice'
+
+
+def _day_start(date):
+    start = datetime.datetime.combine(date, datetime.time.min)
+    return timezone.make_aware(start) if settings.USE_TZ else start
+
+
+def _range_query(model_field, field_name, lookup, value):
+    """
+    Returns the Q for one range bound. Datetimes are bounded by whole days so
+    `lte` includes the selected day: `field >= start` or `field < next day`.
+    """
+
+    if isinstance(model_field, models.DateTimeField):
+        date = forms.DateField().to_python(value)
+        if lookup == 'gte':
+            return Q(**{f'{field_name}__gte': _day_start(date)})
+        return Q(**{f'{field_name}__lt': _day_start(date + datetime.timedelta(days=1))})
+    return Q(**{f'{field_name}__{lookup}': model_field.to_python(value)})
+
+
+def get_filter_query(model_field, field_name, filter_args, search=False):
+    """
+    Translates the request's filter arguments for one field into an indexable
+    predicate. Values that do not parse for the field type are ignored.
+
+    :param model_field: The model field behind the list_filter entry
+    :param field_name: The list_filter entry
+    :param filter_args: {parameter: [values]} as returned by get_filter_args()
+    :param search: Whether the field is rendered as a search input (above
+        `list_filter_max_options`); text fields then match values starting
+        with the entered text. The match is case-sensitive (`LIKE 'x%'`), so a
+        B-tree index can serve it; `istartswith` compiles to `UPPER(col) LIKE`
+        on PostgreSQL, which no plain index covers
+    :return: A Q object, empty when nothing applies
+    """
+
+    query = Q()
+    if search and isinstance(model_field, (models.CharField, models.TextField)):
+        value = filter_args.get(field_name, [''])[-1].strip()
+        return Q(**{f'{field_name}__startswith': value}) if value else query
+    if get_filter_type(model_field) == 'range':
+        for lookup in ('gte', 'lte'):
+            values = filter_args.get(f'{field_name}__{lookup}')
+            if not values or values[-1] == '':
+                continue
+            try:
+                query &= _range_query(model_field, field_name, lookup, values[-1])
+            except (ValidationError, ValueError, TypeError):
+                continue
+        return query
+
+    values = []
+    for value in filter_args.get(field_name, ()):
+        try:
+            values.append(model_field.to_python(value))
+        except (ValidationError, ValueError, TypeError):
+            continue
+    if values:
+        query &= Q(**{f'{field_name}__in': values})
+    return query
+
+
+def filter_option_labels(model_field, values):
+    """
+    Returns [(value, label)] for filter option values, labelling choices with
+    their display names and relations with str() of the related objects.
+    """
+
+    if model_field.choices:
+        labels = dict(model_field.flatchoices)
+        return [(value, labels.get(value, value)) for value in values]
+    if isinstance(model_field, models.BooleanField):
+        return [(True, 'Yes'), (False, 'No')]
+    values = [value for value in values if value is not None]
+    if model_field.is_relation and values:
+        related = model_field.related_model._default_manager.in_bulk(values)
+        return [(value, str(related.get(value, value))) for value in values]
+    return [(value, str(value)) for value in values]
+
+
+def load_filter_options(model, field_name, limit):
+    """
+    Fetches up to `limit` distinct values of a field.
+
+    Returns a tuple of values, or None when the field has more than `limit`
+    distinct values and should be filtered through a search input instead.
+    """
+
+    values = list(
+        model._default_manager.order_by(field_name)
+        .values_list(field_name, flat=True)
+        .distinct()[:limit + 1]
+    )
+    if len(values) > limit:
+        return None
+    return tuple(values)
+
+
+def get_filter_options(model, field_name, limit, timeout):
+    """
+    Returns the cached distinct values of a field, loading them on a miss.
+
+    Entries are kept until `timeout` or until a post_save/post_delete of the
+    model invalidates them.
+    """
+
+    key = filter_options_cache_key(model, field_name)
+    cached = cache.get(key)
+    if cached is None:
+        cached = {'values': load_filter_options(model, field_name, limit), 'limit': limit, 'timeout': timeout}
+        cache.set(key, cached, timeout)
+    return cached['values']
+
+
+def facet_counts(querysets):
+    """
+    Counts rows per value for several fields with a single UNION ALL query.
+
+    Each branch groups its own queryset by one field, so every field can be
+    conditioned on a different set of filters. Branches select one column per
+    field (NULL outside their own) plus an index naming the grouped field, so
+    values keep their database types across the union.
+
+    :param querysets: {field_name: queryset to count}, all of the same model
+    :return: {field_name: {value: count}}
+    """
+
+    fields = list(querysets)
+    if not fields:
+        return {}
+    branches = []
+    for index, field_name in enumerate(fields):
+        objects = querysets[field_name]
+        columns = {'facet_field': Value(index)}
+        for column, name in enumerate(fields):
+            columns[f'facet_{column}'] = F(name) if name == field_name else \
+                Value(None, output_field=objects.model._meta.get_field(name))
+        branches.append(
+            objects.order_by().annotate(**columns).values(*columns).annotate(facet_count=Count('pk'))
+        )
+    rows = branches[0].union(*branches[1:], all=True) if len(branches) > 1 else branches[0]
+
+    counts = {field_name: {} for field_name in fields}
+    for row in rows:
+        index = row['facet_field']
+        counts[fields[index]][row[f'facet_{index}']] = row['facet_count']
+    return counts
+
+
+def invalidate_filter_options(model, fields=None):
+    """
+    Drops cached filter options of a model, e.g. after bulk operations such
+    as `QuerySet.update()` or `bulk_create()` that do not send signals.
+
+    :param model: The Django model whose options should be dropped
+    :param fields: Optional iterable of field names; all list_filter fields otherwise
+    """
+
+    if fields is None:
+        fields = _get_list_filter(model)
+    cache.delete_many([filter_options_cache_key(model, field_name) for field_name in fields])
+
+
+def _get_list_filter(model):
+    from frontend import site
+
+    if model not in site._registry:
+        return ()
+    return site.get_model_plan(model).list_filter
+
+
+def _is_new_filter_option_value(model, field_name, value):
+    # a read only: patching the shared entry in place would lose concurrent additions
+    cached = cache.get(filter_options_cache_key(model, field_name))
+    return cached is not None and cached['values'] is not None and value not in cached['values']
+
+
+def filter_options_post_save(sender, instance, created=False, update_fields=None, **kwargs):
+    """
+    Drops the cached options of fields for which a new row brings a value
+    not listed yet, and of fields that an update may have changed.
+    """
+
+    list_filter = _get_list_filter(sender)
+    if not list_filter:
+        return
+    if created:
+        new_values = []
+        for field_name in list_filter:
+            field = sender._meta.get_field(field_name)
+            if field.concrete and not field.choices and \
+                    _is_new_filter_option_value(sender, field_name, getattr(instance, field.attname)):
+                new_values.append(field_name)
+        invalidate_filter_options(sender, new_values)
+        return
+    if update_fields is not None:
+        list_filter = [field_name for field_name in list_filter if field_name in update_fields]
+    invalidate_filter_options(sender, list_filter)
+
+
+def filter_options_post_delete(sender, instance, **kwargs):
+    """
+    Drops the cached options of the model, since a deleted row may have held the last copy of a value.
+    """
+
+    if _get_list_filter(sender):
+        invalidate_filter_options(sender)
+
+
+def connect_filter_option_signals():
+    post_save.connect(filter_options_post_save, dispatch_uid='frontend_filter_options_post_save')
+    post_delete.connect(filter_options_post_delete, dispatch_uid='frontend_filter_options_post_delete')
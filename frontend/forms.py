@@ -1,9 +1,13 @@
+from functools import lru_cache
 from django import forms
 from django.forms import ModelForm
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on distinct (model, fields, widgets) form classes kept alive
+FORM_CLASS_CACHE_SIZE = 256
+
 
 class FrontendModelForm(ModelForm):
     """
@@ -22,16 +26,55 @@ class FrontendModelForm(ModelForm):
         model = None
         fields = ()
 
-def generate_form_for_model(model, fields):
+class ImportForm(forms.Form):
+    """
+    The upload form of the `table_import` page. The format defaults to the
+    file extension and must be one of the model's `import_formats`.
+    """
+
+    file = forms.FileField()
+    format = forms.ChoiceField(choices=(), required=False)
+
+    def __init__(self, *args, formats=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.formats = tuple(formats)
+        self.fields['format'].choices = [('', 'From file extension'), *((name, name.upper()) for name in self.formats)]
+
+    def clean(self):
+        cleaned_data = super().clean()
+        upload = cleaned_data.get('file')
+        if upload is not None and not cleaned_data.get('format'):
+            extension = upload.name.rpartition('.')[2].lower()
+            if extension in self.formats:
+                cleaned_data['format'] = extension
+            else:
+                self.add_error('format', f"Choose a format for '{upload.name}'.")
+        return cleaned_data
+
+
+def generate_form_for_model(model, fields, widgets=None):
     """
     Generate a Django ModelForm class for the given model and fields.
 
+    Form classes are cached per (model, fields, widgets), so repeated calls
+    return the same class instead of re-running ModelForm field introspection.
+    Widget overrides are keyed by identity; pass module-level widget
+    instances to benefit from the cache.
+
     :param model: The Django model to generate the form for
     :param fields: The fields to be included in the form.
                    An empty/falsy value results in an empty tuple — never "__all__".
+    :param widgets: Optional mapping of field names to widget overrides
     :return: A dynamically created ModelForm class for the given model and fields
     """
 
+    fields = tuple(fields) if fields else ()
+    widgets = tuple(sorted(widgets.items())) if widgets else ()
+    return _build_form_class(model, fields, widgets)
+
+
+@lru_cache(maxsize=FORM_CLASS_CACHE_SIZE)
+def _build_form_class(model, fields, widgets):
     if not fields:
         logger.warning(
             "generate_form_for_model called for %s without explicit fields. "
@@ -39,7 +82,25 @@ def generate_form_for_model(model, fields):
             "your ModelFrontend to specify which fields to expose.",
             model.__name__,
         )
-        fields = ()
-    Meta = type("Meta", (), {"model": model, "fields": fields})
+    attrs = {"model": model, "fields": fields}
+    if widgets:
+        attrs["widgets"] = dict(widgets)
+    Meta = type("Meta", (), attrs)
     form_class = type(f"{model.__name__}Form", (ModelForm,), {"Meta": Meta})
     return form_class
+
+
+def clear_form_class_cache():
+    """
+    Drops all cached form classes, e.g. after a registration change or between tests.
+    """
+
+    _build_form_class.cache_clear()
+
+
+def form_class_cache_info():
+    """
+    Returns hit/miss statistics of the form class cache.
+    """
+
+    return _build_form_class.cache_info()
@@ -0,0 +1,100 @@
+import hashlib
+import threading
+from django.core.cache import caches
+from django.middleware.csrf import get_token
+from django.utils.safestring import mark_safe
+from frontend.versions import get_deploy_version, get_model_version
+import logging
+
+logger = logging.getLogger(__name__)
+
+TABLE_FRAGMENT_CACHE_PREFIX = 'frontend:table'
+
+# rendered in place of the per-request CSRF token and replaced after retrieval
+CSRF_PLACEHOLDER = 'frontend-csrf-token-placeholder'
+
+_stats = {'hits': 0, 'misses': 0}
+_stats_lock = threading.Lock()
+
+
+def get_fragment_cache_stats():
+    """
+    Returns the {'hits': int, 'misses': int} of the table fragment cache in this process.
+    """
+
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_fragment_cache_stats():
+    with _stats_lock:
+        _stats.update(hits=0, misses=0)
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def get_cache_scope(request, scope):
+    """
+    Returns the part of the key that separates users: the user for 'user',
+    else only the authentication state and flags ('shared').
+    """
+
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return ('anonymous',)
+    if scope == 'shared':
+        return ('authenticated', user.is_staff, user.is_superuser)
+    return ('user', user.pk)
+
+
+def table_fragment_cache_key(model_config, request, template):
+    """
+    Returns the cache key of a rendered table body: deploy version, model,
+    frontend class, change versions of the model and of the related models
+    of its foreign key labels, path, query string (search, filters, sort,
+    page) and cache scope. A write or a deploy changes the key, so stale
+    entries are never read.
+    """
+
+    model = model_config.model
+    payload = repr((
+        get_deploy_version(),
+        type(model_config).__qualname__,
+        get_model_version(model),
+        model_config.get_related_versions(),
+        template,
+        request.path,
+        sorted(request.GET.lists()),
+        get_cache_scope(request, model_config.table_cache_scope),
+    ))
+    digest = hashlib.sha256(payload.encode()).hexdigest()
+    return f'{TABLE_FRAGMENT_CACHE_PREFIX}:{model._meta.label_lower}:{digest}'
+
+
+def get_table_fragment(cache_alias, key):
+    html = caches[cache_alias].get(key)
+    _count('misses' if html is None else 'hits')
+    logger.debug("table fragment cache %s: %s", 'miss' if html is None else 'hit', key)
+    return html
+
+
+def render_table_fragment(template, context):
+    """
+    Renders the table body without a request, with a placeholder in place
+    of the CSRF token so the result can be shared between requests.
+    """
+
+    from frontend import site
+
+    return site.render_to_string(template, {**context, 'csrf_token': CSRF_PLACEHOLDER})
+
+
+def set_table_fragment(cache_alias, key, html, timeout):
+    caches[cache_alias].set(key, html, timeout)
+
+
+def inject_csrf_token(request, html):
+    return mark_safe(html.replace(CSRF_PLACEHOLDER, get_token(request)))
@@ -12,10 +12,13 @@ class Frontend(frontend.Config):
     logo = getattr(settings, 'FRONTEND_LOGO', 'img/django-fast-frontend-logo.png')
     css = getattr(settings, 'FRONTEND_CUSTOM_CSS', 'css/custom.css')
     description = getattr(settings, 'FRONTEND_DESCRIPTION', '')
+    conditional_get = getattr(settings, 'FRONTEND_CONDITIONAL_GET', False)
+    template_engine = getattr(settings, 'FRONTEND_TEMPLATE_ENGINE', 'django')
+    async_views = getattr(settings, 'FRONTEND_ASYNC_VIEWS', False)
 
 
 if not 'config' in frontend.site._registry:
     frontend.site.register_config(Frontend)
 
-    if getattr(frontend.site._registry['config'].__class__, 'login_required') and getattr(frontend.site._registry['config'].__class__(), 'authentication'):
+    if frontend.site.login_required:
         frontend.site.register_accounts(AccountFrontend)
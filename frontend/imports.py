@@ -0,0 +1,154 @@
+import csv
+import io
+import json
+from dataclasses import dataclass, field
+from itertools import islice
+from django.db import DatabaseError, connections, router, transaction
+from frontend.filters import invalidate_filter_options
+from frontend.search import index_created_rows
+from frontend.versions import bump_model_version
+import logging
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ImportResult:
+    """
+    The outcome of an import: created and failed row counts, and the
+    (line, {field: [messages]}) of the first `max_errors` failed rows.
+    """
+
+    created: int = 0
+    failed: int = 0
+    errors: list = field(default_factory=list)
+    max_errors: int = 100
+    error: str = ''  # why the file could not be read to the end
+
+    def add_error(self, line, errors):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append((line, errors))
+
+
+def _text(upload):
+    return io.TextIOWrapper(upload.open('rb'), encoding='utf-8-sig', newline='')
+
+
+def read_csv_rows(upload):
+    """
+    Yields (line, row dict) for every record of a CSV file with a header
+    line, reading the file as it goes.
+    """
+
+    reader = csv.DictReader(_text(upload))
+    for row in reader:
+        yield reader.line_num, row
+
+
+def read_jsonl_rows(upload):
+    """
+    Yields (line, row dict) for every non-empty line of a JSONL file, or
+    (line, None) for lines that are not a JSON object.
+    """
+
+    for line, text in enumerate(_text(upload), start=1):
+        if not text.strip():
+            continue
+        try:
+            row = json.loads(text)
+        except ValueError:
+            row = None
+        yield line, row if isinstance(row, dict) else None
+
+
+ROW_READERS = {
+    'csv': read_csv_rows,
+    'jsonl': read_jsonl_rows,
+}
+
+
+def _form_data(row):
+    return {key: '' if value is None else value for key, value in row.items() if key is not None}
+
+
+def _reject_batch(model, rows):
+    # bulk_create() may have set primary keys before the transaction was rolled back
+    if model._meta.auto_field is not None:
+        for _, form in rows:
+            form.instance.pk = None
+
+
+def _create_batch(model, rows, result, per_row=False):
+    """
+    Inserts a batch of validated (line, form) rows with bulk_create() and
+    saves their many-to-many data, in one transaction; when the database
+    rejects it, or with `per_row`, saves the rows one by one so only the
+    offending rows are reported. Returns the primary keys of the rows
+    inserted by bulk_create(), which sends no signals.
+    """
+
+    if not per_row:
+        try:
+            with transaction.atomic():
+                model._default_manager.bulk_create([form.instance for _, form in rows], batch_size=len(rows))
+                for _, form in rows:
+                    form.save_m2m()
+            result.created += len(rows)
+            return [form.instance.pk for _, form in rows]
+        except DatabaseError:
+            _reject_batch(model, rows)
+    for line, form in rows:
+        try:
+            with transaction.atomic():
+                form.instance.save(force_insert=True)
+                form.save_m2m()
+            result.created += 1
+        except DatabaseError as error:
+            result.add_error(line, {'__all__': [str(error)]})
+    return []
+
+
+def import_rows(model, form_class, rows, batch_size=1000, max_errors=100):
+    """
+    Validates (line, row) pairs with `form_class` and inserts the valid rows
+    with bulk_create(), `batch_size` rows per transaction. Invalid rows are
+    reported and skipped; only one batch is held in memory at a time. A file
+    that cannot be decoded stops the import after the last complete batch.
+
+    bulk_create() sends no signals, so the model's change version, cached
+    filter options and search index are updated here. Many-to-many form
+    fields are saved once the rows have primary keys; databases that do not
+    return them from bulk inserts save such rows one by one.
+    """
+
+    result = ImportResult(max_errors=max_errors)
+    using = router.db_for_write(model)
+    per_row = any(field.name in form_class.base_fields for field in model._meta.many_to_many) and \
+        not connections[using].features.can_return_rows_from_bulk_insert
+    rows = iter(rows)
+    while True:
+        try:
+            batch = list(islice(rows, batch_size))
+        except (UnicodeDecodeError, csv.Error) as error:
+            result.error = str(error)
+            break
+        if not batch:
+            break
+        valid = []
+        for line, row in batch:
+            if row is None:
+                result.add_error(line, {'__all__': ['Not a JSON object.']})
+                continue
+            form = form_class(data=_form_data(row))
+            if form.is_valid():
+                form.save(commit=False)
+                valid.append((line, form))
+            else:
+                result.add_error(line, {name: list(messages) for name, messages in form.errors.items()})
+        if valid:
+            index_created_rows(model, _create_batch(model, valid, result, per_row=per_row), using=using)
+    if result.created:
+        bump_model_version(model)
+        invalidate_filter_options(model)
+    logger.info("Imported %s %s rows, %s failed.", result.created, model._meta.label, result.failed)
+    return result
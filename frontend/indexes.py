@@ -0,0 +1,162 @@
+from collections import namedtuple
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections, models, router
+from frontend.filters import get_filter_type
+from frontend.search import IContainsSearchBackend, PostgresSearchBackend, SQLiteFTS5SearchBackend
+
+# model: model that needs the index, usage: 'search', 'filter' or 'sort', path: configured field path,
+# fields: field names of the wanted index (empty when no B-tree index helps), covered_by: existing
+# index name or None, note: explanation shown in the report
+IndexAdvice = namedtuple('IndexAdvice', ('model', 'usage', 'path', 'fields', 'covered_by', 'note'))
+
+
+def resolve_field_path(model, path):
+    """
+    Follows a `relation__field` path and returns (model, field) of its last
+    part, or None when the path does not end in a concrete column.
+    """
+
+    parts = path.split('__')
+    for index, part in enumerate(parts):
+        try:
+            field = model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None
+        if index < len(parts) - 1:
+            if not field.is_relation or field.related_model is None:
+                return None
+            model = field.related_model
+    if field not in model._meta.concrete_fields:
+        return None
+    return model, field
+
+
+def get_existing_indexes(model, using):
+    """
+    Returns {name: constraint info} for the indexes, unique constraints and
+    primary key of the model table as introspected from the database, or
+    None when the table does not exist.
+    """
+
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        if model._meta.db_table not in connection.introspection.table_names(cursor):
+            return None
+        constraints = connection.introspection.get_constraints(cursor, model._meta.db_table)
+    return {
+        name: info
+        for name, info in constraints.items()
+        if info['index'] or info['unique'] or info['primary_key']
+    }
+
+
+def find_covering_index(existing, columns):
+    """
+    Returns the name of an existing index whose leading columns are `columns`.
+    """
+
+    for name, info in existing.items():
+        if list(info['columns'][:len(columns)]) == list(columns):
+            return name
+    return None
+
+
+def _column_advice(model, usage, path, field_names, using, note, cache):
+    if model not in cache:
+        cache[model] = get_existing_indexes(model, using)
+    existing = cache[model]
+    if existing is None:
+        return IndexAdvice(model, usage, path, (), None, f'table {model._meta.db_table} does not exist')
+    columns = [model._meta.get_field(name).column for name in field_names]
+    return IndexAdvice(model, usage, path, tuple(field_names), find_covering_index(existing, columns), note)
+
+
+def _search_advice(model, model_config, using):
+    search_fields = tuple(model_config.get_search_fields())
+    path = ', '.join(search_fields)
+    backend = model_config.get_search_backend()
+    vendor = connections[using].vendor
+    if isinstance(backend, SQLiteFTS5SearchBackend) and vendor == 'sqlite':
+        if backend.table_exists(model, using):
+            return IndexAdvice(model, 'search', path, (), backend.get_table(model), 'FTS5 index')
+        return IndexAdvice(model, 'search', path, (), None, 'run manage.py frontend_search_rebuild to create the FTS5 index')
+    if isinstance(backend, PostgresSearchBackend) and vendor == 'postgresql':
+        existing = get_existing_indexes(model, using) or {}
+        gin = next((name for name, info in existing.items() if info.get('type') == 'gin'), None)
+        note = 'GIN index' if gin else f"add a GinIndex on SearchVector({path}, config='{backend.config}')"
+        return IndexAdvice(model, 'search', path, (), gin, note)
+    if isinstance(backend, IContainsSearchBackend):
+        note = "icontains cannot use a B-tree index; set search_backend = 'postgres' or 'sqlite_fts5'"
+    else:
+        note = f'{backend.name or type(backend).__name__} backend is not analyzed on {vendor}'
+    return IndexAdvice(model, 'search', path, (), None, note)
+
+
+def advise_model(model, model_config, using=None):
+    """
+    Returns an IndexAdvice per configured search, filter and sort path of a
+    registered model. Sort indexes include the primary key as a tie-breaker
+    when the frontend uses keyset pagination.
+    """
+
+    using = using or router.db_for_read(model)
+    cache = {}
+    advice = []
+
+    if model_config.get_search_fields():
+        advice.append(_search_advice(model, model_config, using))
+
+    for path in model_config.get_list_filter():
+        resolved = resolve_field_path(model, path)
+        if resolved is None:
+            advice.append(IndexAdvice(model, 'filter', path, (), None, 'not a concrete column; not analyzed'))
+            continue
+        target, field = resolved
+        if field.primary_key:
+            advice.append(IndexAdvice(target, 'filter', path, (), '__primary__', 'primary key'))
+        elif get_filter_type(field) == 'boolean':
+            advice.append(IndexAdvice(target, 'filter', path, (), None, 'boolean filters are too unselective to index alone'))
+        else:
+            advice.append(_column_advice(target, 'filter', path, [field.name], using, '', cache))
+
+    for path in model_config.get_sortable_by():
+        resolved = resolve_field_path(model, path)
+        if resolved is None:
+            advice.append(IndexAdvice(model, 'sort', path, (), None, 'not a concrete column; not analyzed'))
+            continue
+        target, field = resolved
+        if field.primary_key:
+            advice.append(IndexAdvice(target, 'sort', path, (), '__primary__', 'primary key'))
+            continue
+        if target is not model:
+            advice.append(IndexAdvice(target, 'sort', path, (), None, 'sorting across a join cannot use an index of the list table'))
+            continue
+        field_names = [field.name]
+        note = ''
+        if model_config.pagination == 'keyset':
+            field_names.append(model._meta.pk.name)
+            note = 'keyset pagination pages on (field, pk)'
+        advice.append(_column_advice(target, 'sort', path, field_names, using, note, cache))
+
+    return advice
+
+
+def missing_indexes(advice):
+    """
+    Returns {model: [Index]} for the B-tree indexes that are wanted but not
+    covered, de-duplicated and named like Django names Meta.indexes.
+    """
+
+    missing = {}
+    for item in advice:
+        if item.covered_by or not item.fields:
+            continue
+        indexes = missing.setdefault(item.model, [])
+        # a composite (field, pk) index also serves single-column lookups on field
+        if any(tuple(index.fields[:len(item.fields)]) == item.fields for index in indexes):
+            continue
+        indexes[:] = [index for index in indexes if tuple(item.fields[:len(index.fields)]) != tuple(index.fields)]
+        index = models.Index(fields=list(item.fields))
+        index.set_name_with_model(item.model)
+        indexes.append(index)
+    return missing
@@ -0,0 +1,79 @@
+from functools import lru_cache
+from importlib.util import find_spec
+from django.core.exceptions import ImproperlyConfigured
+from django.template import Context, Engine
+from django.template.defaultfilters import title
+from django.templatetags.static import static
+from django.urls import reverse
+from django_bootstrap5.components import render_button
+from django_bootstrap5.forms import render_field, render_form
+from frontend.rows import RowRenderer
+from frontend.templatetags.django_fast_frontend import label, query_replace, split
+
+JINJA2_ENGINE_NAME = 'frontend-jinja2'
+
+
+def url(name, *args, **kwargs):
+    return reverse(name, args=args or None, kwargs=kwargs or None)
+
+
+def environment(**options):
+    """
+    Returns the Jinja2 environment of the frontend template set, with the
+    helpers the DTL templates get from `static`, `url`, `django_bootstrap5`
+    and `django_fast_frontend`.
+    """
+
+    from jinja2 import Environment, pass_context
+
+    @pass_context
+    def _query_replace(context, **kwargs):
+        return query_replace(context, **kwargs)
+
+    @pass_context
+    def _frontend_rows(context, layout='table'):
+        renderer = RowRenderer.from_context(context)
+        render = renderer.render_cards if layout == 'cards' else renderer.render_table
+        return render(context['table']['objects'], Context())
+
+    env = Environment(**options)
+    env.globals.update({
+        'static': static,
+        'url': url,
+        'bootstrap_button': render_button,
+        'bootstrap_field': render_field,
+        'bootstrap_form': render_form,
+        'query_replace': _query_replace,
+        'frontend_rows': _frontend_rows,
+    })
+    # Django's title filter, so headers match the DTL templates
+    env.filters.update({'split': split, 'label': label, 'title': title})
+    return env
+
+
+@lru_cache(maxsize=None)
+def get_jinja2_engine():
+    """
+    Returns the Jinja2 backend that renders `frontend/jinja2/` templates. It
+    runs the context processors of the default Django engine, so both
+    template sets see the same context.
+    """
+
+    if find_spec('jinja2') is None:
+        raise ImproperlyConfigured(
+            "FRONTEND_TEMPLATE_ENGINE = 'jinja2' requires Jinja2: pip install django-fast-frontend[jinja2]"
+        )
+    from jinja2 import ChainableUndefined
+    from django.template.backends.jinja2 import Jinja2
+
+    return Jinja2({
+        'NAME': JINJA2_ENGINE_NAME,
+        'DIRS': [],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'environment': 'frontend.jinja.environment',
+            'context_processors': Engine.get_default().context_processors,
+            'undefined': ChainableUndefined,  # missing variables render empty, like DTL
+            'keep_trailing_newline': True,
+        },
+    })
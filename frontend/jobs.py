@@ -0,0 +1,224 @@
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextvars import ContextVar
+from datetime import timedelta
+from functools import lru_cache
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import close_old_connections, connections, transaction
+from django.db.models import Q
+from django.http import HttpRequest, QueryDict
+from django.utils import timezone
+from frontend.actions import call_action
+
+# spawned worker processes import this module before django.setup(), so
+# models are imported inside the functions that use them
+
+logger = logging.getLogger(__name__)
+
+JOB_EXECUTORS = ('thread', 'process')
+
+# the job run by the current worker, for report_progress()
+_current_job = ContextVar('frontend_current_job', default=None)
+
+# seconds between stale job checks of the polled job lists
+STALE_JOBS_CHECK_INTERVAL = 60
+
+
+def _init_process(settings_module):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+
+    django.setup()
+
+
+@lru_cache(maxsize=None)
+def get_executor():
+    """
+    Returns the local pool that runs background actions:
+    FRONTEND_JOB_EXECUTOR 'thread' (default) or 'process', with
+    FRONTEND_JOB_WORKERS workers.
+    """
+
+    executor = getattr(settings, 'FRONTEND_JOB_EXECUTOR', 'thread')
+    workers = getattr(settings, 'FRONTEND_JOB_WORKERS', 2)
+    if executor == 'thread':
+        return ThreadPoolExecutor(workers, thread_name_prefix='frontend-job')
+    if executor == 'process':
+        return ProcessPoolExecutor(
+            workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_process,
+            initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', ''),),
+        )
+    raise ImproperlyConfigured(
+        f"FRONTEND_JOB_EXECUTOR must be one of {', '.join(JOB_EXECUTORS)}, not '{executor}'."
+    )
+
+
+def enqueue_job(request, model_config, kind, name, object_id=None, ids=(), query=''):
+    """
+    Stores a queued FrontendJob for the action and hands it to the executor
+    once the current transaction commits. Returns the job.
+    """
+
+    from frontend.models import FrontendJob
+
+    user = getattr(request, 'user', None)
+    authenticated = user is not None and user.is_authenticated
+    job = FrontendJob.objects.create(
+        model=model_config.model._meta.label,
+        action=name,
+        label=model_config.get_action_label(name),
+        kind=kind,
+        object_id='' if object_id is None else str(object_id),
+        ids=[str(id) for id in ids],
+        query=query,
+        user=user if authenticated else None,
+        session_key='' if authenticated else _session_key(request, create=True),
+    )
+    transaction.on_commit(lambda: get_executor().submit(_run_in_worker, job.pk))
+    return job
+
+
+def _session_key(request, create=False):
+    """
+    Returns the session key that owns the anonymous jobs of a request, saving
+    a new session first when `create` is set; '' without sessions.
+    """
+
+    session = getattr(request, 'session', None)
+    if session is None:
+        return ''
+    if session.session_key is None and create:
+        session.save()
+    return session.session_key or ''
+
+
+def job_request(job):
+    """
+    Returns the request a job's handler and get_queryset() see: the user who
+    queued it and the list query string, without session or headers.
+    """
+
+    from django.contrib.auth.models import AnonymousUser
+
+    request = HttpRequest()
+    request.method = 'POST'
+    request.user = job.user or AnonymousUser()
+    request.GET = QueryDict(job.query)
+    return request
+
+
+def run_job(job_id):
+    """
+    Runs a queued job and records its result, or the error it raised. Jobs
+    that are no longer queued are skipped, so each runs at most once.
+    """
+
+    from frontend.models import FrontendJob
+
+    if not FrontendJob.objects.filter(pk=job_id, status=FrontendJob.Status.QUEUED) \
+            .update(status=FrontendJob.Status.RUNNING, started_at=timezone.now()):
+        return
+    job = FrontendJob.objects.select_related('user').get(pk=job_id)
+    token = _current_job.set(job)
+    try:
+        from frontend import site
+
+        model = apps.get_model(job.model)
+        model_config = site.get_model_plan(model).model_config
+        pk = model._meta.pk
+        result = call_action(
+            model_config, job_request(job), job.kind, getattr(model_config, job.action),
+            object_id=pk.to_python(job.object_id) if job.object_id else None,
+            ids=[pk.to_python(id) for id in job.ids],
+            query=job.query,
+        )
+    except Exception as error:
+        logger.exception("Background action '%s' of %s failed.", job.action, job.model)
+        FrontendJob.objects.filter(pk=job_id).update(
+            status=FrontendJob.Status.FAILED, result=f'{type(error).__name__}: {error}', finished_at=timezone.now(),
+        )
+    else:
+        FrontendJob.objects.filter(pk=job_id).update(
+            status=FrontendJob.Status.DONE, progress=100, result='' if result is None else str(result),
+            finished_at=timezone.now(),
+        )
+    finally:
+        _current_job.reset(token)
+
+
+def _run_in_worker(job_id):
+    close_old_connections()
+    try:
+        run_job(job_id)
+    finally:
+        # worker threads keep their own connections; do not leak them
+        connections.close_all()
+
+
+def report_progress(done, total=None):
+    """
+    Records the progress of the running background action, as `done` out of
+    `total` or as a percentage when `total` is None. Does nothing outside a
+    job, so handlers may call it either way.
+    """
+
+    from frontend.models import FrontendJob
+
+    job = _current_job.get()
+    if job is None:
+        return
+    percent = done if total is None else (done * 100 // total if total else 100)
+    FrontendJob.objects.filter(pk=job.pk).update(progress=max(0, min(100, int(percent))))
+
+
+def fail_stale_jobs(model=None):
+    """
+    Marks jobs as failed that were queued or started more than
+    FRONTEND_JOB_TIMEOUT seconds (default 3600) ago: their web process
+    exited or they hang. Limited to one model when given. Returns the
+    number of jobs marked.
+    """
+
+    from frontend.models import FrontendJob
+
+    now = timezone.now()
+    deadline = now - timedelta(seconds=getattr(settings, 'FRONTEND_JOB_TIMEOUT', 3600))
+    jobs = FrontendJob.objects.filter(
+        Q(status=FrontendJob.Status.QUEUED, created_at__lt=deadline)
+        | Q(status=FrontendJob.Status.RUNNING, started_at__lt=deadline)
+    )
+    if model is not None:
+        jobs = jobs.filter(model=model._meta.label)
+    return jobs.update(
+        status=FrontendJob.Status.FAILED, result='Interrupted: the job did not finish in time.', finished_at=now,
+    )
+
+
+def get_jobs(request, model, limit=5):
+    """
+    Returns the latest jobs of a model queued by the requesting user, or for
+    anonymous users by their session. Stale jobs are failed first, at most
+    once per STALE_JOBS_CHECK_INTERVAL, so the toolbar stops polling them.
+    """
+
+    from frontend.models import FrontendJob
+
+    if cache.add('frontend:jobs:stale_check', True, STALE_JOBS_CHECK_INTERVAL):
+        fail_stale_jobs()
+    user = getattr(request, 'user', None)
+    jobs = FrontendJob.objects.filter(model=model._meta.label)
+    if user is not None and user.is_authenticated:
+        jobs = jobs.filter(user=user)
+    else:
+        session_key = _session_key(request)
+        if not session_key:
+            return []
+        jobs = jobs.filter(user__isnull=True, session_key=session_key)
+    return list(jobs.order_by('-created_at', '-pk')[:limit])
@@ -0,0 +1,106 @@
+import os
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import migrations
+from django.db.migrations.autodetector import MigrationAutodetector
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.writer import MigrationWriter
+
+from frontend import site
+from frontend.indexes import advise_model, missing_indexes
+
+
+class Command(BaseCommand):
+    help = ("Report which search_fields, list_filter and sortable_by paths of registered frontend models "
+            "are not backed by a database index, and optionally write a migration adding the missing ones.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("models", nargs="*", metavar="app_label.ModelName",
+                            help="Limit the report to these models.")
+        parser.add_argument("--database", default=None, help="Database alias to inspect (default: read router).")
+        parser.add_argument("--emit-migration", action="store_true",
+                            help="Write a migration per app adding the missing indexes.")
+        parser.add_argument("--dry-run", action="store_true",
+                            help="With --emit-migration, print the migrations instead of writing them.")
+        parser.add_argument("--check", action="store_true",
+                            help="Exit with a non-zero status when a configured path will scan.")
+
+    def handle(self, *args, **options):
+        if options["models"]:
+            try:
+                models = [apps.get_model(label) for label in options["models"]]
+            except (LookupError, ValueError) as error:
+                raise CommandError(error)
+            unregistered = [model._meta.label for model in models if model not in site._registry]
+            if unregistered:
+                raise CommandError(f"Not registered with the frontend site: {', '.join(unregistered)}")
+        else:
+            models = site.get_registered_models()
+
+        advice = []
+        for model in models:
+            model_advice = advise_model(model, site.get_model_config(model), using=options["database"])
+            advice += model_advice
+            self.report(model, model_advice)
+
+        scans = [item for item in advice if not item.covered_by]
+        missing = missing_indexes(advice)
+        if options["emit_migration"]:
+            self.emit_migrations(missing, dry_run=options["dry_run"])
+        elif missing:
+            self.stdout.write("Run with --emit-migration to write a migration adding the missing indexes.")
+        if options["check"] and scans:
+            raise CommandError(f"{len(scans)} configured path(s) are not backed by an index.")
+
+    def report(self, model, advice):
+        self.stdout.write(self.style.MIGRATE_HEADING(model._meta.label))
+        if not advice:
+            self.stdout.write("  no search, filter or sort paths configured")
+        for item in advice:
+            if item.covered_by:
+                status = self.style.SUCCESS("ok  ")
+                detail = item.covered_by
+            else:
+                status = self.style.WARNING("scan")
+                detail = f"needs index on {item.model._meta.db_table}({', '.join(item.fields)})" if item.fields else ""
+            detail = "; ".join(part for part in (detail, item.note) if part)
+            self.stdout.write(f"  {status} {item.usage:<6} {item.path:<30} {detail}")
+
+    def emit_migrations(self, missing, dry_run=False):
+        if not missing:
+            self.stdout.write("No missing indexes.")
+            return
+        loader = MigrationLoader(None, ignore_no_migrations=True)
+        by_app = {}
+        for model, indexes in missing.items():
+            if not model._meta.managed:
+                self.stdout.write(self.style.WARNING(f"Skipping unmanaged model {model._meta.label}."))
+                continue
+            by_app.setdefault(model._meta.app_label, []).extend(
+                migrations.AddIndex(model_name=model._meta.model_name, index=index) for index in indexes
+            )
+
+        for app_label, operations in by_app.items():
+            if app_label not in loader.migrated_apps:
+                self.stdout.write(self.style.WARNING(f"Skipping {app_label}: the app has no migrations module."))
+                continue
+            leaves = loader.graph.leaf_nodes(app_label)
+            number = max((MigrationAutodetector.parse_number(name) or 0 for _, name in leaves), default=0) + 1
+            migration = type("Migration", (migrations.Migration,), {
+                "dependencies": leaves,
+                "operations": operations,
+            })(f"{number:04d}_frontend_indexes", app_label)
+            writer = MigrationWriter(migration)
+            if dry_run:
+                self.stdout.write(self.style.MIGRATE_HEADING(f"Migration {writer.path}"))
+                self.stdout.write(writer.as_string())
+            else:
+                os.makedirs(os.path.dirname(writer.path), exist_ok=True)
+                with open(writer.path, "w", encoding="utf-8") as migration_file:
+                    migration_file.write(writer.as_string())
+                self.stdout.write(self.style.SUCCESS(f"Wrote {writer.path}"))
+            self.stdout.write("  Add the same indexes to Meta.indexes so makemigrations keeps them:")
+            for operation in operations:
+                index = operation.index
+                self.stdout.write(f"    {operation.model_name}: models.Index(fields={index.fields!r}, name={index.name!r})")
@@ -0,0 +1,36 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from frontend import site
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search indexes of registered frontend models (e.g. SQLite FTS5 tables)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("models", nargs="*", metavar="app_label.ModelName",
+                            help="Limit the rebuild to these models.")
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        if options["models"]:
+            try:
+                models = [apps.get_model(label) for label in options["models"]]
+            except (LookupError, ValueError) as error:
+                raise CommandError(error)
+        else:
+            models = site.get_registered_models()
+
+        for model in models:
+            model_config = site._registry.get(model)
+            if model_config is None:
+                raise CommandError(f"{model._meta.label} is not registered with the frontend site.")
+            search_fields = model_config.get_search_fields()
+            if not search_fields:
+                continue
+            backend = model_config.get_search_backend()
+            if backend.rebuild(model, search_fields, using=options["database"]):
+                self.stdout.write(self.style.SUCCESS(f"Rebuilt {backend.name} index for {model._meta.label}."))
+            elif options["verbosity"] > 1:
+                self.stdout.write(f"{model._meta.label}: {backend.name} needs no rebuild.")
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='frontendjob',
+            name='session_key',
+            field=models.CharField(blank=True, max_length=40),
+        ),
+        migrations.AddIndex(
+            model_name='frontendjob',
+            index=models.Index(fields=['model', 'session_key', '-created_at'], name='frontend_fr_model_24b62b_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.db import models
+
+
+class FrontendJob(models.Model):
+    """
+    An action queued with `@frontend.action(background=True)`: what to call,
+    with which arguments, and its status, progress and result.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = 'queued', 'Queued'
+        RUNNING = 'running', 'Running'
+        DONE = 'done', 'Done'
+        FAILED = 'failed', 'Failed'
+
+    model = models.CharField(max_length=200)  # app_label.ModelName
+    action = models.CharField(max_length=200)
+    label = models.CharField(max_length=200)
+    kind = models.CharField(max_length=20)  # toolbar, inline or bulk
+    object_id = models.CharField(max_length=200, blank=True)
+    ids = models.JSONField(default=list, blank=True)
+    query = models.TextField(blank=True)  # list query string of filtered toolbar actions
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL)
+    session_key = models.CharField(max_length=40, blank=True)  # owner of jobs queued anonymously
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.QUEUED)
+    progress = models.PositiveSmallIntegerField(default=0)  # percent
+    result = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['model', 'user', '-created_at']),
+            models.Index(fields=['model', 'session_key', '-created_at']),
+        ]
+
+    def __str__(self):
+        return f'{self.label} ({self.get_status_display()})'
+
+    @property
+    def active(self):
+        return self.status in (self.Status.QUEUED, self.Status.RUNNING)
@@ -0,0 +1,336 @@
+import hashlib
+from collections import namedtuple
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, FieldDoesNotExist, ValidationError
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import DatabaseError, connections
+from django.db.models import F, Q
+from django.utils.functional import cached_property
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class KeysetPage:
+    """
+    A page of rows produced by KeysetPaginator.
+
+    Mirrors the parts of Django's Page used by the templates, but links to
+    neighbouring pages through opaque cursor tokens instead of page numbers.
+    """
+
+    is_keyset = True
+
+    def __init__(self, object_list, has_next=False, has_previous=False, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+
+class KeysetPaginator:
+    """
+    Paginates a QuerySet on its active sort field plus a `pk` tie-breaker.
+
+    Each page is a single `WHERE (field, pk) > cursor ORDER BY field, pk LIMIT n`
+    query, so neither a `COUNT(*)` nor an `OFFSET` is needed and deep pages cost
+    the same as the first one. On nullable fields NULL sorts as the largest
+    value (`NULLS LAST` ascending, `NULLS FIRST` descending). Related, annotated
+    or expression orderings cannot be paged this way: `supported` is False and
+    callers should fall back to numbered pages.
+    """
+
+    salt = 'frontend.pagination.keyset'
+
+    def __init__(self, objects, per_page):
+        self.per_page = int(per_page)
+        self.model = objects.model
+        self.field, self.descending, self.supported = self._resolve_ordering(objects)
+        self.ordering_key = f"{'-' if self.descending else ''}{self.field.name if self.field else 'pk'}"
+        self.objects = objects
+
+    def _resolve_ordering(self, objects):
+        """
+        Returns (field, descending, supported); field is None when paging on pk.
+        """
+
+        ordering = objects.query.order_by
+        if not ordering:
+            return None, False, True
+        if not isinstance(ordering[0], str):
+            return None, False, False
+        descending = ordering[0].startswith('-')
+        name = ordering[0].lstrip('-')
+        if name == 'pk':
+            return None, descending, True
+        if name == '?':
+            return None, descending, False
+        try:
+            field = self.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            logger.debug("Keyset pagination cannot page on '%s'.", name)
+            return None, descending, False
+        if field.primary_key:
+            return None, descending, True
+        if field.is_relation or not field.concrete:
+            return None, descending, False
+        return field, descending, True
+
+    def encode_cursor(self, value, pk, backwards=False):
+        return signing.dumps({
+            'o': self.ordering_key,
+            'v': None if value is None else str(value),
+            'pk': str(pk),
+            'b': backwards,
+        }, salt=self.salt, compress=True)
+
+    def decode_cursor(self, token):
+        """
+        Returns (value, pk, backwards) for a valid token of the current ordering, else None.
+        """
+
+        if not token:
+            return None
+        try:
+            data = signing.loads(token, salt=self.salt)
+            if data.get('o') != self.ordering_key:
+                return None
+            pk = self.model._meta.pk.to_python(data['pk'])
+            value = self.field.to_python(data['v']) if self.field else None
+        except (signing.BadSignature, KeyError, TypeError, ValueError, ValidationError) as error:
+            logger.debug("Ignoring invalid keyset cursor: %s", error)
+            return None
+        return value, pk, bool(data.get('b'))
+
+    def _row_value(self, row, name):
+        if isinstance(row, dict):
+            return row[name]
+        return getattr(row, name)
+
+    def _row_pk(self, row):
+        if isinstance(row, dict):
+            return row['id'] if 'id' in row else row['pk']
+        return row.pk
+
+    def _cursor_values(self, rows):
+        """
+        Returns {pk: sort value} for the given rows, fetching the sort field in
+        one extra query when it is not part of the selected columns.
+        """
+
+        pks = [self._row_pk(row) for row in rows]
+        if self.field is None:
+            return dict.fromkeys(pks)
+        attname = self.field.attname
+        if any(isinstance(row, dict) and attname not in row for row in rows):
+            return dict(self.model._default_manager.filter(pk__in=pks).values_list('pk', attname))
+        return {self._row_pk(row): self._row_value(row, attname) for row in rows}
+
+    def _seek_filter(self, name, lookup, value, pk):
+        """
+        Q for rows after (value, pk) in the traversal order; NULL is the largest value.
+        """
+
+        after = Q(**{f'{name}__{lookup}': value}) | Q(**{name: value, f'pk__{lookup}': pk})
+        if not self.field.null:
+            return after
+        if value is None:
+            tail = Q(**{f'{name}__isnull': True, f'pk__{lookup}': pk})
+            return tail if lookup == 'gt' else tail | Q(**{f'{name}__isnull': False})
+        return (after | Q(**{f'{name}__isnull': True})) if lookup == 'gt' else after
+
+    def get_queryset(self, cursor=None, backwards=False):
+        descending = self.descending != backwards
+        lookup = 'lt' if descending else 'gt'
+        objects = self.objects
+        if cursor is not None:
+            value, pk = cursor
+            if self.field is None:
+                objects = objects.filter(**{f'pk__{lookup}': pk})
+            else:
+                objects = objects.filter(self._seek_filter(self.field.name, lookup, value, pk))
+        prefix = '-' if descending else ''
+        if self.field is None:
+            return objects.order_by(f'{prefix}pk')
+        if self.field.null:
+            field = F(self.field.name)
+            order = field.desc(nulls_first=True) if descending else field.asc(nulls_last=True)
+            return objects.order_by(order, f'{prefix}pk')
+        return objects.order_by(f'{prefix}{self.field.name}', f'{prefix}pk')
+
+    def get_page(self, token=None):
+        decoded = self.decode_cursor(token)
+        cursor, backwards = (decoded[:2], decoded[2]) if decoded else (None, False)
+
+        rows = list(self.get_queryset(cursor, backwards)[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if backwards:
+            rows.reverse()
+
+        has_next = has_more if not backwards else True
+        has_previous = has_more if backwards else cursor is not None
+        if not rows:
+            return KeysetPage(rows)
+
+        values = self._cursor_values([rows[0], rows[-1]])
+        first_pk, last_pk = self._row_pk(rows[0]), self._row_pk(rows[-1])
+        return KeysetPage(
+            rows,
+            has_next=has_next,
+            has_previous=has_previous,
+            next_cursor=self.encode_cursor(values[last_pk], last_pk) if has_next else None,
+            previous_cursor=self.encode_cursor(values[first_pk], first_pk, backwards=True) if has_previous else None,
+        )
+
+
+# value: number of rows, exact: whether pages may trust it, display: label shown to users
+ResultCount = namedtuple('ResultCount', ('value', 'exact', 'display'))
+
+
+def exact_count(objects):
+    """
+    Counts all matching rows with a full COUNT(*).
+    """
+
+    value = objects.count()
+    return ResultCount(value, True, str(value))
+
+
+def capped_count(objects, cap):
+    """
+    Counts at most `cap + 1` rows, so the scan stops early on huge tables.
+    """
+
+    value = objects.order_by()[:cap + 1].count()
+    if value > cap:
+        return ResultCount(cap, False, f'{cap}+')
+    return ResultCount(value, True, str(value))
+
+
+def _table_estimate(model, using):
+    """
+    Reads the planner's row estimate for the model table, or None if unavailable.
+    """
+
+    connection = connections[using]
+    table = model._meta.db_table
+    try:
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)", [table])
+                row = cursor.fetchone()
+                return row[0] if row and row[0] is not None and row[0] >= 0 else None
+            if connection.vendor == 'sqlite':
+                cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1", [table])
+                row = cursor.fetchone()
+                return int(row[0].split()[0]) if row else None
+    except DatabaseError as error:
+        logger.debug("No planner row estimate for %s: %s", table, error)
+    return None
+
+
+def estimated_count(objects, cap):
+    """
+    Uses the planner's table statistics (PostgreSQL `pg_class.reltuples`,
+    SQLite `sqlite_stat1`) for unfiltered listings and a capped count otherwise.
+    """
+
+    if not objects.query.where:
+        value = _table_estimate(objects.model, objects.db)
+        if value is not None:
+            return ResultCount(value, False, f'~{value}')
+    return capped_count(objects, cap)
+
+
+def cached_count(objects, timeout, cache_backend=None):
+    """
+    Exact count cached for `timeout` seconds, keyed by the query's SQL and
+    parameters so every filter/search/scope combination gets its own entry.
+    """
+
+    cache_backend = cache_backend or cache
+    try:
+        sql, params = objects.order_by().query.sql_with_params()
+    except EmptyResultSet:
+        return ResultCount(0, True, '0')
+    signature = hashlib.md5(f'{objects.db}:{sql}:{params!r}'.encode(), usedforsecurity=False).hexdigest()
+    key = f'frontend:count:{objects.model._meta.label_lower}:{signature}'
+    value = cache_backend.get(key)
+    if value is None:
+        value = objects.count()
+        cache_backend.set(key, value, timeout)
+    return ResultCount(value, False, str(value))
+
+
+class CountPage(Page):
+    """
+    A Page whose has_next() comes from probing one extra row instead of the total.
+    """
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+
+class CountStrategyPaginator(Paginator):
+    """
+    A Paginator whose total comes from a count strategy instead of COUNT(*).
+
+    When the count is not exact, pages are not bounded by it: page() fetches
+    one extra row to decide whether a next page exists.
+    """
+
+    def __init__(self, object_list, per_page, result_count, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.result_count = result_count
+
+    @cached_property
+    def count(self):
+        return self.result_count.value
+
+    @property
+    def count_display(self):
+        return self.result_count.display
+
+    def validate_number(self, number):
+        if self.result_count.exact:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('That page number is not an integer')
+        if number < 1:
+            raise EmptyPage('That page number is less than 1')
+        return number
+
+    def page(self, number):
+        if self.result_count.exact:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        return CountPage(rows[:self.per_page], number, self, has_next=len(rows) > self.per_page)
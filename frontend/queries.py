@@ -0,0 +1,124 @@
+import re
+import time
+from contextlib import ExitStack, contextmanager
+from django.conf import settings
+from django.db import connections
+import logging
+
+logger = logging.getLogger(__name__)
+
+N_PLUS_ONE_THRESHOLD = 5
+
+_IN_LIST = re.compile(r'\(\s*%s(?:\s*,\s*%s)+\s*\)')
+
+
+class QueryBudgetExceeded(Exception):
+    """
+    Raised when a request runs more queries than its model's `query_budget`
+    and FRONTEND_QUERY_BUDGET_RAISE is enabled.
+    """
+
+
+def normalize_sql(sql):
+    """
+    Returns the SQL template with variable-length `IN (%s, %s, ...)` lists
+    collapsed, so queries that only differ in parameters compare equal.
+    """
+
+    return _IN_LIST.sub('(%s...)', sql)
+
+
+def is_tracking_enabled(query_budget=None):
+    return query_budget is not None or getattr(settings, 'FRONTEND_QUERY_TRACKING', settings.DEBUG)
+
+
+class QueryTracker:
+    """
+    Records the SQL queries of one request, grouped by request stage.
+
+    Installed as a database execute wrapper by track(); the view moves
+    `stage` forward (auth, filter_options, facets, pagination, render, ...)
+    so every query is attributed to the stage that triggered it.
+    """
+
+    def __init__(self, label, query_budget=None):
+        self.label = label
+        self.query_budget = query_budget
+        self.stage = 'request'
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((self.stage, sql, time.perf_counter() - start))
+
+    @contextmanager
+    def track(self):
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self))
+            yield self
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def duration(self):
+        return sum(duration for _, _, duration in self.queries)
+
+    def get_stages(self):
+        """
+        Returns {stage: (query count, seconds)} in the order stages were entered.
+        """
+
+        stages = {}
+        for stage, _, duration in self.queries:
+            count, total = stages.get(stage, (0, 0.0))
+            stages[stage] = (count + 1, total + duration)
+        return stages
+
+    def get_repeated_queries(self, threshold=None):
+        """
+        Returns [(sql, count)] for statements run at least `threshold` times
+        with different parameters, the usual signature of an N+1 loop.
+        """
+
+        threshold = threshold or getattr(settings, 'FRONTEND_N_PLUS_ONE_THRESHOLD', N_PLUS_ONE_THRESHOLD)
+        counts = {}
+        for _, sql, _ in self.queries:
+            sql = normalize_sql(sql)
+            counts[sql] = counts.get(sql, 0) + 1
+        return [(sql, count) for sql, count in counts.items() if count >= threshold]
+
+    def get_server_timing(self):
+        """
+        Returns a Server-Timing header value with the total and per-stage DB time.
+        """
+
+        metrics = [f'db;dur={self.duration * 1000:.2f};desc="{self.count} queries"']
+        for stage, (count, duration) in self.get_stages().items():
+            metrics.append(f'db-{stage};dur={duration * 1000:.2f};desc="{count} queries"')
+        return ', '.join(metrics)
+
+    def report(self):
+        """
+        Logs the per-stage summary, warns about likely N+1 queries and
+        enforces the query budget.
+        """
+
+        stages = ', '.join(
+            f'{stage} {count}/{duration * 1000:.2f}ms' for stage, (count, duration) in self.get_stages().items()
+        )
+        logger.debug("%s: %d queries in %.2fms (%s)", self.label, self.count, self.duration * 1000, stages)
+
+        for sql, count in self.get_repeated_queries():
+            logger.warning("%s: likely N+1, %d similar queries: %s", self.label, count, sql)
+
+        if self.query_budget is not None and self.count > self.query_budget:
+            message = f"{self.label}: {self.count} queries exceed the query budget of {self.query_budget} ({stages})"
+            if getattr(settings, 'FRONTEND_QUERY_BUDGET_RAISE', settings.DEBUG):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
@@ -0,0 +1,123 @@
+from django.template.base import render_value_in_context
+from django.template.defaulttags import CsrfTokenNode
+from django.urls import reverse
+from django.utils.http import RFC3986_SUBDELIMS
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+from django_bootstrap5.components import render_button
+from urllib.parse import quote
+
+# stands in for the object id while reversing a row URL once per page
+ID_PLACEHOLDER = 'frontend-row-id'
+
+EDIT_BUTTON_CONTENT = mark_safe("<i class='bi bi-pencil'></i> Edit")
+
+# the form of `_bulk.html` that row checkboxes belong to
+BULK_FORM_ID = 'FrontendBulkForm'
+
+
+class RowRenderer:
+    """
+    Renders the rows of a list page in Python with the markup of the
+    `_table.html`/`_cards.html` row loops.
+
+    URL prefixes, button HTML, the CSRF input and the column order are
+    built once per page; each row then only formats its own values and id.
+    """
+
+    def __init__(self, columns, segments, inline_actions=(), change=False, csrf_input='', url_name='frontend',
+                 selectable=False):
+        self.columns = tuple(columns)
+        self.selectable = selectable
+        self.inline_actions = tuple(
+            (self.url_parts(url_name, segments, inline_action['name']), render_button(inline_action['label'], button_type="submit"))
+            for inline_action in inline_actions
+        )
+        self.change = self.url_parts(url_name, segments, 'table_change') if change else None
+        self.edit_button = render_button(EDIT_BUTTON_CONTENT, button_type="button") if change else ''
+        self.csrf_input = csrf_input
+
+    @classmethod
+    def from_context(cls, context):
+        """
+        Builds a renderer from the list page template context.
+        """
+
+        table = context['table']
+        option = context['option']['table']
+        fields = table.get('columns', table['fields'])
+        return cls(
+            columns=fields if 'id' in fields else [field for field in fields if field != 'id'],
+            segments=context['segments'],
+            inline_actions=table['inline_actions'] if option['inline_button'] else (),
+            change=option['change'],
+            csrf_input=CsrfTokenNode().render(context),
+            selectable=bool(option.get('bulk_button')),
+        )
+
+    @staticmethod
+    def url_parts(url_name, segments, action):
+        url = reverse(url_name, kwargs={
+            'app_name': segments[1],
+            'model_name': segments[2],
+            'action': action,
+            'id': ID_PLACEHOLDER,
+        })
+        prefix, _, suffix = url.rpartition(ID_PLACEHOLDER)
+        return prefix, suffix
+
+    @staticmethod
+    def url(parts, id):
+        return escape(parts[0] + quote(str(id), safe=RFC3986_SUBDELIMS + "~:@") + parts[1])
+
+    @staticmethod
+    def checkbox(id):
+        return (
+            f'<input class="form-check-input" type="checkbox" name="ids" value="{escape(id)}" '
+            f'form="{BULK_FORM_ID}" aria-label="Select row">'
+        )
+
+    def render_table(self, rows, context):
+        html = []
+        append = html.append
+        columns = self.columns
+        for row in rows:
+            id = row['id']
+            append('<tr>')
+            if self.selectable:
+                append(f'<td>{self.checkbox(id)}</td>')
+            for name in columns:
+                append(f'<td>{render_value_in_context(row[name], context)}</td>')
+            for url_parts, button in self.inline_actions:
+                append(
+                    f'<td><form method="post" class="needs-validation" novalidate action="{self.url(url_parts, id)}">'
+                    f'{self.csrf_input}{button}</form></td>'
+                )
+            if self.change:
+                append(f'<td><a href="{self.url(self.change, id)}">{self.edit_button}</a></td>')
+            append('</tr>')
+        return mark_safe(''.join(html))
+
+    def render_cards(self, rows, context):
+        html = []
+        append = html.append
+        columns = [name for name in self.columns if name != 'id']
+        for row in rows:
+            id = row['id']
+            append('<div class="col mt-1 mb-1"><div class="card h-100 w-100"><div class="card-header">')
+            if self.selectable:
+                append(self.checkbox(id))
+            append('</div><div class="card-body d-flex flex-column">')
+            for name in columns:
+                append(f'<p class="card-text">{escape(name)}: {render_value_in_context(row[name], context)}</p>')
+            append('<div class="d-flex flex-wrap gap-2 mt-auto">')
+            for url_parts, button in self.inline_actions:
+                append(
+                    f'<div><form method="post" class="needs-validation" novalidate action="{self.url(url_parts, id)}">'
+                    f'{self.csrf_input}{button}</form></div>'
+                )
+            append('</div><div class="d-flex flex-wrap gap-2 mt-2">')
+            if self.change:
+                append(f'<div><a href="{self.url(self.change, id)}">{self.edit_button}</a></div>')
+            append('</div></div></div></div>')
+        return mark_safe(''.join(html))
@@ -0,0 +1,363 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from django.db import DatabaseError, connections, transaction
+from django.db.models import F, Q
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import pre_delete, pre_save, post_save
+from django.utils.module_loading import import_string
+import logging
+
+logger = logging.getLogger(__name__)
+
+# {(model, database): pks} reindexed by reindex_rows(), which the index signals skip
+_reindexed_rows = ContextVar('frontend_reindexed_rows', default={})
+
+
+class SearchBackend:
+    """
+    Base class for ModelFrontend search backends.
+
+    A backend narrows a QuerySet to the rows matching `search_query` over
+    `search_fields` and may order the result by relevance. Backends that
+    cannot serve a QuerySet (wrong database vendor, missing index, related
+    lookups) return False from supports() and the icontains backend is used.
+    """
+
+    name = None
+
+    def supports(self, objects, search_fields):
+        return True
+
+    def search(self, objects, search_fields, search_query):
+        raise NotImplementedError
+
+    def rebuild(self, model, search_fields, using='default'):
+        """
+        (Re)creates any index the backend needs. Returns True if something was rebuilt.
+        """
+        return False
+
+    def index_rows(self, model, search_fields, pks, using='default'):
+        """
+        Adds rows inserted without signals, e.g. by bulk_create(), to any
+        index the backend keeps.
+        """
+
+
+class IContainsSearchBackend(SearchBackend):
+    """
+    ORs a case-insensitive `icontains` lookup over every search field.
+    Works everywhere, but cannot use B-tree indexes.
+    """
+
+    name = 'icontains'
+
+    def search(self, objects, search_fields, search_query):
+        query = Q()
+        for field in search_fields:
+            query |= Q(**{f"{field}__icontains": search_query})
+        return objects.filter(query)
+
+
+class PostgresSearchBackend(SearchBackend):
+    """
+    Full-text search with `to_tsvector(...) @@ websearch_to_tsquery(...)`,
+    ordered by `ts_rank`. Add a GinIndex on the same SearchVector expression
+    (same fields and config) so PostgreSQL can answer it from the index.
+    """
+
+    name = 'postgres'
+    config = 'simple'
+
+    def supports(self, objects, search_fields):
+        return connections[objects.db].vendor == 'postgresql'
+
+    def get_vector(self, search_fields):
+        from django.contrib.postgres.search import SearchVector
+
+        return SearchVector(*search_fields, config=self.config)
+
+    def search(self, objects, search_fields, search_query):
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        vector = self.get_vector(search_fields)
+        query = SearchQuery(search_query, config=self.config, search_type='websearch')
+        # the vector is only filtered on; annotating it would select it into every row
+        return objects.alias(search_vector=vector) \
+                      .filter(search_vector=query) \
+                      .annotate(search_rank=SearchRank(vector, query)) \
+                      .order_by('-search_rank', 'pk')
+
+
+class SQLiteFTS5SearchBackend(SearchBackend):
+    """
+    Full-text search through an SQLite FTS5 external-content table named
+    `<db_table>_fts` over the search fields, ordered by FTS5 `rank` (bm25).
+
+    The table is created by `manage.py frontend_search_rebuild` and kept in
+    sync by pre_save/post_save/pre_delete signals; until it exists searches
+    fall back to icontains. Every search term is matched as a prefix.
+    """
+
+    name = 'sqlite_fts5'
+    sync_batch_size = 500
+
+    def __init__(self):
+        self._existing_tables = set()
+
+    def get_table(self, model):
+        return f'{model._meta.db_table}_fts'
+
+    def table_exists(self, model, using):
+        table = self.get_table(model)
+        if (using, table) in self._existing_tables:
+            return True
+        if connections[using].vendor != 'sqlite':
+            return False
+        try:
+            with connections[using].cursor() as cursor:
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [table])
+                exists = cursor.fetchone() is not None
+        except DatabaseError as error:
+            logger.debug("Cannot inspect FTS5 table %s: %s", table, error)
+            return False
+        if exists:
+            self._existing_tables.add((using, table))
+        return exists
+
+    def supports(self, objects, search_fields):
+        if connections[objects.db].vendor != 'sqlite':
+            return False
+        if any('__' in field for field in search_fields):
+            return False
+        return self.table_exists(objects.model, objects.db)
+
+    @staticmethod
+    def match_expression(search_query):
+        """
+        Quotes every whitespace separated term as an FTS5 prefix query, so user
+        input can never produce an FTS5 syntax error.
+        """
+
+        terms = ['"%s"*' % term.replace('"', '""') for term in search_query.split()]
+        return ' '.join(terms)
+
+    def _columns(self, model, search_fields):
+        return [model._meta.get_field(field).column for field in search_fields]
+
+    def search(self, objects, search_fields, search_query):
+        match = self.match_expression(search_query)
+        if not match:
+            return objects
+        connection = connections[objects.db]
+        quote = connection.ops.quote_name
+        table, fts_table = objects.model._meta.db_table, self.get_table(objects.model)
+        pk_column = objects.model._meta.pk.column
+        matches = RawSQL(f"SELECT rowid FROM {quote(fts_table)} WHERE {quote(fts_table)} MATCH %s", [match])
+        rank = RawSQL(
+            f"(SELECT rank FROM {quote(fts_table)} WHERE {quote(fts_table)} MATCH %s "
+            f"AND rowid = {quote(table)}.{quote(pk_column)})",
+            [match],
+        )
+        return objects.filter(pk__in=matches).annotate(search_rank=rank).order_by(F('search_rank').asc(), 'pk')
+
+    def rebuild(self, model, search_fields, using='default'):
+        connection = connections[using]
+        if connection.vendor != 'sqlite':
+            return False
+        quote = connection.ops.quote_name
+        fts_table = self.get_table(model)
+        columns = ', '.join(quote(column) for column in self._columns(model, search_fields))
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {quote(fts_table)}")
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE {quote(fts_table)} USING fts5({columns}, "
+                f"content='{model._meta.db_table}', content_rowid='{model._meta.pk.column}')"
+            )
+            cursor.execute(f"INSERT INTO {quote(fts_table)}({quote(fts_table)}) VALUES ('rebuild')")
+        self._existing_tables.add((using, fts_table))
+        return True
+
+    def _sync(self, model, search_fields, pks, using, delete):
+        """
+        Copies the stored rows into the index, or removes them with the FTS5
+        'delete' command, which needs the values that were indexed.
+        """
+
+        pks = [pk for pk in pks if pk is not None]
+        if not pks or not self.table_exists(model, using):
+            return
+        connection = connections[using]
+        quote = connection.ops.quote_name
+        table, fts_table = model._meta.db_table, self.get_table(model)
+        columns = ', '.join(quote(column) for column in self._columns(model, search_fields))
+        pk_column = quote(model._meta.pk.column)
+        # stay below SQLite's limit of bound parameters per statement
+        for start in range(0, len(pks), self.sync_batch_size):
+            batch = pks[start:start + self.sync_batch_size]
+            where = f"{pk_column} IN ({', '.join(['%s'] * len(batch))})"
+            if delete:
+                sql = (f"INSERT INTO {quote(fts_table)}({quote(fts_table)}, rowid, {columns}) "
+                       f"SELECT 'delete', {pk_column}, {columns} FROM {quote(table)} WHERE {where}")
+            else:
+                sql = (f"INSERT INTO {quote(fts_table)}(rowid, {columns}) "
+                       f"SELECT {pk_column}, {columns} FROM {quote(table)} WHERE {where}")
+            with connection.cursor() as cursor:
+                cursor.execute(sql, batch)
+
+    def remove_instance(self, instance, search_fields, using):
+        self._sync(type(instance), search_fields, [instance.pk], using, delete=True)
+
+    def index_instance(self, instance, search_fields, using):
+        self._sync(type(instance), search_fields, [instance.pk], using, delete=False)
+
+    def index_rows(self, model, search_fields, pks, using='default'):
+        self._sync(model, search_fields, list(pks), using, delete=False)
+
+    def read_rows(self, model, search_fields, pks, using='default'):
+        """
+        Returns the stored (rowid, *columns) of the rows `pks`: the values the
+        index holds for them, which remove_rows() needs once they changed.
+        """
+
+        connection = connections[using]
+        quote = connection.ops.quote_name
+        columns = ', '.join(quote(column) for column in self._columns(model, search_fields))
+        pk_column = quote(model._meta.pk.column)
+        rows = []
+        for start in range(0, len(pks), self.sync_batch_size):
+            batch = pks[start:start + self.sync_batch_size]
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT {pk_column}, {columns} FROM {quote(model._meta.db_table)} "
+                    f"WHERE {pk_column} IN ({', '.join(['%s'] * len(batch))})",
+                    batch,
+                )
+                rows.extend(cursor.fetchall())
+        return rows
+
+    def remove_rows(self, model, search_fields, rows, using='default'):
+        """
+        Removes rows read by read_rows() from the index with the FTS5 'delete'
+        command, after a write without signals changed or deleted them.
+        """
+
+        connection = connections[using]
+        quote = connection.ops.quote_name
+        fts_table = quote(self.get_table(model))
+        columns = self._columns(model, search_fields)
+        values = ', '.join(['%s'] * (len(columns) + 1))
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {fts_table}({fts_table}, rowid, {', '.join(quote(column) for column in columns)}) "
+                f"VALUES ('delete', {values})",
+                rows,
+            )
+
+
+SEARCH_BACKENDS = {
+    'icontains': 'frontend.search.IContainsSearchBackend',
+    'postgres': 'frontend.search.PostgresSearchBackend',
+    'sqlite_fts5': 'frontend.search.SQLiteFTS5SearchBackend',
+}
+
+
+@lru_cache(maxsize=None)
+def _load_search_backend(backend):
+    if isinstance(backend, str):
+        backend = import_string(SEARCH_BACKENDS.get(backend, backend))
+    return backend()
+
+
+def get_search_backend(backend):
+    """
+    Resolves a ModelFrontend.search_backend value: a SearchBackend instance,
+    a SearchBackend subclass, a built-in name or a dotted import path.
+    Backends are instantiated once per process.
+    """
+
+    if isinstance(backend, SearchBackend):
+        return backend
+    return _load_search_backend(backend or 'icontains')
+
+
+def _get_indexed_config(model):
+    from frontend import site
+
+    model_config = site._registry.get(model)
+    if model_config is None or not model_config.get_search_fields():
+        return None, None
+    backend = model_config.get_search_backend()
+    if not isinstance(backend, SQLiteFTS5SearchBackend):
+        return None, None
+    return backend, model_config.get_search_fields()
+
+
+def index_created_rows(model, pks, using='default'):
+    """
+    Adds rows inserted without signals, e.g. by bulk_create(), to the search
+    index of the model's backend. Does nothing for backends without one.
+    """
+
+    from frontend import site
+
+    model_config = site._registry.get(model)
+    if model_config is not None and model_config.get_search_fields():
+        model_config.get_search_backend().index_rows(model, model_config.get_search_fields(), pks, using)
+
+
+@contextmanager
+def reindex_rows(objects):
+    """
+    Keeps the search index in step with a write to the rows of `objects`
+    that skips signals, e.g. a set-based action: their indexed values are
+    read before the block, which may still search the index, and afterwards
+    the rows are removed from the index with them and the rows left are
+    indexed again, in one transaction.
+    """
+
+    backend, search_fields = _get_indexed_config(objects.model)
+    if backend is None or not backend.table_exists(objects.model, objects.db):
+        yield
+        return
+    model, using = objects.model, objects.db
+    pks = list(objects.values_list('pk', flat=True))
+    # saves and deletes of these rows in the block must not touch the index again
+    token = _reindexed_rows.set({**_reindexed_rows.get(), (model, using): set(pks)})
+    try:
+        with transaction.atomic(using=using):
+            rows = backend.read_rows(model, search_fields, pks, using)
+            yield
+            backend.remove_rows(model, search_fields, rows, using)
+            backend.index_rows(model, search_fields, pks, using)
+    finally:
+        _reindexed_rows.reset(token)
+
+
+def _is_reindexed(model, instance, using):
+    return instance.pk in _reindexed_rows.get().get((model, using), ())
+
+
+def search_index_pre_save(sender, instance, raw=False, using='default', **kwargs):
+    backend, search_fields = _get_indexed_config(sender)
+    if backend is not None and not raw and not _is_reindexed(sender, instance, using):
+        backend.remove_instance(instance, search_fields, using)
+
+
+def search_index_post_save(sender, instance, raw=False, using='default', **kwargs):
+    backend, search_fields = _get_indexed_config(sender)
+    if backend is not None and not raw and not _is_reindexed(sender, instance, using):
+        backend.index_instance(instance, search_fields, using)
+
+
+def search_index_pre_delete(sender, instance, using='default', **kwargs):
+    backend, search_fields = _get_indexed_config(sender)
+    if backend is not None and not _is_reindexed(sender, instance, using):
+        backend.remove_instance(instance, search_fields, using)
+
+
+def connect_search_index_signals():
+    pre_save.connect(search_index_pre_save, dispatch_uid='frontend_search_index_pre_save')
+    post_save.connect(search_index_post_save, dispatch_uid='frontend_search_index_post_save')
+    pre_delete.connect(search_index_pre_delete, dispatch_uid='frontend_search_index_pre_delete')
@@ -1,9 +1,17 @@
 import logging
+import threading
 from abc import ABC
 from importlib import import_module
 from django.apps import apps
+from django.core.exceptions import ImproperlyConfigured
 from django.db import models
-from django.shortcuts import render
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.urls import get_script_prefix, get_urlconf
+from django.utils.safestring import mark_safe
+from frontend.forms import clear_form_class_cache
+
+TEMPLATE_ENGINES = ('django', 'jinja2')
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +56,9 @@ class FrontendSiteAbstract(ABC):
         self.navbar_registry = None
         self.cards = None
         self._sidebar_navigation = None
+        self._navigation_cache = {}
+        self._model_plans = {}
+        self._model_plans_lock = threading.Lock()
 
     @property
     def urls(self):
@@ -55,8 +66,11 @@ class FrontendSiteAbstract(ABC):
         Returns the urlpatterns and the frontend site namespace.
         """
 
-        from ..urls import urlpatterns
-        return urlpatterns, "", self.name
+        from ..urls import get_urlpatterns
+        from ..views import AsyncFrontendModelView, FrontendModelView
+
+        view_class = AsyncFrontendModelView if self.async_views else FrontendModelView
+        return get_urlpatterns(view_class), "", self.name
 
     def register(self, model, frontend_class=None):
         """
@@ -66,6 +80,9 @@ class FrontendSiteAbstract(ABC):
         if frontend_class is None:
             raise AttributeError('Please specify a frontend class')
         self._registry[model] = frontend_class()
+        self._model_plans.pop(model, None)
+        self.clear_navigation_cache()
+        clear_form_class_cache()
 
     def unregister(self, model):
         """
@@ -73,6 +90,18 @@ class FrontendSiteAbstract(ABC):
         """
 
         del self._registry[model]
+        self._model_plans.pop(model, None)
+        self.clear_navigation_cache()
+        clear_form_class_cache()
+
+    def clear_navigation_cache(self):
+        """
+        Drops the precomputed navbar, cards and sidebars after registry changes.
+        """
+
+        self._navigation_cache.clear()
+        self.navbar_registry = None
+        self.cards = None
 
     def autodiscover_modules(self):
         """
@@ -96,12 +125,66 @@ class FrontendSiteAbstract(ABC):
         self.global_config = self._registry['config'].__class__
         return  self.global_config
 
+    @property
+    def authentication(self):
+        """
+        Whether logins can be enforced (see Config.authentication), read from
+        the registered config instance and memoized per URLConf.
+        """
+
+        return getattr(self._registry['config'], 'authentication', True)
+
+    @property
+    def login_required(self):
+        """
+        Whether the global config requires login and logins can be enforced.
+        """
+
+        config = self._registry['config']
+        return bool(getattr(config, 'login_required', True) and self.authentication)
+
+    @property
+    def template_engine(self):
+        """
+        The template set pages are rendered with: 'django' (templates/) or
+        'jinja2' (jinja2/), from Config.template_engine.
+        """
+
+        engine = getattr(self._registry.get('config'), 'template_engine', 'django')
+        if engine not in TEMPLATE_ENGINES:
+            raise ImproperlyConfigured(f"FRONTEND_TEMPLATE_ENGINE must be one of {TEMPLATE_ENGINES}, not {engine!r}.")
+        return engine
+
+    @property
+    def async_views(self):
+        """
+        Whether model pages are served by AsyncFrontendModelView, from Config.async_views.
+        """
+
+        return bool(getattr(self._registry.get('config'), 'async_views', False))
+
+    def render_to_string(self, template, context=None, request=None):
+        """
+        Renders a frontend template with the configured template set.
+        """
+
+        if self.template_engine == 'jinja2':
+            from frontend.jinja import get_jinja2_engine
+
+            # rendered markup, as Django's render_to_string() returns it,
+            # so pages do not escape it again, e.g. the cached sidebar
+            return mark_safe(get_jinja2_engine().get_template(template).render(context, request))
+        return render_to_string(template, context, request)
+
 
     def get_navbar_registry(self):
         """
-        gets the navbar registry with models from the registered frontend classes.
+        gets the navbar registry with models from the registered frontend classes,
+        built once and reused until the registry changes.
         """
 
+        if self.navbar_registry is not None:
+            return self.navbar_registry
         self.navbar_registry = {}
         for model in self._registry.keys():
             if model == 'config':
@@ -150,6 +233,7 @@ class FrontendSiteAbstract(ABC):
                 f"to lists of model identifiers, got {type(structure).__name__}."
             )
         self._sidebar_navigation = structure
+        self._navigation_cache.clear()
 
     def get_sidebar_registry(self, request=None):
         """
@@ -162,17 +246,48 @@ class FrontendSiteAbstract(ABC):
         - Account links are auto-appended if accounts are registered.
         When `_sidebar_navigation` is None:
         - Falls back to app-based grouping from the registry.
+
+        The sidebar only depends on whether model links are visible, so it is
+        built once per visibility state and shared (read-only) between requests.
         """
         # Auth-aware filtering: hide model links from anonymous users when auth is required
         hide_models = False
         if request is not None:
-            if not self.global_config:
-                self.get_global_config()
-            login_required = getattr(self.global_config, 'login_required', True)
-            authentication = getattr(self.global_config(), 'authentication', False)
-            if login_required and authentication and not getattr(request.user, 'is_authenticated', False):
+            if self.login_required and not getattr(request.user, 'is_authenticated', False):
                 hide_models = True
 
+        return self.get_sidebar_for_state(hide_models)
+
+    def get_sidebar_for_state(self, hide_models):
+        """
+        Returns the precomputed sidebar for a visibility state, rebuilding it
+        when the sidebar structure or the global config was replaced.
+        """
+
+        if not self.global_config:
+            self.get_global_config()
+        cached = self._navigation_cache.get(('sidebar', hide_models))
+        if cached is not None and cached[0] is self._sidebar_navigation and cached[1] is self.global_config:
+            return cached[2]
+        sidebar = self._build_sidebar_registry(hide_models)
+        self._navigation_cache[('sidebar', hide_models)] = (self._sidebar_navigation, self.global_config, sidebar)
+        return sidebar
+
+    def get_sidebar_html(self, sidebar):
+        """
+        Returns the rendered frontend/_sidebar.html for a precomputed sidebar,
+        rendered once per sidebar, URL prefix and URLconf.
+        """
+
+        key = ('sidebar_html', id(sidebar), self.template_engine, get_script_prefix(), get_urlconf())
+        cached = self._navigation_cache.get(key)
+        if cached is not None and cached[0] is sidebar:
+            return cached[1]
+        html = self.render_to_string('frontend/_sidebar.html', {'meta': {'sidebar': sidebar}})
+        self._navigation_cache[key] = (sidebar, html)
+        return html
+
+    def _build_sidebar_registry(self, hide_models):
         sidebar = []
 
         if not self.global_config:
@@ -246,9 +361,10 @@ class FrontendSiteAbstract(ABC):
             context['meta']['brand'] = getattr(self.global_config, 'brand', 'Django Fast Frontend')
         if not 'logo' in context['meta']:
             context['meta']['logo'] = getattr(self.global_config, 'logo', 'img/django-fast-frontend-logo.png')
-        # Sidebar is rebuilt per-request (intentional: auth state affects visibility)
+        # Sidebar and its HTML are precomputed per visibility state (auth state affects visibility)
         if 'sidebar' not in context['meta']:
             context['meta']['sidebar'] = self.get_sidebar_registry(request=request)
+            context['meta']['sidebar_html'] = self.get_sidebar_html(context['meta']['sidebar'])
         return context
 
     def http_response(self, request, context=None, template=None):
@@ -257,4 +373,4 @@ class FrontendSiteAbstract(ABC):
         """
         context = self.get_site_meta(context, request=request)
 
-        return render(request, template, context)
\ No newline at end of file
+        return HttpResponse(self.render_to_string(template, context, request))
\ No newline at end of file
@@ -1,8 +1,48 @@
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.urls import get_resolver
 from .abstract import FrontendAbstract
 import logging
 
+# {login_required: (root resolver, authentication)}
+_authentication_cache = {}
+
+
+def _resolve_authentication(login_required):
+    """
+    Returns whether logins can be enforced: login is required, authentication
+    backends are configured and the `account_login` URL is wired up.
+
+    Memoized per root URLConf resolver, so a reloaded or replaced URLConf is
+    checked again; setting_changed clears it for AUTHENTICATION_BACKENDS.
+    The missing-configuration warning is logged once per resolution.
+    """
+
+    resolver = get_resolver()
+    cached = _authentication_cache.get(bool(login_required))
+    if cached is not None and cached[0] is resolver:
+        return cached[1]
+
+    authentication = bool(
+        login_required and
+        settings.AUTHENTICATION_BACKENDS and
+        'account_login' in resolver.reverse_dict.keys()
+    )
+    if not authentication:
+        logging.warning('There is no active authentication configuration for your Django Fast Frontend.')
+    _authentication_cache[bool(login_required)] = (resolver, authentication)
+    return authentication
+
+
+@receiver(setting_changed)
+def clear_authentication_cache(setting=None, **kwargs):
+    if setting is None or setting in ('ROOT_URLCONF', 'AUTHENTICATION_BACKENDS'):
+        _authentication_cache.clear()
+        # the home cards and sidebars were built with the previous decision
+        from frontend import site
+
+        site.clear_navigation_cache()
 
 
 class Config(FrontendAbstract):
@@ -16,13 +56,10 @@ class Config(FrontendAbstract):
     logo = str()
     css = str()
     description = str()
+    conditional_get = False  # answer conditional GETs of the home pages with 304 Not Modified
+    template_engine = 'django'  # 'django' or 'jinja2' (frontend/jinja2/ template set)
+    async_views = False  # serve model pages with AsyncFrontendModelView, for ASGI deployments
 
     @property
     def authentication(self):
-        if self.login_required and \
-           settings.AUTHENTICATION_BACKENDS and \
-           'account_login' in get_resolver(None).reverse_dict.keys():
-            return True
-        else:
-            logging.warning('There is no active authentication configuration for your Django Fast Frontend.')
-            return False
+        return _resolve_authentication(self.login_required)
@@ -21,16 +21,32 @@ def register(models=None, site=None):
     return _frontend_register_wrapper
 
 
-def action(function=None, *, description=None):
+def action(function=None, *, description=None, per_object=False, filtered=False, background=False):
     """Attach metadata to a frontend action method.
 
     Mirrors the Django admin action metadata pattern while keeping
     django-fast-frontend's existing string-based action registration.
+
+    Bulk actions (`bulk_button`) receive the queryset of the selected rows;
+    `per_object=True` adapts a handler written for one object, such as an
+    inline action, by calling it once per selected object instead.
+
+    Toolbar actions are called without arguments; `filtered=True` hands them
+    the queryset of the rows matching the list's current search and filters.
+
+    `background=True` queues any kind of action as a `FrontendJob` that a
+    local worker runs (see `frontend.jobs`), so the request returns at once.
     """
 
     def decorator(func):
         if description is not None:
             func.short_description = description
+        if per_object:
+            func.per_object = True
+        if filtered:
+            func.filtered = True
+        if background:
+            func.background = True
         return func
 
     if function is None:
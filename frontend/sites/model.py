@@ -1,8 +1,20 @@
+import asyncio
+from datetime import datetime
+from asgiref.sync import sync_to_async
 from django.contrib.admin.utils import display_for_field
+from django.core.exceptions import FieldDoesNotExist
 from django.core.paginator import Paginator
-from django.db.models import Q
+from django.db.models import CharField, Count, Max, Q, TextField
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.functions import Left
 from django.utils.text import capfirst
+from frontend.filters import facet_counts, filter_option_labels, get_filter_options, get_filter_query, \
+                             get_filter_type, get_range_input_type
 from frontend.forms import generate_form_for_model
+from frontend.search import get_search_backend
+from frontend.versions import get_model_version, get_request_validators, version_datetime
+from frontend.pagination import CountStrategyPaginator, KeysetPaginator, \
+                                capped_count, cached_count, estimated_count, exact_count
 from .abstract import FrontendAbstract
 from .mixin import NotImplementedMixin
 
@@ -17,21 +29,46 @@ class ModelFrontend(FrontendAbstract, NotImplementedMixin):
     # login
     login_required = True
 
+    # instrumentation
+    query_budget = None  # max SQL queries per request; exceeding it logs or raises
+
     # toolbar
     toolbar_button = tuple()
     description = str()
 
     # table
     list_display = tuple()
+    list_preview_length = None  # truncate long text columns to this many characters in the database
+    display_paths = {}  # {fk column: 'relation__field'} joined into the list query instead of str() per page
     cards = False
     list_per_page = 100
+    pagination = 'page'  # 'page' (numbered, COUNT + OFFSET) or 'keyset' (cursor based)
+    count_strategy = 'exact'  # 'exact', 'capped', 'estimate' or 'cached' row count for 'page' pagination
+    count_cap = 1000
+    count_cache_timeout = 60
+    conditional_get = False  # answer If-None-Match/If-Modified-Since on list pages with 304 Not Modified
+    conditional_get_field = None  # e.g. 'updated_at': validate with Max(field) + Count instead of the change version
+    table_cache = False  # cache the rendered table/cards body per model change version
+    table_cache_backend = 'default'  # CACHES alias
+    table_cache_timeout = 300
+    table_cache_scope = 'user'  # 'user', or 'shared' when rows only depend on the login state and staff flags
+    export_formats = tuple()  # e.g. ('csv', 'jsonl'): stream the filtered list view from `table_export`
+    export_chunk_size = 2000  # rows fetched per database round trip and written per response chunk
+    import_formats = tuple()  # e.g. ('csv', 'jsonl'): bulk import from `table_import`, needs add_permission
+    import_batch_size = 1000  # rows validated and inserted per transaction
+    import_max_errors = 100  # failed rows listed on the result page
     view_permission = True
     inline_button = tuple()
+    bulk_button = tuple()  # actions run on the queryset of the rows selected with checkboxes
 
     # table search, sort and filter
     search_fields = tuple()
+    search_backend = 'icontains'  # 'icontains', 'postgres', 'sqlite_fts5', a dotted path or a SearchBackend
     sortable_by = tuple()  # List of fields available for sorting
     list_filter = tuple()  # List of fields available for filtering
+    list_filter_max_options = 100  # above this many distinct values a filter becomes a search input
+    list_filter_cache_timeout = 300
+    list_filter_facets = False  # show per-value row counts next to filter options
 
     # form
     fields = list_display  # follows list_display by default
@@ -52,9 +89,27 @@ class ModelFrontend(FrontendAbstract, NotImplementedMixin):
     def get_list_display(self):
         return self.list_display
 
+    def get_list_preview_length(self):
+        return self.list_preview_length
+
+    def get_display_paths(self):
+        return self.display_paths
+
     def get_fields(self):
         return self.fields
 
+    def get_table_fields(self):
+        """
+        Returns the columns shown for each row: `list_display`, else `fields`.
+        Falls back to every concrete model column except `id` when neither is
+        configured, resolved from `_meta` so no query is needed.
+        """
+
+        fields = self.get_list_display() or self.get_fields()
+        if fields:
+            return list(fields)
+        return [field.attname for field in self.model._meta.concrete_fields if field.attname != 'id']
+
     def get_form_fields(self):
         fields = self.get_fields()
         if not fields:
@@ -78,6 +133,9 @@ class ModelFrontend(FrontendAbstract, NotImplementedMixin):
     def get_search_fields(self):
         return self.search_fields
 
+    def get_search_backend(self):
+        return get_search_backend(self.search_backend)
+
     def get_list_filter(self):
         return self.list_filter
 
@@ -102,6 +160,72 @@ class ModelFrontend(FrontendAbstract, NotImplementedMixin):
     def get_login_required(self):
         return self.login_required
 
+    def get_query_budget(self):
+        return self.query_budget
+
+    def get_conditional_get(self):
+        return self.conditional_get
+
+    def get_table_cache(self):
+        return self.table_cache
+
+    def get_export_formats(self):
+        return tuple(self.export_formats)
+
+    def get_export_fields(self):
+        return self.get_table_fields()
+
+    def get_import_formats(self):
+        return tuple(self.import_formats)
+
+    def get_list_validators(self, request):
+        """
+        Returns (etag, last_modified) for the list page of the request. The
+        model state is its signal-driven change version, or Max() and Count()
+        of `conditional_get_field` over get_queryset(request) in one query,
+        which also catches writes that bypass signals.
+        """
+
+        field = self.conditional_get_field
+        related_versions = self.get_related_versions()
+        if field:
+            state = self.get_queryset(request).aggregate(last_modified=Max(field), count=Count('pk'))
+            last_modified = state['last_modified'] if isinstance(state['last_modified'], datetime) else None
+            version = (state['last_modified'], state['count'], related_versions)
+            if last_modified is not None and related_versions:
+                last_modified = max(last_modified, version_datetime(max(related_versions)))
+        else:
+            version = (get_model_version(self.model), *related_versions)
+            last_modified = version_datetime(max(version))
+        return get_request_validators(request, (self.model._meta.label_lower, version), last_modified)
+
+    def get_display_models(self):
+        """
+        Returns the related models whose data the list rows show: the target
+        of every foreign key column, and each model a display path crosses.
+        """
+
+        display_models = []
+        for model_field, path in self.get_relation_columns(self.get_table_fields()).values():
+            if not path:
+                display_models.append(model_field.related_model)
+                continue
+            model = self.model
+            for name in path.split(LOOKUP_SEP)[:-1]:
+                model = model._meta.get_field(name).related_model
+                if model is None:
+                    break
+                display_models.append(model)
+        return tuple(dict.fromkeys(display_models))
+
+    def get_related_versions(self):
+        """
+        Returns the change versions of get_display_models(), so validators and
+        cached table bodies change when a related label does.
+        """
+
+        return tuple(get_model_version(model) for model in self.get_display_models())
+
     def get_toolbar_button(self):
         return self.toolbar_button
 
@@ -149,6 +273,20 @@ class ModelFrontend(FrontendAbstract, NotImplementedMixin):
     def get_inline_actions(self):
         return [self.get_action_definition(action_name) for action_name in self.get_inline_button()]
 
+    def get_bulk_button(self):
+        return self.bulk_button
+
+    def get_bulk_actions(self):
+        return [self.get_action_definition(action_name) for action_name in self.get_bulk_button()]
+
+    def get_background_actions(self):
+        """
+        Returns the names of the declared actions marked `@action(background=True)`.
+        """
+
+        names = dict.fromkeys((*self.get_toolbar_button(), *self.get_inline_button(), *self.get_bulk_button()))
+        return tuple(name for name in names if getattr(getattr(self, name, None), 'background', False) is True)
+
     def get_readonly_field_value(self, obj, field_name, empty_value_display='-'):
         field = self.model._meta.get_field(field_name)
         value = field.value_from_object(obj)
@@ -200,24 +338,130 @@ class ModelFrontend(FrontendAbstract, NotImplementedMixin):
 
     def queryset(self, request=None, *args, **kwargs):
         """
-        Gets objects of a model with the specified fields.
+        Gets objects of a model with only the displayed columns plus `id`.
         Delegates to get_queryset(request) so subclass overrides are respected.
         """
 
         qs = self.get_queryset(request)
-        fields = self.get_fields()
+        table_fields = self.get_table_fields()
+        previews = self.get_preview_columns(table_fields)
+        paths = [path for _, path in self.get_relation_columns(table_fields).values() if path and path not in table_fields]
+
+        columns = [name for name in table_fields if name not in previews]
+        if 'id' not in table_fields:
+            columns.append('id')
+        preview_length = self.get_list_preview_length()
+        objects = qs.values(*columns, *paths, **{
+            alias: Left(name, preview_length + 1) for name, alias in previews.items()
+        })
+        return objects, table_fields
+
+    def get_filtered_queryset(self, request, query=None):
+        """
+        Returns get_queryset(request) narrowed by the search and filters of
+        `query` (request.GET by default): the rows of the list view across all
+        pages, unsorted.
+        """
 
-        if 'id' in fields:
-            objects = qs.values(*fields)
-        elif not fields:
-            objects = qs.values()
-            if objects.exists():
-                fields = [field for field in objects[0].keys() if field != 'id']
-            else:
-                fields = [field.name for field in self.model._meta.fields if field.name != 'id']
-        else:
-            objects = qs.values(*fields, 'id')
-        return objects, list(fields)
+        query = request.GET if query is None else query
+        objects = self.get_queryset(request)
+        objects = self.get_search_results(objects, self.get_search_fields(), query.get('q', ''))
+        return self.get_filter_results(objects, self.get_list_filter(), self.get_filter_args(query))
+
+    def get_export_queryset(self, request):
+        """
+        Returns the rows of the current list view for export: get_queryset(request)
+        with the search, filters and sort of the query string, as dicts of the
+        export fields without preview truncation.
+        """
+
+        objects = self.get_filtered_queryset(request).values(*self.get_export_fields())
+        objects = self.get_sort_results(objects, self.get_sortable_by(), request.GET.get('s', ''))
+        if not objects.ordered:
+            objects = objects.order_by('pk')
+        return objects
+
+    def get_preview_columns(self, table_fields):
+        """
+        Returns {column: alias} for the text columns among table_fields that
+        are truncated in the database to `list_preview_length` characters.
+        """
+
+        preview_length = self.get_list_preview_length()
+        if not preview_length:
+            return {}
+        columns = {}
+        for name in table_fields:
+            try:
+                model_field = self.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if isinstance(model_field, TextField) or (
+                isinstance(model_field, CharField) and (model_field.max_length or 0) > preview_length
+            ):
+                columns[name] = f'{name}_preview'
+        return columns
+
+    def get_relation_columns(self, table_fields):
+        """
+        Returns {column: (model field, display path or None)} for the foreign
+        key and one-to-one columns among table_fields.
+        """
+
+        display_paths = self.get_display_paths()
+        columns = {}
+        for name in table_fields:
+            try:
+                model_field = self.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if model_field.concrete and (model_field.many_to_one or model_field.one_to_one):
+                columns[name] = (model_field, display_paths.get(name) or display_paths.get(model_field.name))
+        return columns
+
+    def resolve_display_values(self, page, table_fields):
+        """
+        Replaces the selected values in the page rows with display values.
+        Foreign keys show the joined display path when configured, else
+        str() of the related objects fetched with one in_bulk() query per
+        column for the page; truncated previews end with an ellipsis.
+        """
+
+        columns = self.get_relation_columns(table_fields)
+        previews = self.get_preview_columns(table_fields)
+        if not columns and not previews:
+            return page
+        rows = list(page.object_list)
+
+        labels = {}
+        for name, (model_field, path) in columns.items():
+            if path:
+                continue
+            ids = {row[name] for row in rows if row.get(name) is not None}
+            related = model_field.related_model._default_manager.in_bulk(
+                ids, field_name=model_field.target_field.name
+            ) if ids else {}
+            labels[name] = {key: str(obj) for key, obj in related.items()}
+
+        preview_length = self.get_list_preview_length()
+        names = table_fields if 'id' in table_fields else [*table_fields, 'id']
+        display_rows = []
+        for row in rows:
+            display_row = {}
+            for name in names:
+                if name in previews:
+                    value = row[previews[name]]
+                    if value is not None and len(value) > preview_length:
+                        value = value[:preview_length] + '\u2026'
+                elif name in columns:
+                    path = columns[name][1]
+                    value = row[path] if path else labels[name].get(row[name], row[name])
+                else:
+                    value = row[name]
+                display_row[name] = value
+            display_rows.append(display_row)
+        page.object_list = display_rows
+        return page
 
     def get_pagination(self, request, objects):
         """
@@ -226,12 +470,77 @@ class ModelFrontend(FrontendAbstract, NotImplementedMixin):
 
         list_per_page = self.get_list_per_page()
 
+        if self.pagination == 'keyset' and hasattr(objects, 'query'):
+            paginator = KeysetPaginator(objects, list_per_page)
+            if paginator.supported:
+                return paginator.get_page(request.GET.get("cursor"))
+            # related or expression sorts keep their order on numbered pages
+
         if hasattr(objects, 'ordered') and not objects.ordered:
             objects = objects.order_by('pk')
-        paginator = Paginator(objects, list_per_page)  # Show x items per page
+        if self.count_strategy != 'exact' and hasattr(objects, 'query'):
+            paginator = CountStrategyPaginator(objects, list_per_page, self.get_result_count(objects))
+        else:
+            paginator = Paginator(objects, list_per_page)  # Show x items per page
         objects = paginator.get_page(request.GET.get("page"))
         return objects
 
+    async def aget_pagination(self, request, objects, fetch_rows=True):
+        """
+        Async get_pagination() for the async view: returns the page with its
+        rows read. With page numbers and exact counts, acount() and the async
+        read of the requested page run as concurrent tasks (the page is read
+        again when the number is out of range); keyset pagination and other
+        count strategies run get_pagination() in a thread.
+        """
+
+        if self.pagination == 'keyset' or self.count_strategy != 'exact' or not hasattr(objects, 'query'):
+            def paginate():
+                page = self.get_pagination(request, objects)
+                if fetch_rows:
+                    page.object_list = list(page.object_list)
+                return page
+
+            return await sync_to_async(paginate)()
+
+        if not objects.ordered:
+            objects = objects.order_by('pk')
+        list_per_page = self.get_list_per_page()
+        number = request.GET.get("page")
+
+        async def read(start):
+            return [row async for row in objects[start:start + list_per_page]]
+
+        try:
+            start = (max(int(number), 1) - 1) * list_per_page
+        except (TypeError, ValueError):
+            start = 0
+        if fetch_rows:
+            count, rows = await asyncio.gather(objects.acount(), read(start))
+        else:
+            count, rows = await objects.acount(), None
+
+        paginator = Paginator(objects, list_per_page)
+        paginator.count = count  # no second COUNT query in get_page()
+        page = paginator.get_page(number)
+        if fetch_rows:
+            offset = (page.number - 1) * list_per_page
+            page.object_list = rows if offset == start else await read(offset)
+        return page
+
+    def get_result_count(self, objects):
+        """
+        Returns the ResultCount for the filtered objects according to `count_strategy`.
+        """
+
+        if self.count_strategy == 'capped':
+            return capped_count(objects, self.count_cap)
+        if self.count_strategy == 'estimate':
+            return estimated_count(objects, self.count_cap)
+        if self.count_strategy == 'cached':
+            return cached_count(objects, self.count_cache_timeout)
+        return exact_count(objects)
+
     def get_model_actions(self, inline_button):
         table_fields = []
         if inline_button:
@@ -240,26 +549,48 @@ class ModelFrontend(FrontendAbstract, NotImplementedMixin):
         return list(table_fields)
 
     def get_search_results(self, objects, search_fields, search_query):
-        # Apply search filters
+        """
+        Narrows objects to the search query with the configured search backend,
+        falling back to icontains where the backend cannot serve the QuerySet.
+        Full-text backends also order the results by relevance.
+        """
+
         if search_fields and search_query:
-            query = Q()
-            for field in search_fields:
-                query |= Q(**{f"{field}__icontains": search_query})
-            objects = objects.filter(query)
+            backend = self.get_search_backend()
+            if not hasattr(objects, 'query') or not backend.supports(objects, search_fields):
+                backend = get_search_backend('icontains')
+            objects = backend.search(objects, search_fields, search_query)
         return objects
 
     def get_filter_results(self, objects, filter_fields, filter_args):
-        # Apply additional filters from filter_params
+        """
+        Applies the typed filter of every field: exact `__in` for choices,
+        relations, text and booleans, `__gte`/`__lte` bounds for numbers,
+        dates and times, and a case-insensitive prefix match for text fields
+        rendered as a search input. Fields are combined with AND.
+        """
+
         if filter_fields and filter_args:
             query = Q()
             for field in filter_fields:
-                if field in filter_args:
-                    # query &= Q(**{f"{field}__in": filter_args[field]})
-                    for filter_arg in filter_args[field]:
-                        query |= Q(**{f"{field}__icontains": filter_arg})
+                model_field = self.model._meta.get_field(field)
+                search = field in filter_args and self.is_search_filter(model_field)
+                query &= get_filter_query(model_field, field, filter_args, search=search)
             objects = objects.filter(query)
         return objects
 
+    def is_search_filter(self, model_field):
+        """
+        Whether a list_filter field has more than `list_filter_max_options`
+        distinct values and is therefore rendered as a search input.
+        """
+
+        if get_filter_type(model_field) != 'choice' or model_field.choices:
+            return False
+        return get_filter_options(
+            self.model, model_field.name, self.list_filter_max_options, self.list_filter_cache_timeout
+        ) is None
+
     def get_sort_results(self, objects, sort_fields, sort_args):
         # Apply sorting from sort_params
         if sort_fields and sort_args:
@@ -270,14 +601,90 @@ class ModelFrontend(FrontendAbstract, NotImplementedMixin):
         return objects
 
     def get_filter_options(self):
+        """
+        Returns {field: values} for the choice and boolean fields of list_filter.
+        Choice fields use their choices; other fields use their cached distinct
+        values, or None when there are more than `list_filter_max_options` of
+        them. Range fields need no options and are left out.
+        """
+
         list_filter = self.get_list_filter()
         filter_options = {}
         for field in list_filter:
             filter_field = self.model._meta.get_field(field)
-            filter_options[field] = filter_field.choices if hasattr(filter_field, 'choices') and filter_field.choices else self.model.objects.values_list(field, flat=True).distinct()
+            filter_type = get_filter_type(filter_field)
+            if filter_type == 'range':
+                continue
+            if filter_type == 'boolean':
+                filter_options[field] = (True, False)
+            elif filter_field.choices:
+                filter_options[field] = tuple(value for value, _ in filter_field.flatchoices)
+            else:
+                filter_options[field] = get_filter_options(
+                    self.model, field, self.list_filter_max_options, self.list_filter_cache_timeout
+                )
         return filter_options
 
+    def get_filter_specs(self, filter_options, filter_args, facet_counts=None):
+        """
+        Describes each list_filter field for the filter form. Every spec has
+        `name`, `label` and `type`: 'choice' and 'boolean' specs list
+        `options` ({value, label, selected, count}), 'range' specs carry
+        `input_type`, `min` and `max`, and 'search' specs (choice fields above
+        `list_filter_max_options`) carry the entered `value`.
+        """
+
+        facet_counts = facet_counts or {}
+        specs = []
+        for field in self.get_list_filter():
+            model_field = self.model._meta.get_field(field)
+            spec = {
+                'name': field,
+                'label': capfirst(model_field.verbose_name),
+                'type': get_filter_type(model_field),
+            }
+            if spec['type'] == 'range':
+                spec['input_type'] = get_range_input_type(model_field)
+                spec['min'] = filter_args.get(f'{field}__gte', [''])[-1]
+                spec['max'] = filter_args.get(f'{field}__lte', [''])[-1]
+            elif filter_options.get(field) is None:
+                spec['type'] = 'search'
+                spec['value'] = filter_args.get(field, [''])[-1]
+            else:
+                selected = set(filter_args.get(field, ()))
+                counts = facet_counts.get(field)
+                spec['options'] = [
+                    {
+                        'value': str(value),
+                        'label': label,
+                        'selected': str(value) in selected,
+                        'count': None if counts is None else counts.get(value, 0),
+                    }
+                    for value, label in filter_option_labels(model_field, filter_options[field])
+                ]
+            specs.append(spec)
+        return specs
+
+    def get_facet_counts(self, objects, filter_options, filter_args):
+        """
+        Returns {field: {value: count}} for the rendered filter options in one
+        query. `objects` is the scoped and searched queryset; each field is
+        counted under the filters of the other fields, so its own options
+        keep their counts while one of them is selected.
+        """
+
+        if not self.list_filter_facets or not hasattr(objects, 'query'):
+            return {}
+        list_filter = self.get_list_filter()
+        filter_fields = [field for field, options in filter_options.items() if options is not None]
+        return facet_counts({
+            field: self.get_filter_results(
+                objects, [other for other in list_filter if other != field], filter_args
+            )
+            for field in filter_fields
+        })
+
     def get_filter_args(self, request_get):
         request_dict = dict(request_get)
-        filter_args = {filter: request_dict[filter] for filter in request_dict if filter not in ['q', 's'] and request_get[filter] != ''}
+        filter_args = {filter: request_dict[filter] for filter in request_dict if filter not in ['q', 's', 'page', 'cursor', 'format'] and request_get[filter] != ''}
         return filter_args
@@ -0,0 +1,129 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any
+
+
+def _freeze(value):
+    """
+    Recursively converts dicts to read-only mappings and lists to tuples.
+    """
+
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+@dataclass(frozen=True)
+class ModelViewPlan:
+    """
+    An immutable, precompiled view of a registered ModelFrontend.
+
+    Holds everything FrontendModelView needs that does not depend on the
+    request: resolved fields, action definitions, permission flags, URL
+    kwargs and the static `option`/`site` context skeleton. Plans are built
+    once per model by the site and shared across requests and threads, and so
+    is `model_config`, the bound ModelFrontend they were compiled from.
+    """
+
+    model: Any
+    model_config: Any
+    app_name: str
+    model_name: str
+    url_name: str
+    fields: tuple
+    table_fields: tuple
+    form_fields: tuple
+    non_editable_fields: tuple
+    readonly_fields: tuple
+    list_display: tuple
+    search_fields: tuple
+    list_filter: tuple
+    sortable_by: tuple
+    list_per_page: int
+    login_required: bool
+    query_budget: Any
+    toolbar_button: tuple
+    toolbar_actions: tuple
+    inline_button: tuple
+    inline_actions: tuple
+    bulk_button: tuple
+    bulk_actions: tuple
+    display_models: tuple
+    option: MappingProxyType
+    site: MappingProxyType
+
+    @property
+    def url_kwargs(self):
+        return {'app_name': self.app_name, 'model_name': self.model_name}
+
+    @classmethod
+    def compile(cls, model_config, url_name='frontend'):
+        """
+        Builds a plan from a ModelFrontend instance bound to its model.
+        """
+
+        model = model_config.model
+        opts = model._meta
+        description = getattr(model_config, 'description', False)
+        toolbar_actions = model_config.get_toolbar_actions()
+        inline_actions = model_config.get_inline_actions()
+        bulk_actions = model_config.get_bulk_actions()
+        title = getattr(opts, 'verbose_name_plural', getattr(opts, 'verbose_name', opts.model_name))
+
+        return cls(
+            model=model,
+            model_config=model_config,
+            app_name=opts.app_label,
+            model_name=opts.model_name,
+            url_name=url_name,
+            fields=tuple(model_config.get_fields()),
+            table_fields=tuple(model_config.get_table_fields()),
+            form_fields=tuple(model_config.get_form_fields()),
+            non_editable_fields=tuple(model_config.get_non_editable_fields()),
+            readonly_fields=tuple(model_config.get_readonly_fields()),
+            list_display=tuple(model_config.get_list_display()),
+            search_fields=tuple(model_config.get_search_fields()),
+            list_filter=tuple(model_config.get_list_filter()),
+            sortable_by=tuple(model_config.get_sortable_by()),
+            list_per_page=model_config.get_list_per_page(),
+            login_required=model_config.get_login_required(),
+            query_budget=model_config.get_query_budget(),
+            toolbar_button=tuple(model_config.get_toolbar_button()),
+            toolbar_actions=_freeze(toolbar_actions),
+            inline_button=tuple(model_config.get_inline_button()),
+            inline_actions=_freeze(inline_actions),
+            bulk_button=tuple(model_config.get_bulk_button()),
+            bulk_actions=_freeze(bulk_actions),
+            display_models=model_config.get_display_models(),
+            option=_freeze({
+                "site": {
+                    "title": getattr(model_config, 'title', True),
+                    "description": description,
+                },
+                "table": {
+                    "toolbar_button": model_config.get_toolbar_button(),
+                    "toolbar_actions": toolbar_actions,
+                    "cards": model_config.get_cards(),
+                    "show": model_config.has_view_permission(),
+                    "add": model_config.has_add_permission(),
+                    "change": model_config.has_change_permission(),
+                    "delete": model_config.has_delete_permission(),
+                    "search": model_config.get_search_fields(),
+                    "filter": model_config.get_list_filter(),
+                    "sort": model_config.get_sortable_by(),
+                    "inline_button": model_config.get_inline_button(),
+                    "inline_actions": inline_actions,
+                    "bulk_button": model_config.get_bulk_button(),
+                    "bulk_actions": bulk_actions,
+                    "background_actions": model_config.get_background_actions(),
+                    "export_formats": model_config.get_export_formats(),
+                    "import_formats": model_config.get_import_formats(),
+                },
+            }),
+            site=_freeze({
+                "title": title,
+                "description": description,
+            }),
+        )
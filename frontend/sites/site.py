@@ -1,6 +1,8 @@
 from django.conf import settings
+from django.db import models
 from django.shortcuts import redirect
 from .abstract import FrontendSiteAbstract
+from .plan import ModelViewPlan
 
 
 class FrontendSite(FrontendSiteAbstract):
@@ -25,10 +27,40 @@ class FrontendSite(FrontendSiteAbstract):
 
     def get_model_config(self, model):
         """
-        gets the frontend configuration for the given model.
+        gets the frontend configuration for the given model, bound once with its view plan.
         """
 
-        return site._registry[model].__class__(model=model)
+        return self.get_model_plan(model).model_config
+
+    def get_model_plan(self, model):
+        """
+        gets the precompiled view plan for the given model, compiling it on first use.
+        """
+
+        plan = self._model_plans.get(model)
+        if plan is None:
+            with self._model_plans_lock:
+                plan = self._model_plans.get(model)
+                if plan is None:
+                    model_config = self._registry[model].__class__(model=model)
+                    plan = ModelViewPlan.compile(model_config, url_name=self.name)
+                    self._model_plans[model] = plan
+        return plan
+
+    def compile_model_plans(self):
+        """
+        compiles the view plans for all registered models.
+        """
+
+        for model in self.get_registered_models():
+            self.get_model_plan(model)
+
+    def get_registered_models(self):
+        """
+        returns the registered model classes, skipping the config and accounts entries.
+        """
+
+        return [model for model in list(self._registry.keys()) if isinstance(model, type) and issubclass(model, models.Model)]
 
     def get_navbar_registry_by_app(self, register, app_name):
         """
@@ -60,17 +92,35 @@ class FrontendSite(FrontendSiteAbstract):
 
     def get_cards(self):
         """
-        Redirects the user to the login page with the current path as the next URL.
+        Returns the home page cards: the navbar registry without the account
+        links when logins are enforced. Rebuilt when that decision changes,
+        e.g. after a URLConf reload.
         """
 
-        if not self.navbar_registry:
-            self.get_navbar_registry()
-        if getattr(self.global_config(), 'authentication'):
-            self.cards = self.navbar_registry.copy()
-            del self.cards['accounts']
+        authentication = self.authentication
+        if self.cards is not None and self.cards[0] == authentication:
+            return self.cards[1]
+        navbar_registry = self.get_navbar_registry()
+        if authentication:
+            cards = navbar_registry.copy()
+            cards.pop('accounts', None)
         else:
-            self.cards = self.navbar_registry
-        return self.cards
+            cards = navbar_registry
+        self.cards = (authentication, cards)
+        return cards
+
+    def compile_navigation(self):
+        """
+        precomputes the navbar, the home page cards and the sidebar of every
+        visibility state, so requests only look them up.
+        """
+
+        if 'config' not in self._registry:
+            return
+        self.get_navbar_registry()
+        self.get_cards()
+        for hide_models in (False, True):
+            self.get_sidebar_for_state(hide_models)
 
 
 if getattr(settings, 'FRONTEND_SITE_CLASS', None):
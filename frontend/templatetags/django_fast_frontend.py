@@ -1,5 +1,6 @@
 # your_app/templatetags/custom_filters.py
 from django import template
+from frontend.rows import RowRenderer
 
 register = template.Library()
 
@@ -11,4 +12,32 @@ def split(value, arg):
 @register.filter()
 def label(value):
     value = value.replace('_', ' ')
-    return value.title()
\ No newline at end of file
+    return value.title()
+
+
+@register.simple_tag(takes_context=True)
+def query_replace(context, **kwargs):
+    """
+    Returns the current query string with the given parameters replaced,
+    dropping the other pagination parameter so page numbers and cursors never mix.
+    """
+    query = context['request'].GET.copy()
+    for key in ('page', 'cursor'):
+        query.pop(key, None)
+    for key, value in kwargs.items():
+        query.pop(key, None)
+        if value not in (None, ''):
+            query[key] = value
+    return query.urlencode()
+
+
+@register.simple_tag(takes_context=True)
+def frontend_rows(context, layout='table'):
+    """
+    Renders the rows of `table.objects` as table rows or cards with a
+    RowRenderer compiled once for the page.
+    """
+    renderer = RowRenderer.from_context(context)
+    if layout == 'cards':
+        return renderer.render_cards(context['table']['objects'], context)
+    return renderer.render_table(context['table']['objects'], context)
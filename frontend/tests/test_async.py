@@ -0,0 +1,183 @@
+"""
+Tests for the async model view.
+
+Ensures `AsyncFrontendModelView` (FRONTEND_ASYNC_VIEWS) renders the same list
+and change pages as the sync view, reads a page with one COUNT and one rows
+query, streams exports from an async iterator, handles change and delete
+with the async ORM and hands the other paths to the sync view, with the
+same login checks and redirects.
+"""
+
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import Permission, User
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import path
+
+import frontend
+from app.frontend import AuthorFrontend
+from app.models import Author
+from frontend import site
+from frontend.tests.test_jinja import _normalize
+from frontend.urls import get_urlpatterns
+from frontend.views import AsyncFrontendModelView, FrontendModelView
+
+urlpatterns = [
+    path('accounts/', frontend.accounts.urls),
+    path('', (get_urlpatterns(AsyncFrontendModelView), '', site.name)),
+]
+
+
+class FilteredPermissionFrontend(frontend.ModelFrontend):
+    login_required = False
+    fields = ("codename", "content_type")
+    list_filter = ("content_type",)
+
+
+class PagedAuthorFrontend(AuthorFrontend):
+    cards = False
+    list_per_page = 2
+    delete_permission = True
+
+
+@override_settings(ROOT_URLCONF='frontend.tests.test_async')
+class TestAsyncModelView(TestCase):
+    """The async view serves the same pages with the async ORM."""
+
+    def setUp(self):
+        site.register(Author, PagedAuthorFrontend)
+        self.user = User.objects.create_user("async", password="async")
+        self.client = Client()
+        self.client.force_login(self.user)
+        self.authors = [Author.objects.create(name=f"Author {index}", title="Dr") for index in range(5)]
+
+    def tearDown(self):
+        site.register(Author, AuthorFrontend)
+
+    def assertSamePage(self, path):
+        async_page = self.client.get(path)
+        with override_settings(ROOT_URLCONF='project.urls'):
+            sync_page = self.client.get(path)
+        self.assertEqual(async_page.status_code, 200)
+        self.assertEqual(_normalize(async_page.content), _normalize(sync_page.content))
+        return async_page
+
+    def test_list(self):
+        response = self.assertSamePage("/app/author/?q=Author&title=Dr&s=-name&page=2")
+        self.assertContains(response, "Author 2")
+
+    def test_change_page(self):
+        self.assertSamePage(f"/app/author/table_change/{self.authors[0].pk}")
+
+    def test_landing_pages(self):
+        self.assertSamePage("/")
+        self.assertSamePage("/app/author/table_add")
+
+    def test_page_queries(self):
+        self.async_client.force_login(self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = async_to_sync(self.async_client.get)("/app/author/?page=2")
+        self.assertContains(response, "Author 3")
+        author_queries = [query["sql"] for query in queries.captured_queries if '"app_author"' in query["sql"]]
+        # one COUNT and one page of rows, besides the filter options and facet counts
+        self.assertEqual(len([sql for sql in author_queries if "LIMIT 2" in sql]), 1)
+        self.assertEqual(len([sql for sql in author_queries if sql.startswith('SELECT COUNT(*)')]), 1)
+
+    def test_page_out_of_range(self):
+        response = self.assertSamePage("/app/author/?page=99&s=name")
+        self.assertContains(response, "<td>Author 4</td>")
+        self.assertNotContains(response, "<td>Author 0</td>")
+
+    async def test_export(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get("/app/author/table_export?format=csv&s=name")
+        content = b"".join([chunk async for chunk in response.streaming_content]).decode()
+        self.assertEqual(content.splitlines()[1:3], ["Author 0,Dr", "Author 1,Dr"])
+
+    async def test_change_and_delete(self):
+        await self.async_client.aforce_login(self.user)
+        author = self.authors[0]
+        await self.async_client.post(f"/app/author/table_change/{author.pk}", {"name": "Changed", "title": "Ms"})
+        await author.arefresh_from_db()
+        self.assertEqual((author.name, author.title), ("Changed", "Ms"))
+        response = await self.async_client.post(f"/app/author/table_delete/{author.pk}")
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(await Author.objects.filter(pk=author.pk).aexists())
+
+    async def test_sync_paths(self):
+        await self.async_client.aforce_login(self.user)
+        await self.async_client.post("/app/author/table_add", {"name": "Added", "title": "Mr"})
+        self.assertTrue(await Author.objects.filter(name="Added").aexists())
+
+    def test_relation_filter(self):
+        site.register(Permission, FilteredPermissionFrontend)
+        self.addCleanup(site.unregister, Permission)
+        content_type = Permission.objects.first().content_type
+        response = self.assertSamePage(f"/auth/permission/?content_type={content_type.pk}")
+        self.assertContains(response, str(content_type))
+
+    def test_redirects_match_sync_view(self):
+        referer = {"HTTP_REFERER": "http://testserver/app/author/?page=2"}
+        locations = []
+        for urlconf in ('frontend.tests.test_async', 'project.urls'):
+            with override_settings(ROOT_URLCONF=urlconf):
+                author = Author.objects.create(name="Deleted", title="Mr")
+                change = self.client.post(f"/app/author/table_change/{author.pk}", {"name": "Ann", "title": "Ms"}, **referer)
+                delete = self.client.post(f"/app/author/table_delete/{author.pk}", **referer)
+                locations.append((change["Location"], delete["Location"]))
+        # deletes return to the list, not to the page of the deleted row
+        self.assertEqual(locations, [("http://testserver/app/author/?page=2", "/app/author/")] * 2)
+
+
+@override_settings(ROOT_URLCONF='frontend.tests.test_async')
+class TestAsyncAuthentication(TestCase):
+    """The async paths redirect anonymous users to the login like the sync view."""
+
+    def setUp(self):
+        site.register(Author, type("LoginAuthorFrontend", (PagedAuthorFrontend,), {"login_required": True}))
+        self.config = site.get_global_config()
+        self.login_required = self.config.login_required
+        self.config.login_required = True
+        self.author = Author.objects.create(name="Ann", title="Dr")
+
+    def tearDown(self):
+        self.config.login_required = self.login_required
+        site.register(Author, AuthorFrontend)
+
+    def assertLoginRedirect(self, response):
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response["Location"].startswith("/accounts/login/?next=/app/author/"))
+
+    async def assertAsyncPathsRedirect(self):
+        for path in ("/app/author/", f"/app/author/table_change/{self.author.pk}", "/app/author/table_export?format=csv"):
+            self.assertLoginRedirect(await self.async_client.get(path))
+        self.assertLoginRedirect(await self.async_client.post(
+            f"/app/author/table_change/{self.author.pk}", {"name": "Changed", "title": "Ms"},
+        ))
+        self.assertLoginRedirect(await self.async_client.post(f"/app/author/table_delete/{self.author.pk}"))
+        self.assertEqual(await Author.objects.filter(name="Ann").acount(), 1)
+
+    async def test_global_login(self):
+        await self.assertAsyncPathsRedirect()
+
+    async def test_model_login(self):
+        with mock.patch.object(FrontendModelView, "_check_global_auth", return_value=None):
+            await self.assertAsyncPathsRedirect()
+
+
+class TestAsyncViewsSetting(TestCase):
+    """`async_views` selects the view class of the site URLs."""
+
+    def setUp(self):
+        self.config = site._registry["config"]
+
+    def tearDown(self):
+        self.config.async_views = False
+
+    def test_site_urls(self):
+        self.assertIs(site.urls[0][0].callback.view_class, FrontendModelView)
+        self.config.async_views = True
+        self.assertIs(site.urls[0][0].callback.view_class, AsyncFrontendModelView)
@@ -0,0 +1,219 @@
+"""
+Tests for set-based bulk and toolbar actions.
+
+Ensures `table_bulk` runs an action declared in `bulk_button` once on the
+queryset of the selected rows (one UPDATE), scoped by get_queryset(), that
+`@action(per_object=True)` handlers are called per object, that list
+rows render selection checkboxes only when bulk actions are configured, and
+that `@action(filtered=True)` toolbar actions get the rows matching the
+posted search and filters, and that set-based writes keep an SQLite FTS5
+search index in sync.
+"""
+
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+import frontend
+from app.frontend import AuthorFrontend
+from app.models import Author
+from frontend import site
+
+
+class BulkAuthorFrontend(AuthorFrontend):
+    bulk_button = ('retitle', 'rename', 'missing')
+    toolbar_button = ('everything', 'retitle_filtered', 'delete_filtered')
+    cards = False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).exclude(name="Hidden")
+
+    @frontend.action(description='Retitle')
+    def retitle(self, queryset):
+        queryset.update(title="Dr")
+
+    @frontend.action(description='Retitle All', filtered=True)
+    def retitle_filtered(self, queryset):
+        queryset.update(title="Dr")
+
+    @frontend.action(description='Delete All', filtered=True)
+    def delete_filtered(self, queryset):
+        queryset.delete()
+
+    @frontend.action(description='Rename', per_object=True)
+    def rename(self, object):
+        object.name = object.name.upper()
+        object.save()
+
+
+class TestBulkActions(TestCase):
+    """Bulk actions get the selected rows as one scoped queryset."""
+
+    def setUp(self):
+        site.register(Author, BulkAuthorFrontend)
+        self.client = Client()
+        self.client.force_login(User.objects.create_user("bulk", password="bulk"))
+        self.authors = [Author.objects.create(name=name, title="Mr") for name in ("Ann", "Bob", "Hidden", "Cid")]
+
+    def tearDown(self):
+        site.register(Author, AuthorFrontend)
+
+    def post(self, action, authors):
+        return self.client.post("/app/author/table_bulk", {
+            "bulk_action": action,
+            "ids": [author.pk for author in authors],
+        })
+
+    def titles(self):
+        return dict(Author.objects.values_list("name", "title"))
+
+    def test_single_update(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post("retitle", self.authors[:3])
+        self.assertEqual(response.status_code, 302)
+        updates = [query for query in queries.captured_queries if query["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(self.titles(), {"Ann": "Dr", "Bob": "Dr", "Hidden": "Mr", "Cid": "Mr"})
+
+    def test_per_object(self):
+        self.post("rename", self.authors[:2])
+        self.assertEqual(sorted(Author.objects.values_list("name", flat=True)), ["ANN", "BOB", "Cid", "Hidden"])
+
+    def test_undeclared_action(self):
+        response = self.post("delete", self.authors)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Author.objects.count(), 4)
+
+    def test_not_callable(self):
+        with self.assertLogs("frontend.views", level="WARNING"):
+            self.post("missing", self.authors)
+
+    def test_invalid_ids(self):
+        self.client.post("/app/author/table_bulk", {"bulk_action": "retitle", "ids": ["x"]})
+        self.assertEqual(set(self.titles().values()), {"Mr"})
+
+    def test_checkboxes(self):
+        response = self.client.get("/app/author/")
+        self.assertContains(response, 'id="FrontendBulkForm"')
+        self.assertContains(response, 'name="ids"', count=3)
+        self.assertContains(response, f'value="{self.authors[0].pk}" form="FrontendBulkForm"')
+        self.assertContains(response, 'name="bulk_action"', count=3)
+
+    def test_no_checkboxes_without_bulk_actions(self):
+        site.register(Author, AuthorFrontend)
+        response = self.client.get("/app/author/")
+        self.assertNotContains(response, 'name="ids"')
+        self.assertNotContains(response, 'FrontendBulkForm')
+
+
+class TestFilteredToolbarActions(TestCase):
+    """`filtered=True` toolbar actions get the rows of the posted list query."""
+
+    def setUp(self):
+        site.register(Author, BulkAuthorFrontend)
+        self.client = Client()
+        self.client.force_login(User.objects.create_user("toolbar", password="toolbar"))
+        for name, title in (("Ann", "Mr"), ("Anna", "Ms"), ("Bob", "Mr"), ("Hidden", "Mr")):
+            Author.objects.create(name=name, title=title)
+
+    def tearDown(self):
+        site.register(Author, AuthorFrontend)
+
+    def titles(self):
+        return dict(Author.objects.values_list("name", "title"))
+
+    def test_search_and_filter(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post("/app/author/retitle_filtered", {"query": "q=Ann&title=Mr&s=name&page=2"})
+        updates = [query for query in queries.captured_queries if query["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(self.titles(), {"Ann": "Dr", "Anna": "Ms", "Bob": "Mr", "Hidden": "Mr"})
+
+    def test_scoped_by_get_queryset(self):
+        self.client.post("/app/author/delete_filtered", {"query": "title=Mr"})
+        self.assertEqual(sorted(Author.objects.values_list("name", flat=True)), ["Anna", "Hidden"])
+
+    def test_unfiltered_handler(self):
+        with mock.patch.object(BulkAuthorFrontend, "everything", autospec=True) as everything:
+            self.client.post("/app/author/everything", {"query": "q=Ann"})
+        everything.assert_called_once_with(mock.ANY)
+
+    def test_toolbar_posts_query(self):
+        response = self.client.get("/app/author/?q=Ann&title=Mr")
+        self.assertContains(response, '<input type="hidden" name="query" value="q=Ann&amp;title=Mr">', count=3)
+
+
+class FTS5BulkAuthorFrontend(BulkAuthorFrontend):
+    bulk_button = ('retitle', 'purge', 'resave')
+    search_fields = ("name", "title")
+    search_backend = "sqlite_fts5"
+
+    @frontend.action(description='Purge')
+    def purge(self, queryset):
+        queryset.delete()
+
+    @frontend.action(description='Resave')
+    def resave(self, queryset):
+        for object in queryset:
+            object.title = "Prof"
+            object.save()
+
+
+class TestSetBasedSearchIndex(TransactionTestCase):
+    """Set-based actions reindex the rows they change in the FTS5 table.
+
+    The FTS5 table is dropped explicitly, as in test_search.
+    """
+
+    def setUp(self):
+        site.register(Author, FTS5BulkAuthorFrontend)
+        self.model_config = site.get_model_config(Author)
+        self.authors = {name: Author.objects.create(name=name, title="Mr") for name in ("Ann", "Bob", "Hidden", "Cid")}
+        call_command("frontend_search_rebuild", "app.Author", stdout=StringIO())
+        self.client = Client()
+        self.client.force_login(User.objects.create_user("fts5", password="fts5"))
+
+    def tearDown(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TABLE IF EXISTS "app_author_fts"')
+        self.model_config.get_search_backend()._existing_tables.clear()
+        site.register(Author, AuthorFrontend)
+
+    def search(self, query):
+        objects = self.model_config.get_search_results(Author.objects.all(), self.model_config.search_fields, query)
+        return sorted(author.name for author in objects)
+
+    def assertIndexIntact(self):
+        # compares the index with the stored rows, raising on a mismatch
+        with connection.cursor() as cursor:
+            cursor.execute('INSERT INTO "app_author_fts"("app_author_fts", rank) VALUES (\'integrity-check\', 1)')
+
+    def bulk(self, action, *names):
+        self.client.post("/app/author/table_bulk", {"bulk_action": action, "ids": [self.authors[name].pk for name in names]})
+
+    def test_update(self):
+        self.bulk("retitle", "Ann", "Bob", "Hidden")
+        self.assertEqual(self.search("dr"), ["Ann", "Bob"])
+        self.assertEqual(self.search("mr"), ["Cid", "Hidden"])
+        self.assertIndexIntact()
+
+    def test_delete_and_saves(self):
+        self.bulk("purge", "Ann")
+        self.bulk("resave", "Bob")
+        self.assertEqual(self.search("ann"), [])
+        self.assertEqual(self.search("prof"), ["Bob"])
+        self.assertEqual(self.search("mr"), ["Cid", "Hidden"])
+        self.assertIndexIntact()
+
+    def test_filtered_toolbar_actions(self):
+        self.client.post("/app/author/retitle_filtered", {"query": "q=ann"})
+        self.assertEqual(self.search("dr"), ["Ann"])
+        self.client.post("/app/author/delete_filtered", {"query": "title=Mr"})
+        self.assertEqual(self.search("mr"), ["Hidden"])
+        self.assertEqual(self.search("ann"), ["Ann"])
+        self.assertIndexIntact()
@@ -0,0 +1,230 @@
+"""
+Tests for conditional GET support.
+
+Ensures list pages with `conditional_get` send ETag/Last-Modified, answer a
+matching If-None-Match or If-Modified-Since with 304 before any list query,
+and change their validators with model writes, deploys, query strings and
+users, and that a per-process version cache is reported by a system check.
+"""
+
+import time
+
+from django.contrib.auth.models import Permission, User
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.core.cache import caches
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from app.frontend import AuthorFrontend
+from app.models import Author
+from frontend import ModelFrontend, site
+from frontend.versions import bump_model_version, check_version_cache, get_model_version
+
+
+class ConditionalAuthorFrontend(AuthorFrontend):
+    conditional_get = True
+
+
+class FieldConditionalAuthorFrontend(AuthorFrontend):
+    conditional_get = True
+    conditional_get_field = "created_at"
+
+
+class ConditionalPermissionFrontend(ModelFrontend):
+    login_required = False
+    fields = ("codename", "content_type")
+    display_paths = {"content_type": "content_type__model"}
+    conditional_get = True
+
+
+class TestModelVersion(TestCase):
+    """Model change versions move forward on writes."""
+
+    def test_writes_bump_the_version(self):
+        version = get_model_version(Author)
+        author = Author.objects.create(name="Ada", title="Dr")
+        created = get_model_version(Author)
+        author.delete()
+
+        self.assertGreater(created, version)
+        self.assertGreater(get_model_version(Author), created)
+
+    def test_related_models_are_versioned(self):
+        site.register(Permission, ConditionalPermissionFrontend)
+        try:
+            model_config = site.get_model_config(Permission)
+            self.assertEqual(model_config.get_display_models(), (ContentType,))
+            versions = model_config.get_related_versions()
+            ContentType.objects.first().save()
+            self.assertGreater(model_config.get_related_versions(), versions)
+        finally:
+            site.unregister(Permission)
+
+    def test_manual_bump(self):
+        version = get_model_version(Author)
+
+        self.assertGreater(bump_model_version(Author), version)
+
+
+LOCMEM = "django.core.cache.backends.locmem.LocMemCache"
+SHARED_CACHES = {
+    "default": {"BACKEND": LOCMEM},
+    "versions": {"BACKEND": "django.core.cache.backends.db.DatabaseCache", "LOCATION": "frontend_versions"},
+}
+
+
+class TestVersionCache(TestCase):
+    """Versions live in FRONTEND_VERSION_CACHE, which must be shared."""
+
+    def tearDown(self):
+        site.register(Author, AuthorFrontend)
+
+    @override_settings(FRONTEND_VERSION_CACHE="versions", CACHES={
+        "default": {"BACKEND": LOCMEM, "LOCATION": "default"}, "versions": {"BACKEND": LOCMEM, "LOCATION": "versions"},
+    })
+    def test_versions_use_the_configured_alias(self):
+        version = bump_model_version(Author)
+
+        self.assertEqual(caches["versions"].get("frontend:model-version:app.author"), version)
+        self.assertIsNone(caches["default"].get("frontend:model-version:app.author"))
+
+    def test_unused_versions_pass(self):
+        self.assertEqual(check_version_cache(), [])
+
+    def test_process_local_cache_warns(self):
+        site.register(Author, ConditionalAuthorFrontend)
+
+        warnings = check_version_cache()
+        self.assertEqual([warning.id for warning in warnings], ["frontend.W001"])
+        self.assertIn("app.Author", warnings[0].hint)
+
+    @override_settings(FRONTEND_VERSION_CACHE="versions", CACHES=SHARED_CACHES)
+    def test_shared_cache_passes(self):
+        site.register(Author, ConditionalAuthorFrontend)
+
+        self.assertEqual(check_version_cache(), [])
+
+    @override_settings(FRONTEND_VERSION_CACHE="missing")
+    def test_unknown_alias(self):
+        self.assertEqual([error.id for error in check_version_cache()], ["frontend.E001"])
+
+
+class TestConditionalListPage(TestCase):
+    """List pages revalidate with ETag and Last-Modified."""
+
+    def setUp(self):
+        site.register(Author, ConditionalAuthorFrontend)
+        Author.objects.create(name="Ada", title="Dr")
+        self.user = User.objects.create_user(username="conditional", password="top_secret")
+        self.client = Client()
+        self.client.force_login(self.user)
+        # the first response sets the CSRF cookie, which is part of the user fingerprint
+        self.client.get("/app/author/")
+
+    def tearDown(self):
+        site.register(Author, AuthorFrontend)
+
+    def test_disabled_by_default(self):
+        site.register(Author, AuthorFrontend)
+
+        self.assertNotIn("ETag", self.client.get("/app/author/"))
+
+    def test_validators_are_sent(self):
+        response = self.client.get("/app/author/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("ETag", response)
+        self.assertIn("Last-Modified", response)
+        self.assertIn("private", response["Cache-Control"])
+        self.assertIn("no-cache", response["Cache-Control"])
+
+    def test_matching_etag_skips_list_queries(self):
+        etag = self.client.get("/app/author/")["ETag"]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/app/author/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse(any('"app_author"' in query["sql"] for query in queries))
+
+    def test_matching_last_modified_returns_304(self):
+        last_modified = self.client.get("/app/author/")["Last-Modified"]
+
+        self.assertEqual(self.client.get("/app/author/", HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+
+    def test_writes_change_the_etag(self):
+        etag = self.client.get("/app/author/")["ETag"]
+        Author.objects.create(name="Bob", title="Mr")
+        response = self.client.get("/app/author/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_related_writes_change_the_etag(self):
+        site.register(Permission, ConditionalPermissionFrontend)
+        try:
+            etag = self.client.get("/auth/permission/")["ETag"]
+            ContentType.objects.first().save()
+            response = self.client.get("/auth/permission/", HTTP_IF_NONE_MATCH=etag)
+        finally:
+            site.unregister(Permission)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_deploys_change_the_validators(self):
+        response = self.client.get("/app/author/")
+        with override_settings(FRONTEND_DEPLOY_VERSION="next"):
+            etag = self.client.get("/app/author/", HTTP_IF_NONE_MATCH=response["ETag"])
+            # a deploy seen later than the last write moves Last-Modified past it
+            caches["default"].set("frontend:deploy:next", time.time() + 60, None)
+            self.addCleanup(caches["default"].delete, "frontend:deploy:next")
+            since = self.client.get("/app/author/", HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+
+        self.assertEqual((etag.status_code, since.status_code), (200, 200))
+        self.assertNotEqual(etag["ETag"], response["ETag"])
+
+    def test_query_string_and_user_change_the_etag(self):
+        etag = self.client.get("/app/author/")["ETag"]
+        other = Client()
+        other.force_login(User.objects.create_user(username="conditional-other", password="top_secret"))
+        other.cookies["csrftoken"] = self.client.cookies["csrftoken"].value
+
+        self.assertNotEqual(self.client.get("/app/author/", {"page": 2})["ETag"], etag)
+        self.assertNotEqual(self.client.get("/app/author/", {"q": "ada"})["ETag"], etag)
+        self.assertEqual(other.get("/app/author/", HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_field_state_catches_writes_without_signals(self):
+        site.register(Author, FieldConditionalAuthorFrontend)
+        etag = self.client.get("/app/author/")["ETag"]
+        version = get_model_version(Author)
+        Author.objects.bulk_create([Author(name="Cyd", title="Mr")])
+
+        self.assertEqual(get_model_version(Author), version)
+        self.assertEqual(self.client.get("/app/author/", HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class TestConditionalHomePage(TestCase):
+    """Home pages revalidate when the global config enables it."""
+
+    def setUp(self):
+        self.config = site.get_global_config()
+        self.conditional_get = self.config.conditional_get
+        self.config.conditional_get = True
+        self.client = Client()
+        self.client.force_login(User.objects.create_user(username="conditional-home", password="top_secret"))
+        self.client.get("/")
+
+    def tearDown(self):
+        self.config.conditional_get = self.conditional_get
+
+    def test_home_page_returns_304(self):
+        etag = self.client.get("/")["ETag"]
+
+        self.assertEqual(self.client.get("/", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertNotEqual(self.client.get("/app/")["ETag"], etag)
+
+    def test_deploys_change_the_etag(self):
+        etag = self.client.get("/")["ETag"]
+        with override_settings(FRONTEND_DEPLOY_VERSION="next"):
+            self.assertEqual(self.client.get("/", HTTP_IF_NONE_MATCH=etag).status_code, 200)
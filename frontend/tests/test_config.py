@@ -0,0 +1,97 @@
+"""
+Tests for the memoized authentication decision.
+
+Ensures Config.authentication resolves the URLConf once per resolver, is
+recomputed when AUTHENTICATION_BACKENDS or the URLConf change together with
+the home cards built from it, and that the site exposes it together with the
+global login requirement.
+"""
+
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import clear_url_caches
+
+from frontend import site
+from frontend.sites import config as config_module
+
+
+class TestAuthenticationMemo(TestCase):
+    """The authentication decision is computed once per URLConf."""
+
+    def setUp(self):
+        config_module.clear_authentication_cache()
+
+    def tearDown(self):
+        config_module.clear_authentication_cache()
+
+    def test_resolved_once(self):
+        with mock.patch.object(config_module, "get_resolver", wraps=config_module.get_resolver) as get_resolver:
+            first = config_module._resolve_authentication(True)
+            second = config_module._resolve_authentication(True)
+        self.assertEqual(first, second)
+        self.assertTrue(first)
+        self.assertEqual(get_resolver.call_count, 2)
+        self.assertEqual(len(config_module._authentication_cache), 1)
+
+    def test_warning_logged_once(self):
+        with override_settings(AUTHENTICATION_BACKENDS=[]):
+            with self.assertLogs(level="WARNING") as logs:
+                self.assertFalse(config_module._resolve_authentication(True))
+                self.assertFalse(config_module._resolve_authentication(True))
+        self.assertEqual(len(logs.records), 1)
+
+    def test_setting_changed_recomputes(self):
+        self.assertTrue(config_module._resolve_authentication(True))
+        with override_settings(AUTHENTICATION_BACKENDS=[]), self.assertLogs(level="WARNING"):
+            self.assertFalse(config_module._resolve_authentication(True))
+        self.assertTrue(config_module._resolve_authentication(True))
+
+    def test_setting_changed_rebuilds_cards(self):
+        site.get_cards()
+        with override_settings(AUTHENTICATION_BACKENDS=[]):
+            self.assertIsNone(site.cards)
+            with self.assertLogs(level="WARNING"):
+                self.assertIn("accounts", site.get_cards())
+        self.assertIsNone(site.cards)
+
+    def test_urlconf_reload_rebuilds_cards(self):
+        cards = site.get_cards()
+        with mock.patch.object(config_module, "_resolve_authentication", return_value=False):
+            self.assertIn("accounts", site.get_cards())
+        self.assertEqual(site.get_cards(), cards)
+        self.assertIs(site.get_cards(), site.get_cards())
+
+    def test_urlconf_reload_recomputes(self):
+        config_module._resolve_authentication(True)
+        resolver, _ = config_module._authentication_cache[True]
+        clear_url_caches()
+        config_module._resolve_authentication(True)
+        self.assertIsNot(config_module._authentication_cache[True][0], resolver)
+
+
+class TestSiteAuthentication(TestCase):
+    """The site reads authentication and login_required from the global config."""
+
+    def setUp(self):
+        self.config_class = site._registry["config"].__class__
+        self.login_required = self.config_class.login_required
+
+    def tearDown(self):
+        self.config_class.login_required = self.login_required
+        config_module.clear_authentication_cache()
+
+    def test_login_required(self):
+        self.config_class.login_required = True
+        self.assertTrue(site.authentication)
+        self.assertTrue(site.login_required)
+
+    def test_login_not_required(self):
+        self.config_class.login_required = False
+        with self.assertLogs(level="WARNING"):
+            self.assertFalse(site.authentication)
+        self.assertFalse(site.login_required)
+
+    def test_read_only(self):
+        with self.assertRaises(AttributeError):
+            site.login_required = False
@@ -0,0 +1,132 @@
+"""
+Tests for the values shown in list pages.
+
+Ensures the list query only selects the displayed columns, long text is
+truncated in the database to `list_preview_length`, and foreign key columns
+render a label instead of the raw id, resolved either through a configured
+display path joined into the list query or through one batched in_bulk()
+query per page, independent of page size.
+"""
+
+from django.contrib.auth.models import Permission, User
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from app.frontend import AuthorFrontend
+from app.models import Author
+from frontend import ModelFrontend, site
+
+
+class PermissionFrontend(ModelFrontend):
+    login_required = False
+    fields = ("codename", "content_type")
+    list_per_page = 20
+
+
+class PathPermissionFrontend(PermissionFrontend):
+    display_paths = {"content_type": "content_type__model"}
+
+
+class TestForeignKeyDisplay(TestCase):
+    """Foreign key columns show related labels without per-row queries."""
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(User.objects.create_user(username="display", password="top_secret"))
+
+    def tearDown(self):
+        site.unregister(Permission)
+
+    def _get(self, frontend_class, **params):
+        site.register(Permission, frontend_class)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/auth/permission/", params)
+        self.assertEqual(response.status_code, 200)
+        return response, queries
+
+    def _expected(self, label):
+        permissions = Permission.objects.select_related("content_type")[:20]
+        return [(permission.codename, label(permission.content_type)) for permission in permissions]
+
+    def test_related_objects_are_fetched_in_bulk(self):
+        response, queries = self._get(PermissionFrontend)
+
+        rows = response.context["table"]["objects"]
+        self.assertEqual([(row["codename"], row["content_type"]) for row in rows], self._expected(str))
+        self.assertEqual(len([query for query in queries if 'FROM "django_content_type"' in query["sql"]]), 1)
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        _, small = self._get(type("SmallPermissionFrontend", (PermissionFrontend,), {"list_per_page": 2}))
+        site.unregister(Permission)
+        _, large = self._get(PermissionFrontend)
+
+        self.assertEqual(len(small), len(large))
+
+    def test_display_path_is_joined(self):
+        response, queries = self._get(PathPermissionFrontend)
+
+        rows = response.context["table"]["objects"]
+        self.assertEqual([(row["codename"], row["content_type"]) for row in rows],
+                         self._expected(lambda content_type: content_type.model))
+        self.assertEqual(list(rows[0]), ["codename", "content_type", "id"])
+        self.assertFalse(any('FROM "django_content_type"' in query["sql"] for query in queries))
+
+    def test_rows_render_labels(self):
+        permission = Permission.objects.select_related("content_type").first()
+        response, _ = self._get(PermissionFrontend)
+
+        self.assertContains(response, f"<td>{permission.codename}</td>")
+        self.assertContains(response, f"<td>{permission.content_type}</td>")
+        self.assertNotContains(response, f"<td>{permission.content_type_id}</td>")
+
+
+class PreviewAuthorFrontend(AuthorFrontend):
+    list_preview_length = 5
+
+
+class TestListColumns(TestCase):
+    """List rows project list_display plus id and truncate long text."""
+
+    def setUp(self):
+        Author.objects.create(name="Ada Lovelace", title="Ms")
+        Author.objects.create(name="Grace", title="Dr")
+        self.client = Client()
+        self.client.force_login(User.objects.create_user(username="columns", password="top_secret"))
+
+    def tearDown(self):
+        site.register(Author, AuthorFrontend)
+
+    def _page_query(self, queries):
+        return next(query["sql"] for query in queries if '"app_author"."id"' in query["sql"] and "LIMIT" in query["sql"])
+
+    def test_only_displayed_columns_are_selected(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/app/author/", {"sort": "name"})
+
+        rows = response.context["table"]["objects"]
+        self.assertEqual([list(row) for row in rows], [["name", "title", "id"]] * 2)
+        sql = self._page_query(queries)
+        self.assertNotIn('"created_at"', sql)
+        self.assertNotIn('"birth_date"', sql)
+
+    def test_fields_are_used_without_list_display(self):
+        model_config = site.get_model_config(Author)
+        model_config.list_display = ()
+        try:
+            self.assertEqual(model_config.get_table_fields(), ["name", "title", "created_at"])
+        finally:
+            del model_config.list_display
+
+    def test_long_text_is_truncated_in_the_database(self):
+        site.register(Author, PreviewAuthorFrontend)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/app/author/", {"sort": "name"})
+
+        rows = response.context["table"]["objects"]
+        self.assertEqual([(row["name"], row["title"]) for row in rows], [("Ada L\u2026", "Ms"), ("Grace", "Dr")])
+        self.assertEqual(list(rows[0]), ["name", "title", "id"])
+        sql = self._page_query(queries)
+        self.assertIn('SUBSTR("app_author"."name", 1, 6)', sql)
+        self.assertNotIn('AS "name"', sql)
+        self.assertContains(response, "Ada L\u2026")
@@ -0,0 +1,358 @@
+"""
+Tests for the cached list_filter options and facet counts.
+
+Ensures distinct filter values are cached per model/field, kept in sync by
+post_save/post_delete (a new value drops the entry), dropped by the manual hook after bulk writes, and
+replaced by a search input above the cardinality cap. Facet counts must
+come from one UNION ALL query conditioned on search, filters and scoping.
+Filters are typed by model field: exact `__in`, booleans and ranges.
+"""
+
+import datetime
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from app.frontend import AuthorFrontend
+from app.models import Author
+from frontend import site
+from frontend.filters import facet_counts, filter_options_cache_key, get_filter_query, get_filter_type, \
+                             invalidate_filter_options
+
+
+def _client():
+    client = Client()
+    user, _ = User.objects.get_or_create(username="filters-viewer")
+    client.force_login(user)
+    return client
+
+
+class TestFilterOptionsCache(TestCase):
+    """Filter options are queried once and then served from the cache."""
+
+    def setUp(self):
+        cache.clear()
+        Author.objects.create(name="Ada", title="Dr")
+        Author.objects.create(name="Bob", title="Mr")
+        self.model_config = site.get_model_config(Author)
+
+    def test_options_are_cached(self):
+        with self.assertNumQueries(2):
+            options = self.model_config.get_filter_options()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.model_config.get_filter_options(), options)
+
+        self.assertEqual(options, {"name": ("Ada", "Bob"), "title": ("Dr", "Mr")})
+
+    def test_create_with_new_value_drops_field(self):
+        self.model_config.get_filter_options()
+        Author.objects.create(name="Cyd", title="Dr")
+
+        # only the field with a new value is reloaded
+        with self.assertNumQueries(1):
+            options = self.model_config.get_filter_options()
+        self.assertEqual(options["name"], ("Ada", "Bob", "Cyd"))
+        self.assertEqual(options["title"], ("Dr", "Mr"))
+
+    def test_create_with_known_values_keeps_cache(self):
+        self.model_config.get_filter_options()
+        Author.objects.create(name="Ada", title="Mr")
+
+        with self.assertNumQueries(0):
+            self.model_config.get_filter_options()
+
+    def test_concurrent_creates_are_not_lost(self):
+        self.model_config.get_filter_options()
+        stale = cache.get(filter_options_cache_key(Author, "name"))
+        Author.objects.create(name="Cyd", title="Dr")
+        # another process writes back the entry it read before the create
+        cache.set(filter_options_cache_key(Author, "name"), stale)
+        Author.objects.create(name="Dee", title="Dr")
+
+        self.assertEqual(self.model_config.get_filter_options()["name"], ("Ada", "Bob", "Cyd", "Dee"))
+
+    def test_update_invalidates_changed_fields(self):
+        self.model_config.get_filter_options()
+        author = Author.objects.get(name="Bob")
+        author.name = "Bea"
+        author.save()
+
+        with self.assertNumQueries(2):
+            options = self.model_config.get_filter_options()
+        self.assertEqual(options["name"], ("Ada", "Bea"))
+
+    def test_update_fields_limits_invalidation(self):
+        self.model_config.get_filter_options()
+        author = Author.objects.get(name="Bob")
+        author.title = "Ms"
+        author.save(update_fields=["title"])
+
+        self.assertIsNotNone(cache.get(filter_options_cache_key(Author, "name")))
+        self.assertIsNone(cache.get(filter_options_cache_key(Author, "title")))
+        self.assertEqual(self.model_config.get_filter_options()["title"], ("Dr", "Ms"))
+
+    def test_delete_invalidates_model(self):
+        self.model_config.get_filter_options()
+        Author.objects.get(name="Bob").delete()
+
+        self.assertEqual(self.model_config.get_filter_options(), {"name": ("Ada",), "title": ("Dr",)})
+
+    def test_manual_hook_after_bulk_update(self):
+        self.model_config.get_filter_options()
+        Author.objects.filter(name="Bob").update(name="Bo")
+
+        self.assertEqual(self.model_config.get_filter_options()["name"], ("Ada", "Bob"))
+        invalidate_filter_options(Author)
+        self.assertEqual(self.model_config.get_filter_options()["name"], ("Ada", "Bo"))
+
+    def test_unregistered_models_are_ignored(self):
+        User.objects.create_user(username="filters", password="top_secret")
+
+        self.assertIsNone(cache.get(filter_options_cache_key(User, "username")))
+
+
+class LimitedAuthorFrontend(AuthorFrontend):
+    list_filter_max_options = 2
+
+
+class TestFilterOptionsLimit(TestCase):
+    """Fields above list_filter_max_options fall back to a search input."""
+
+    def setUp(self):
+        cache.clear()
+        site.register(Author, LimitedAuthorFrontend)
+        for name in ("Ada", "Bob", "Cyd"):
+            Author.objects.create(name=name, title="Dr")
+        self.model_config = site.get_model_config(Author)
+
+    def tearDown(self):
+        site.register(Author, AuthorFrontend)
+
+    def test_high_cardinality_field_returns_none(self):
+        options = self.model_config.get_filter_options()
+
+        self.assertIsNone(options["name"])
+        self.assertEqual(options["title"], ("Dr",))
+
+    def test_create_past_limit_switches_to_search(self):
+        Author.objects.filter(name="Cyd").delete()
+        self.assertEqual(self.model_config.get_filter_options()["name"], ("Ada", "Bob"))
+
+        Author.objects.create(name="Dee", title="Dr")
+        self.assertIsNone(self.model_config.get_filter_options()["name"])
+
+    def test_list_page_renders_search_picker(self):
+        response = _client().get("/app/author/")
+
+        self.assertContains(response, 'type="search" name="name"')
+        self.assertContains(response, 'type="checkbox" value="Dr" name="title"')
+        self.assertNotContains(response, 'type="checkbox" value="Ada"')
+
+    def test_search_picker_value_filters_rows(self):
+        response = _client().get("/app/author/", {"name": "Cyd"})
+
+        self.assertEqual([row["name"] for row in response.context["table"]["objects"]], ["Cyd"])
+        self.assertContains(response, 'name="name" id="searchname" value="Cyd"')
+
+    def test_search_picker_matches_prefix(self):
+        Author.objects.create(name="Adele", title="Dr")
+        response = _client().get("/app/author/", {"name": "Ad"})
+
+        self.assertEqual(sorted(row["name"] for row in response.context["table"]["objects"]), ["Ada", "Adele"])
+
+    def test_choice_fields_keep_exact_match(self):
+        response = _client().get("/app/author/", {"title": "D"})
+
+        self.assertEqual(list(response.context["table"]["objects"]), [])
+
+
+class FacetAuthorFrontend(AuthorFrontend):
+    list_filter_facets = True
+
+
+class ScopedFacetAuthorFrontend(FacetAuthorFrontend):
+    def get_queryset(self, request=None):
+        return super().get_queryset(request).exclude(name="Bob")
+
+
+class TestFacetCounts(TestCase):
+    """Facet counts come from a single grouped query."""
+
+    def setUp(self):
+        cache.clear()
+        site.register(Author, FacetAuthorFrontend)
+        for name, title in (("Ada", "Dr"), ("Ada", "Mr"), ("Bob", "Mr"), ("Cyd", "Dr"), ("Cyd", "Drs")):
+            Author.objects.create(name=name, title=title)
+        self.model_config = site.get_model_config(Author)
+
+    def tearDown(self):
+        site.register(Author, AuthorFrontend)
+
+    def _facets(self, params=None, model_config=None):
+        model_config = model_config or self.model_config
+        request = RequestFactory().get("/", params or {})
+        objects, _ = model_config.queryset(request)
+        objects = model_config.get_search_results(objects, model_config.search_fields, request.GET.get("q", ""))
+        return model_config.get_facet_counts(
+            objects, model_config.get_filter_options(), model_config.get_filter_args(request.GET)
+        )
+
+    def test_counts_every_field_in_one_query(self):
+        self.model_config.get_filter_options()
+        with CaptureQueriesContext(connection) as captured:
+            counts = self._facets()
+
+        self.assertEqual(len(captured), 1)
+        self.assertIn("UNION ALL", captured[0]["sql"])
+        self.assertEqual(counts, {
+            "name": {"Ada": 2, "Bob": 1, "Cyd": 2},
+            "title": {"Dr": 2, "Mr": 2, "Drs": 1},
+        })
+
+    def test_single_field_skips_union(self):
+        counts = facet_counts({"title": Author.objects.all()})
+
+        self.assertEqual(counts, {"title": {"Dr": 2, "Mr": 2, "Drs": 1}})
+
+    def test_counts_follow_search_query(self):
+        counts = self._facets({"q": "Cyd"})
+
+        self.assertEqual(counts["name"], {"Cyd": 2})
+        self.assertEqual(counts["title"], {"Dr": 1, "Drs": 1})
+
+    def test_own_filter_is_not_applied_to_own_field(self):
+        counts = self._facets({"title": "Mr"})
+
+        self.assertEqual(counts["title"], {"Dr": 2, "Mr": 2, "Drs": 1})
+        self.assertEqual(counts["name"], {"Ada": 1, "Bob": 1})
+
+    def test_counts_respect_queryset_scoping(self):
+        site.register(Author, ScopedFacetAuthorFrontend)
+
+        counts = self._facets(model_config=site.get_model_config(Author))
+
+        self.assertNotIn("Bob", counts["name"])
+        self.assertEqual(counts["title"], {"Dr": 2, "Mr": 1, "Drs": 1})
+
+    def test_search_picker_fields_are_not_counted(self):
+        self.model_config.list_filter_max_options = 2
+        try:
+            counts = self._facets()
+        finally:
+            del self.model_config.list_filter_max_options
+
+        self.assertEqual(list(counts), [])
+
+    def test_disabled_by_default(self):
+        site.register(Author, AuthorFrontend)
+
+        self.assertEqual(self._facets(model_config=site.get_model_config(Author)), {})
+
+    def test_list_page_renders_counts(self):
+        response = _client().get("/app/author/", {"title": "Mr"})
+
+        self.assertContains(response, '<span class="badge text-bg-light">2</span>')
+        self.assertEqual(response.context["table"]["facet_counts"]["name"], {"Ada": 1, "Bob": 1})
+
+    def test_specs_carry_counts(self):
+        specs = {spec["name"]: spec for spec in _client().get("/app/author/").context["table"]["filter_specs"]}
+
+        self.assertEqual(
+            [(option["value"], option["count"]) for option in specs["title"]["options"]],
+            [("Dr", 2), ("Drs", 1), ("Mr", 2)],
+        )
+
+
+class TestFilterTypes(TestCase):
+    """Each model field type translates to an indexable predicate."""
+
+    def _query(self, model, field_name, filter_args):
+        return get_filter_query(model._meta.get_field(field_name), field_name, filter_args)
+
+    def test_types_follow_model_fields(self):
+        self.assertEqual(get_filter_type(Author._meta.get_field("title")), "choice")
+        self.assertEqual(get_filter_type(Author._meta.get_field("birth_date")), "range")
+        self.assertEqual(get_filter_type(User._meta.get_field("is_staff")), "boolean")
+        self.assertEqual(get_filter_type(User._meta.get_field("id")), "range")
+        self.assertEqual(get_filter_type(User._meta.get_field("groups")), "choice")
+
+    def test_choice_values_use_exact_in(self):
+        query = self._query(Author, "title", {"title": ["Dr", "Mr"]})
+
+        self.assertEqual(query.children, [("title__in", ["Dr", "Mr"])])
+
+    def test_boolean_values_are_parsed(self):
+        query = self._query(User, "is_staff", {"is_staff": ["True"]})
+
+        self.assertEqual(query.children, [("is_staff__in", [True])])
+
+    def test_range_bounds(self):
+        query = self._query(User, "id", {"id__gte": ["2"], "id__lte": ["5"]})
+
+        self.assertEqual(query.children, [("id__gte", 2), ("id__lte", 5)])
+
+    def test_datetime_upper_bound_includes_whole_day(self):
+        query = self._query(Author, "created_at", {"created_at__lte": ["2024-03-01"]})
+
+        (lookup, value), = query.children
+        self.assertEqual(lookup, "created_at__lt")
+        self.assertEqual(value.date(), datetime.date(2024, 3, 2))
+        self.assertIsNotNone(value.tzinfo)
+
+    def test_search_input_uses_case_sensitive_prefix(self):
+        # istartswith compiles to UPPER(col) LIKE on PostgreSQL, which no B-tree index serves
+        query = get_filter_query(Author._meta.get_field("name"), "name", {"name": [" Ad "]}, search=True)
+
+        self.assertEqual(query.children, [("name__startswith", "Ad")])
+
+    def test_invalid_values_are_ignored(self):
+        self.assertFalse(self._query(User, "id", {"id__gte": ["abc"], "id__lte": [""]}))
+        self.assertFalse(self._query(Author, "birth_date", {"birth_date__gte": ["yesterday"]}))
+        self.assertFalse(self._query(User, "is_staff", {"is_staff": ["maybe"]}))
+
+
+class TypedAuthorFrontend(AuthorFrontend):
+    list_filter = ("title", "birth_date")
+
+
+class TestTypedFilterResults(TestCase):
+    """The list page applies typed filters combined with AND."""
+
+    def setUp(self):
+        cache.clear()
+        site.register(Author, TypedAuthorFrontend)
+        Author.objects.create(name="Ada", title="Dr", birth_date=datetime.date(1815, 12, 10))
+        Author.objects.create(name="Bob", title="Drs", birth_date=datetime.date(1900, 1, 1))
+        Author.objects.create(name="Cyd", title="Mr", birth_date=datetime.date(1950, 6, 1))
+
+    def tearDown(self):
+        site.register(Author, AuthorFrontend)
+
+    def _names(self, params):
+        response = _client().get("/app/author/", params)
+        return sorted(row["name"] for row in response.context["table"]["objects"])
+
+    def test_exact_value_does_not_match_prefix(self):
+        self.assertEqual(self._names({"title": "Dr"}), ["Ada"])
+
+    def test_multiple_values_of_a_field_are_ored(self):
+        self.assertEqual(self._names({"title": ["Dr", "Mr"]}), ["Ada", "Cyd"])
+
+    def test_fields_are_anded(self):
+        self.assertEqual(self._names({"title": ["Dr", "Drs"], "birth_date__gte": "1850-01-01"}), ["Bob"])
+
+    def test_date_range(self):
+        self.assertEqual(self._names({"birth_date__gte": "1900-01-01", "birth_date__lte": "1950-06-01"}), ["Bob", "Cyd"])
+
+    def test_range_fields_skip_option_queries(self):
+        self.assertEqual(list(site.get_model_config(Author).get_filter_options()), ["title"])
+
+    def test_form_is_rendered_from_specs(self):
+        response = _client().get("/app/author/", {"title": "Dr", "birth_date__gte": "1900-01-01"})
+
+        self.assertContains(response, 'type="date" name="birth_date__gte" id="minbirth_date" value="1900-01-01"')
+        self.assertContains(response, 'type="checkbox" value="Dr" name="title" id="checkboxtitle1" checked')
+        self.assertContains(response, 'type="checkbox" value="Mr" name="title" id="checkboxtitle3">')
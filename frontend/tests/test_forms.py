@@ -0,0 +1,93 @@
+"""
+Tests for the generated ModelForm class cache.
+
+Ensures generate_form_for_model reuses form classes per (model, fields,
+widgets) key and that the cache is dropped on registration changes.
+"""
+
+from django import forms
+from django.contrib.auth.models import User
+from django.test import Client, TestCase
+
+from app.frontend import AuthorFrontend
+from app.models import Author
+from frontend import site
+from frontend.forms import clear_form_class_cache, form_class_cache_info, generate_form_for_model
+
+TEXTAREA = forms.Textarea(attrs={"rows": 2})
+
+
+class TestFormClassCache(TestCase):
+    """Form classes must be built once per key."""
+
+    def setUp(self):
+        clear_form_class_cache()
+
+    def test_same_key_returns_same_class(self):
+        first = generate_form_for_model(Author, ("name", "title"))
+        second = generate_form_for_model(Author, ["name", "title"])
+
+        self.assertIs(first, second)
+        self.assertEqual(form_class_cache_info().hits, 1)
+
+    def test_different_fields_return_different_classes(self):
+        first = generate_form_for_model(Author, ("name",))
+        second = generate_form_for_model(Author, ("name", "title"))
+
+        self.assertIsNot(first, second)
+        self.assertEqual(list(second.base_fields), ["name", "title"])
+
+    def test_widget_overrides_are_part_of_the_key(self):
+        plain = generate_form_for_model(Author, ("name",))
+        with_widget = generate_form_for_model(Author, ("name",), widgets={"name": TEXTAREA})
+
+        self.assertIsNot(plain, with_widget)
+        self.assertIs(with_widget, generate_form_for_model(Author, ("name",), widgets={"name": TEXTAREA}))
+        self.assertIsInstance(with_widget.base_fields["name"].widget, forms.Textarea)
+
+    def test_empty_fields_are_cached_without_all(self):
+        form_class = generate_form_for_model(User, None)
+
+        self.assertEqual(form_class.Meta.fields, ())
+        self.assertIs(form_class, generate_form_for_model(User, ()))
+
+    def test_clear_hook_rebuilds_class(self):
+        first = generate_form_for_model(Author, ("name",))
+        clear_form_class_cache()
+
+        self.assertIsNot(first, generate_form_for_model(Author, ("name",)))
+
+    def test_cache_is_bounded(self):
+        self.assertIsNotNone(form_class_cache_info().maxsize)
+
+
+class TestFormClassCacheInvalidation(TestCase):
+    """register()/unregister() must invalidate cached form classes."""
+
+    def tearDown(self):
+        site.register(Author, AuthorFrontend)
+
+    def test_register_clears_cache(self):
+        first = generate_form_for_model(Author, ("name",))
+        site.register(Author, AuthorFrontend)
+
+        self.assertEqual(form_class_cache_info().currsize, 0)
+        self.assertIsNot(first, generate_form_for_model(Author, ("name",)))
+
+    def test_unregister_clears_cache(self):
+        generate_form_for_model(Author, ("name",))
+        site.unregister(Author)
+
+        self.assertEqual(form_class_cache_info().currsize, 0)
+
+    def test_form_requests_reuse_form_class(self):
+        user = User.objects.create_user(username="formcache", password="top_secret")
+        client = Client()
+        client.force_login(user)
+
+        client.get("/app/author/table_add")
+        misses = form_class_cache_info().misses
+        client.get("/app/author/table_add")
+        client.get("/app/author/table_add")
+
+        self.assertEqual(form_class_cache_info().misses, misses)
@@ -0,0 +1,141 @@
+"""
+Tests for the rendered table fragment cache.
+
+Ensures `table_cache` serves the table body from the cache without the page
+rows query, injects the request's CSRF token after retrieval, is invalidated
+by model writes, including writes to the related models of foreign key
+labels, and separates users according to `table_cache_scope`.
+"""
+
+import re
+
+from django.contrib.auth.models import Permission, User
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from app.frontend import AuthorFrontend
+from app.models import Author
+from frontend import ModelFrontend, site
+from frontend.fragments import CSRF_PLACEHOLDER, get_fragment_cache_stats, reset_fragment_cache_stats
+
+CSRF_INPUT = re.compile(r'name="csrfmiddlewaretoken" value="[^"]+"')
+
+
+class CachedAuthorFrontend(AuthorFrontend):
+    table_cache = True
+
+
+class SharedCachedAuthorFrontend(CachedAuthorFrontend):
+    table_cache_scope = "shared"
+
+
+class CachedPermissionFrontend(ModelFrontend):
+    login_required = False
+    fields = ("codename", "content_type")
+    table_cache = True
+
+
+class TestTableFragmentCache(TestCase):
+    """Table bodies are cached per model version, query string and scope."""
+
+    def setUp(self):
+        cache.clear()
+        reset_fragment_cache_stats()
+        site.register(Author, CachedAuthorFrontend)
+        Author.objects.create(name="Ada", title="Dr")
+        self.client = self._client("fragments")
+
+    def tearDown(self):
+        site.register(Author, AuthorFrontend)
+
+    def _client(self, username):
+        client = Client()
+        client.force_login(User.objects.create_user(username=username, password="top_secret"))
+        return client
+
+    def _row_queries(self, queries):
+        return [query for query in queries if '"app_author"."id"' in query["sql"] and "LIMIT" in query["sql"]]
+
+    def test_second_request_is_served_from_cache(self):
+        first = self.client.get("/app/author/")
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get("/app/author/")
+
+        self.assertEqual(get_fragment_cache_stats(), {"hits": 1, "misses": 1})
+        self.assertEqual(self._row_queries(queries), [])
+        self.assertEqual(CSRF_INPUT.sub("", first.content.decode()), CSRF_INPUT.sub("", second.content.decode()))
+        self.assertContains(second, "Ada")
+
+    def test_csrf_token_is_injected(self):
+        self.client.get("/app/author/")
+        response = self.client.get("/app/author/")
+
+        self.assertNotContains(response, CSRF_PLACEHOLDER)
+        self.assertContains(response, 'name="csrfmiddlewaretoken" value="', count=5)
+
+    def test_output_matches_uncached_rendering(self):
+        site.register(Author, AuthorFrontend)
+        uncached = self.client.get("/app/author/")
+        site.register(Author, CachedAuthorFrontend)
+        self.client.get("/app/author/")
+        cached = self.client.get("/app/author/")
+
+        self.assertEqual(CSRF_INPUT.sub("", uncached.content.decode()), CSRF_INPUT.sub("", cached.content.decode()))
+
+    def test_writes_invalidate(self):
+        self.client.get("/app/author/")
+        Author.objects.create(name="Bob", title="Mr")
+        response = self.client.get("/app/author/")
+
+        self.assertEqual(get_fragment_cache_stats(), {"hits": 0, "misses": 2})
+        self.assertContains(response, "Bob")
+
+    def test_deploys_invalidate(self):
+        self.client.get("/app/author/")
+        with override_settings(FRONTEND_DEPLOY_VERSION="next"):
+            self.client.get("/app/author/")
+
+        self.assertEqual(get_fragment_cache_stats(), {"hits": 0, "misses": 2})
+
+    def test_query_string_is_part_of_the_key(self):
+        self.client.get("/app/author/")
+        self.client.get("/app/author/", {"q": "zzz"})
+
+        self.assertEqual(get_fragment_cache_stats(), {"hits": 0, "misses": 2})
+
+    def test_user_scope_separates_users(self):
+        self.client.get("/app/author/")
+        self._client("fragments-other").get("/app/author/")
+
+        self.assertEqual(get_fragment_cache_stats(), {"hits": 0, "misses": 2})
+
+    def test_shared_scope_is_reused_across_users(self):
+        site.register(Author, SharedCachedAuthorFrontend)
+        self.client.get("/app/author/")
+        self._client("fragments-other").get("/app/author/")
+
+        self.assertEqual(get_fragment_cache_stats(), {"hits": 1, "misses": 1})
+
+    def test_disabled_by_default(self):
+        site.register(Author, AuthorFrontend)
+        self.client.get("/app/author/")
+
+        self.assertEqual(get_fragment_cache_stats(), {"hits": 0, "misses": 0})
+
+    def test_related_writes_invalidate(self):
+        site.register(Permission, CachedPermissionFrontend)
+        try:
+            permission = Permission.objects.order_by("pk").first()
+            path = f"/auth/permission/?codename={permission.codename}&q={permission.codename}"
+            self.client.get(path)
+            ContentType.objects.filter(pk=permission.content_type_id).update(model="renamed")
+            ContentType.objects.get(pk=permission.content_type_id).save()
+            response = self.client.get(path)
+        finally:
+            site.unregister(Permission)
+
+        self.assertEqual(get_fragment_cache_stats(), {"hits": 0, "misses": 2})
+        self.assertContains(response, "renamed")
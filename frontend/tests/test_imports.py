@@ -0,0 +1,160 @@
+"""
+Tests for chunked CSV/JSONL imports.
+
+Ensures `table_import` validates rows with the generated form, inserts the
+valid rows with one bulk_create per batch, reports failed rows with their
+line numbers without aborting, saves many-to-many data, refreshes the cached
+filter options and the FTS5 index that bulk_create() bypasses, and is only
+available with add permission and configured `import_formats`.
+"""
+
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import Group, Permission, User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.test import Client, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from app.frontend import AuthorFrontend
+from app.models import Author
+from frontend import site
+from frontend.forms import generate_form_for_model
+from frontend.imports import import_rows, read_csv_rows
+
+
+def _csv(*lines):
+    return SimpleUploadedFile("authors.csv", "\n".join(lines).encode(), content_type="text/csv")
+
+
+class TestImportRows(TestCase):
+    """Rows are validated per row and inserted per batch."""
+
+    def setUp(self):
+        self.form_class = generate_form_for_model(Author, ("name", "title"))
+
+    def test_batches(self):
+        rows = read_csv_rows(_csv("name,title", *(f"Author {index},Dr" for index in range(5))))
+        with CaptureQueriesContext(connection) as queries:
+            result = import_rows(Author, self.form_class, rows, batch_size=2)
+        inserts = [query for query in queries.captured_queries if query["sql"].startswith("INSERT")]
+        self.assertEqual(result.created, 5)
+        self.assertEqual(len(inserts), 3)
+        self.assertEqual(Author.objects.count(), 5)
+
+    def test_invalid_rows_reported(self):
+        rows = read_csv_rows(_csv("name,title", "Ann,Dr", "Bob,Prof", ",Mr", "Cid,Ms"))
+        result = import_rows(Author, self.form_class, rows, batch_size=2)
+        self.assertEqual((result.created, result.failed), (2, 2))
+        self.assertEqual([line for line, _ in result.errors], [3, 4])
+        self.assertIn("title", result.errors[0][1])
+        self.assertEqual(sorted(Author.objects.values_list("name", flat=True)), ["Ann", "Cid"])
+
+    def test_max_errors(self):
+        rows = read_csv_rows(_csv("name,title", *(f"Author {index},Prof" for index in range(5))))
+        result = import_rows(Author, self.form_class, rows, max_errors=2)
+        self.assertEqual(result.failed, 5)
+        self.assertEqual(len(result.errors), 2)
+
+    def test_rejected_batch_saved_per_row(self):
+        rows = read_csv_rows(_csv("name,title", "Ann,Dr", "Bob,Mr"))
+        with mock.patch.object(Author._default_manager, "bulk_create", side_effect=IntegrityError):
+            result = import_rows(Author, self.form_class, rows)
+        self.assertEqual(result.created, 2)
+        self.assertEqual(Author.objects.count(), 2)
+
+    def test_many_to_many_saved(self):
+        permissions = list(Permission.objects.order_by("pk").values_list("pk", flat=True)[:2])
+        form_class = generate_form_for_model(Group, ("name", "permissions"))
+        result = import_rows(Group, form_class, [(1, {"name": "editors", "permissions": permissions})])
+
+        self.assertEqual(result.created, 1)
+        self.assertEqual(sorted(Group.objects.get(name="editors").permissions.values_list("pk", flat=True)), permissions)
+
+    def test_undecodable_file(self):
+        upload = SimpleUploadedFile("authors.csv", b"name,title\nAnn,Dr\n\xff\xfe,Mr\n")
+        result = import_rows(Author, self.form_class, read_csv_rows(upload))
+        self.assertTrue(result.error)
+
+
+class FilteredAuthorFrontend(AuthorFrontend):
+    list_filter = ("title",)
+    search_fields = ("name",)
+    search_backend = "sqlite_fts5"
+
+
+class TestImportSideEffects(TransactionTestCase):
+    """Imported rows show up in cached filter options and FTS5 searches.
+
+    The FTS5 table is dropped explicitly, as in test_search.
+    """
+
+    def setUp(self):
+        cache.clear()
+        site.register(Author, FilteredAuthorFrontend)
+        self.model_config = site.get_model_config(Author)
+        self.form_class = generate_form_for_model(Author, ("name", "title"))
+        Author.objects.create(name="Ada Lovelace", title="Ms")
+
+    def tearDown(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TABLE IF EXISTS "app_author_fts"')
+        self.model_config.get_search_backend()._existing_tables.clear()
+        site.register(Author, AuthorFrontend)
+
+    def test_filter_options_include_imported_values(self):
+        self.assertEqual(self.model_config.get_filter_options()["title"], ("Ms",))
+        import_rows(Author, self.form_class, read_csv_rows(_csv("name,title", "Grace Hopper,Dr")))
+
+        self.assertEqual(self.model_config.get_filter_options()["title"], ("Dr", "Ms"))
+
+    def test_imported_rows_are_searchable(self):
+        call_command("frontend_search_rebuild", "app.Author", stdout=StringIO())
+        import_rows(Author, self.form_class, read_csv_rows(_csv("name,title", "Grace Hopper,Dr", "Alan Turing,Mr")))
+        objects = self.model_config.get_search_results(Author.objects.all(), ("name",), "hop")
+
+        self.assertEqual([author.name for author in objects], ["Grace Hopper"])
+
+
+class TestImportView(TestCase):
+    """The import page uploads files in the configured formats."""
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(User.objects.create_user("import", password="import"))
+
+    def tearDown(self):
+        site.register(Author, AuthorFrontend)
+
+    def test_page(self):
+        response = self.client.get("/app/author/table_import")
+        self.assertContains(response, 'enctype="multipart/form-data"')
+        self.assertContains(response, 'name="file"')
+
+    def test_csv_upload(self):
+        response = self.client.post("/app/author/table_import", {"file": _csv("name,title", "Ann,Dr", "Bob,Prof")})
+        self.assertContains(response, "Imported 1 rows, 1 rows failed.")
+        self.assertContains(response, 'id="ImportErrors"')
+        self.assertTrue(Author.objects.filter(name="Ann").exists())
+
+    def test_jsonl_upload(self):
+        upload = SimpleUploadedFile("authors.jsonl", b'{"name": "Ann", "title": "Dr"}\n\n[1]\n')
+        response = self.client.post("/app/author/table_import", {"file": upload})
+        self.assertContains(response, "Imported 1 rows, 1 rows failed.")
+        self.assertContains(response, "Not a JSON object.")
+
+    def test_unknown_extension(self):
+        upload = SimpleUploadedFile("authors.xml", b"<authors/>")
+        response = self.client.post("/app/author/table_import", {"file": upload})
+        self.assertContains(response, "Choose a format")
+        self.assertEqual(Author.objects.count(), 0)
+
+    def test_requires_add_permission(self):
+        site.register(Author, type("ReadOnlyAuthorFrontend", (AuthorFrontend,), {"add_permission": False}))
+        self.assertEqual(self.client.get("/app/author/table_import").status_code, 404)
+        response = self.client.post("/app/author/table_import", {"file": _csv("name,title", "Ann,Dr")})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(Author.objects.count(), 0)
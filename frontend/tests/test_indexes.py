@@ -0,0 +1,116 @@
+"""
+Tests for the index advisor.
+
+Ensures configured search, filter and sort paths are checked against the
+introspected indexes, missing B-tree indexes are proposed without
+duplicates, and the management command reports, checks and emits
+migrations.
+"""
+
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import PropertyMock, patch
+
+from django.contrib.auth.models import Group, User
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.migrations.writer import MigrationWriter
+from django.test import TestCase
+
+from app.frontend import AuthorFrontend
+from app.models import Author
+from frontend.indexes import advise_model, missing_indexes, resolve_field_path
+
+
+class KeysetAuthorFrontend(AuthorFrontend):
+    pagination = "keyset"
+    sortable_by = ("name", "id", "birth_date")
+    list_filter = ("name", "birth_date")
+
+
+class TestAdviseModel(TestCase):
+    """advise_model compares configured paths with existing indexes."""
+
+    def _advice(self, frontend_class=AuthorFrontend):
+        return {(item.usage, item.path): item for item in advise_model(Author, frontend_class(model=Author))}
+
+    def test_unindexed_paths_scan(self):
+        advice = self._advice()
+
+        self.assertIsNone(advice[("filter", "title")].covered_by)
+        self.assertEqual(advice[("filter", "title")].fields, ("title",))
+        self.assertIsNone(advice[("sort", "name")].covered_by)
+
+    def test_icontains_search_is_reported_without_index(self):
+        search = self._advice()[("search", "name, title, birth_date")]
+
+        self.assertIsNone(search.covered_by)
+        self.assertEqual(search.fields, ())
+        self.assertIn("icontains", search.note)
+
+    def test_existing_index_covers_path(self):
+        with connection.cursor() as cursor:
+            cursor.execute('CREATE INDEX "author_title_test_idx" ON "app_author" ("title")')
+
+        self.assertEqual(self._advice()[("filter", "title")].covered_by, "author_title_test_idx")
+
+    def test_keyset_sort_wants_pk_tie_breaker(self):
+        advice = self._advice(KeysetAuthorFrontend)
+
+        self.assertEqual(advice[("sort", "name")].fields, ("name", "id"))
+        self.assertEqual(advice[("sort", "birth_date")].fields, ("birth_date", "id"))
+        self.assertEqual(advice[("sort", "id")].covered_by, "__primary__")
+
+    def test_missing_indexes_are_deduplicated(self):
+        missing = missing_indexes(advise_model(Author, KeysetAuthorFrontend(model=Author)))
+
+        self.assertEqual(sorted(index.fields for index in missing[Author]), [["birth_date", "id"], ["name", "id"]])
+        self.assertTrue(all(index.name for index in missing[Author]))
+
+    def test_resolve_field_path(self):
+        self.assertEqual(resolve_field_path(User, "groups__name"), (Group, Group._meta.get_field("name")))
+        self.assertIsNone(resolve_field_path(User, "groups"))
+        self.assertIsNone(resolve_field_path(Author, "missing__name"))
+
+
+class TestIndexAdvisorCommand(TestCase):
+    """frontend_index_advisor reports, checks and writes migrations."""
+
+    def _call(self, *args):
+        out = StringIO()
+        call_command("frontend_index_advisor", *args, stdout=out)
+        return out.getvalue()
+
+    def test_report_lists_registered_models(self):
+        output = self._call()
+
+        self.assertIn("app.Author", output)
+        self.assertIn("app2.People", output)
+        self.assertIn("needs index on app_author(title)", output)
+
+    def test_check_fails_on_scans(self):
+        with self.assertRaises(CommandError):
+            self._call("app.Author", "--check")
+
+    def test_rejects_unregistered_models(self):
+        with self.assertRaises(CommandError):
+            self._call("auth.Group")
+
+    def test_dry_run_prints_migration(self):
+        output = self._call("app.Author", "--emit-migration", "--dry-run")
+
+        self.assertIn("migrations.AddIndex(", output)
+        self.assertIn("('app', '0003_author_created_at')", output)
+        self.assertIn("fields=['title']", output)
+
+    def test_emit_migration_writes_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "0004_frontend_indexes.py")
+            with patch.object(MigrationWriter, "path", new_callable=PropertyMock, return_value=path):
+                self._call("app.Author", "--emit-migration")
+
+            with open(path, encoding="utf-8") as migration_file:
+                source = migration_file.read()
+        self.assertIn("model_name='author'", source)
+        self.assertIn("fields=['name']", source)
@@ -0,0 +1,201 @@
+"""
+Tests for background actions.
+
+Ensures `@action(background=True)` toolbar, inline and bulk actions are
+stored as queued FrontendJob rows and handed to the executor after commit
+instead of running in the request, that run_job() calls the handler with
+the arguments of its kind and records progress, result or error, and that
+the toolbar's job fragment shows the user's own jobs, failing stale ones.
+"""
+
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import Client, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+import frontend
+from app.frontend import AuthorFrontend
+from app.models import Author
+from frontend import site
+from frontend.jobs import fail_stale_jobs, get_executor, report_progress, run_job
+from frontend.models import FrontendJob
+
+
+class JobAuthorFrontend(AuthorFrontend):
+    toolbar_button = ('count_all', 'retitle_matching', 'fail')
+    inline_button = ('rename',)
+    bulk_button = ('retitle',)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).exclude(name="Hidden")
+
+    @frontend.action(description='Count All', background=True)
+    def count_all(self):
+        report_progress(1, 2)
+        return f"{Author.objects.count()} authors, {FrontendJob.objects.get(status='running').progress}%"
+
+    @frontend.action(description='Retitle Matching', filtered=True, background=True)
+    def retitle_matching(self, queryset):
+        queryset.update(title="Dr")
+
+    @frontend.action(description='Fail', background=True)
+    def fail(self):
+        raise ValueError("no luck")
+
+    @frontend.action(description='Rename', background=True)
+    def rename(self, object):
+        object.name = object.name.upper()
+        object.save()
+
+    @frontend.action(description='Retitle', background=True)
+    def retitle(self, queryset):
+        queryset.update(title="Ms")
+
+
+class TestBackgroundActions(TestCase):
+    """Background actions are queued in the request and run by run_job()."""
+
+    def setUp(self):
+        site.register(Author, JobAuthorFrontend)
+        self.user = User.objects.create_user("jobs", password="jobs")
+        self.client = Client()
+        self.client.force_login(self.user)
+        self.authors = [Author.objects.create(name=name, title="Mr") for name in ("Ann", "Bob", "Hidden")]
+
+    def tearDown(self):
+        site.register(Author, AuthorFrontend)
+
+    def queue(self, path, data=None):
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(path, data or {})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(callbacks), 1)
+        return FrontendJob.objects.latest("pk")
+
+    def test_queued_not_run(self):
+        job = self.queue("/app/author/count_all")
+        self.assertEqual((job.status, job.label, job.kind, job.user), ("queued", "Count All", "toolbar", self.user))
+        self.assertEqual(job.progress, 0)
+
+    def test_run(self):
+        job = self.queue("/app/author/count_all")
+        run_job(job.pk)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.progress, job.result), ("done", 100, "3 authors, 50%"))
+        self.assertIsNotNone(job.finished_at)
+
+    def test_progress_outside_job(self):
+        report_progress(1, 2)
+        self.assertFalse(FrontendJob.objects.exists())
+
+    def test_failed(self):
+        job = self.queue("/app/author/fail")
+        with self.assertLogs("frontend.jobs", level="ERROR"):
+            run_job(job.pk)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.result), ("failed", "ValueError: no luck"))
+
+    def test_runs_once(self):
+        job = self.queue("/app/author/count_all")
+        run_job(job.pk)
+        FrontendJob.objects.filter(pk=job.pk).update(result="")
+        run_job(job.pk)
+        job.refresh_from_db()
+        self.assertEqual(job.result, "")
+
+    def test_inline(self):
+        job = self.queue(f"/app/author/rename/{self.authors[0].pk}")
+        run_job(job.pk)
+        self.assertTrue(Author.objects.filter(name="ANN").exists())
+
+    def test_bulk(self):
+        job = self.queue("/app/author/table_bulk", {"bulk_action": "retitle", "ids": [a.pk for a in self.authors]})
+        self.assertEqual(job.ids, [str(author.pk) for author in self.authors])
+        run_job(job.pk)
+        self.assertEqual(dict(Author.objects.values_list("name", "title")), {"Ann": "Ms", "Bob": "Ms", "Hidden": "Mr"})
+
+    def test_filtered(self):
+        job = self.queue("/app/author/retitle_matching", {"query": "q=Ann"})
+        run_job(job.pk)
+        self.assertEqual(dict(Author.objects.values_list("name", "title")), {"Ann": "Dr", "Bob": "Mr", "Hidden": "Mr"})
+
+    def test_jobs_fragment(self):
+        self.queue("/app/author/count_all")
+        FrontendJob.objects.create(model="app.Author", action="count_all", label="Someone Else", kind="toolbar")
+        response = self.client.get("/app/author/table_jobs")
+        self.assertContains(response, 'id="FrontendJobs"')
+        self.assertContains(response, "data-poll")
+        self.assertContains(response, "Count All")
+        self.assertNotContains(response, "Someone Else")
+        self.assertIn("no-store", response["Cache-Control"])
+
+    def test_fragment_stops_polling(self):
+        run_job(self.queue("/app/author/count_all").pk)
+        response = self.client.get("/app/author/table_jobs")
+        self.assertContains(response, "3 authors, 50%")
+        self.assertNotContains(response, "data-poll")
+
+    def test_stale_jobs_fail(self):
+        queued = self.queue("/app/author/count_all")
+        running = self.queue("/app/author/count_all")
+        fresh = self.queue("/app/author/count_all")
+        hour_ago = timezone.now() - timedelta(hours=1, seconds=1)
+        FrontendJob.objects.filter(pk=queued.pk).update(created_at=hour_ago)
+        FrontendJob.objects.filter(pk=running.pk).update(status="running", started_at=hour_ago)
+        self.assertEqual(fail_stale_jobs(Author), 2)
+        statuses = dict(FrontendJob.objects.values_list("pk", "status"))
+        self.assertEqual((statuses[queued.pk], statuses[running.pk], statuses[fresh.pk]), ("failed", "failed", "queued"))
+        run_job(queued.pk)
+        self.assertEqual(FrontendJob.objects.get(pk=queued.pk).status, "failed")
+
+    @override_settings(FRONTEND_JOB_TIMEOUT=60)
+    def test_fragment_stops_polling_stale(self):
+        cache.delete("frontend:jobs:stale_check")
+        job = self.queue("/app/author/count_all")
+        FrontendJob.objects.filter(pk=job.pk).update(created_at=timezone.now() - timedelta(minutes=2))
+        response = self.client.get("/app/author/table_jobs")
+        self.assertContains(response, "Interrupted")
+        self.assertNotContains(response, "data-poll")
+        self.assertIsNotNone(FrontendJob.objects.get(pk=job.pk).finished_at)
+
+    def test_stale_check_throttled(self):
+        cache.delete("frontend:jobs:stale_check")
+        with mock.patch("frontend.jobs.fail_stale_jobs") as fail_stale_jobs:
+            for _ in range(3):
+                self.client.get("/app/author/table_jobs")
+        fail_stale_jobs.assert_called_once_with()
+
+    def test_toolbar_placeholder(self):
+        response = self.client.get("/app/author/")
+        self.assertContains(response, 'data-url="/app/author/table_jobs" data-poll')
+
+    def test_no_background_actions(self):
+        site.register(Author, AuthorFrontend)
+        self.assertEqual(self.client.get("/app/author/table_jobs").status_code, 404)
+        self.assertNotContains(self.client.get("/app/author/"), "FrontendJobs")
+
+
+class TestThreadExecutor(TransactionTestCase):
+    """Queued jobs run on the local thread pool once the request commits."""
+
+    def setUp(self):
+        site.register(Author, JobAuthorFrontend)
+        get_executor.cache_clear()
+
+    def tearDown(self):
+        site.register(Author, AuthorFrontend)
+        get_executor().shutdown(wait=True)
+        get_executor.cache_clear()
+
+    def test_runs_in_background(self):
+        Author.objects.create(name="Ann", title="Mr")
+        client = Client()
+        client.force_login(User.objects.create_user("thread", password="thread"))
+        client.post("/app/author/count_all")
+        get_executor().shutdown(wait=True)
+        job = FrontendJob.objects.get()
+        self.assertEqual((job.status, job.result), ("done", "1 authors, 50%"))
@@ -1,15 +1,28 @@
 """
-Tests for get_pagination ordering fix.
+Tests for get_pagination ordering fix and keyset pagination.
 
 Ensures get_pagination applies order_by('pk') on unordered QuerySets to
-eliminate UnorderedObjectListWarning from Django's Paginator.
+eliminate UnorderedObjectListWarning from Django's Paginator, and that the
+opt-in keyset mode pages on the sort field plus pk via signed cursors.
 """
 
+import datetime
+from urllib.parse import urlencode
+
 import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.paginator import Page
-from django.test import RequestFactory, TestCase
+from django.db import connection
+from django.db.models.functions import Length
+from django.test import Client, RequestFactory, TestCase
+from django.utils.html import escape
 from unittest.mock import MagicMock
 
+from app.frontend import AuthorFrontend
+from app.models import Author
+from frontend import site
+from frontend.pagination import CountStrategyPaginator, KeysetPage, KeysetPaginator, estimated_count
 from frontend.sites.model import ModelFrontend
 
 
@@ -73,3 +86,254 @@ class TestGetPaginationOrdering(TestCase):
         result = mf.get_pagination(request, [1, 2, 3])
         self.assertIsInstance(result, Page)
         self.assertEqual(result.number, 2)
+
+
+class KeysetAuthorFrontend(ModelFrontend):
+    fields = ("name", "title")
+    sortable_by = ("name", "title", "birth_date")
+    list_filter = ("title",)
+    list_per_page = 2
+    pagination = "keyset"
+
+
+class TestKeysetPagination(TestCase):
+    """pagination = 'keyset' must page on sort field + pk through signed cursors."""
+
+    def setUp(self):
+        # duplicate names exercise the pk tie-breaker
+        for name, title in [("Ada", "Dr"), ("Ada", "Ms"), ("Bea", "Dr"), ("Cy", "Dr"), ("Cy", "Ms")]:
+            Author.objects.create(name=name, title=title)
+        self.mf = KeysetAuthorFrontend(model=Author)
+
+    def _page(self, params=None, sort=""):
+        request = RequestFactory().get("/", params or {})
+        objects, _ = self.mf.queryset(request)
+        objects = self.mf.get_sort_results(objects, self.mf.sortable_by, sort)
+        return self.mf.get_pagination(request, objects)
+
+    def _walk(self, sort=""):
+        pages = [self._page(sort=sort)]
+        while pages[-1].has_next():
+            pages.append(self._page({"cursor": pages[-1].next_cursor}, sort=sort))
+        return pages
+
+    def test_returns_keyset_page_without_count(self):
+        with self.assertNumQueries(1):
+            page = self._page(sort="name")
+        self.assertIsInstance(page, KeysetPage)
+        self.assertFalse(page.has_previous())
+        self.assertTrue(page.has_next())
+
+    def test_walks_all_rows_in_sort_order_without_gaps(self):
+        pages = self._walk(sort="name")
+        rows = [row for page in pages for row in page]
+
+        self.assertEqual(len(pages), 3)
+        self.assertEqual([row["id"] for row in rows],
+                         list(Author.objects.order_by("name", "pk").values_list("pk", flat=True)))
+
+    def test_descending_sort(self):
+        rows = [row for page in self._walk(sort="-name") for row in page]
+
+        self.assertEqual([row["id"] for row in rows],
+                         list(Author.objects.order_by("-name", "-pk").values_list("pk", flat=True)))
+
+    def test_previous_cursor_returns_prior_page(self):
+        first = self._page(sort="name")
+        second = self._page({"cursor": first.next_cursor}, sort="name")
+        back = self._page({"cursor": second.previous_cursor}, sort="name")
+
+        self.assertEqual(list(back), list(first))
+        self.assertFalse(back.has_previous())
+        self.assertTrue(back.has_next())
+
+    def test_works_with_filters(self):
+        request = RequestFactory().get("/", {"title": "Dr"})
+        objects, _ = self.mf.queryset(request)
+        objects = self.mf.get_filter_results(objects, self.mf.list_filter, self.mf.get_filter_args(request.GET))
+        objects = self.mf.get_sort_results(objects, self.mf.sortable_by, "name")
+        first = self.mf.get_pagination(request, objects)
+        second = KeysetPaginator(objects, 2).get_page(first.next_cursor)
+
+        self.assertEqual([row["name"] for row in first] + [row["name"] for row in second], ["Ada", "Bea", "Cy"])
+
+    def test_sort_field_outside_selected_columns_is_fetched_for_cursor(self):
+        Author.objects.update(birth_date="2000-01-01")
+        pages = self._walk(sort="birth_date")
+
+        self.assertEqual(sum(len(page) for page in pages), 5)
+
+    def _expected_nullable(self, descending=False):
+        # NULL sorts as the largest value
+        rows = Author.objects.values_list("pk", "birth_date")
+        key = lambda row: (row[1] is None, row[1] or datetime.date.min, row[0])
+        return [pk for pk, _ in sorted(rows, key=key, reverse=descending)]
+
+    def _set_birth_dates(self):
+        dates = [None, "1990-05-01", None, "1980-01-01", "1990-05-01"]
+        for pk, date in zip(Author.objects.order_by("pk").values_list("pk", flat=True), dates):
+            Author.objects.filter(pk=pk).update(birth_date=date)
+
+    def test_walks_nullable_sort_field_without_gaps(self):
+        self._set_birth_dates()
+
+        for sort in ("birth_date", "-birth_date"):
+            with self.subTest(sort=sort):
+                pages = self._walk(sort=sort)
+                rows = [row["id"] for page in pages for row in page]
+                self.assertIsInstance(pages[0], KeysetPage)
+                self.assertEqual(rows, self._expected_nullable(descending=sort.startswith("-")))
+
+    def test_previous_cursor_across_nulls(self):
+        self._set_birth_dates()
+        pages = self._walk(sort="birth_date")
+
+        back = self._page({"cursor": pages[-1].previous_cursor}, sort="birth_date")
+        self.assertEqual(list(back), list(pages[-2]))
+
+    def test_unsupported_sort_falls_back_to_numbered_pages(self):
+        request = RequestFactory().get("/", {"page": "2"})
+        objects = Author.objects.annotate(length=Length("name")).order_by("-length", "pk").values("id", "name")
+
+        page = self.mf.get_pagination(request, objects)
+
+        self.assertIsInstance(page, Page)
+        self.assertFalse(KeysetPaginator(objects, 2).supported)
+        self.assertEqual([row["id"] for row in page],
+                         list(objects.values_list("pk", flat=True))[2:4])
+
+    def test_tampered_cursor_falls_back_to_first_page(self):
+        first = self._page(sort="name")
+        page = self._page({"cursor": first.next_cursor + "x"}, sort="name")
+
+        self.assertEqual(list(page), list(first))
+
+    def test_cursor_from_other_sort_is_ignored(self):
+        first = self._page(sort="name")
+        page = self._page({"cursor": first.next_cursor}, sort="title")
+
+        self.assertFalse(page.has_previous())
+
+    def test_cursor_and_page_are_not_treated_as_filters(self):
+        request = RequestFactory().get("/", {"cursor": "abc", "page": "2", "title": "Dr"})
+
+        self.assertEqual(self.mf.get_filter_args(request.GET), {"title": ["Dr"]})
+
+
+class TestKeysetPaginationTemplate(TestCase):
+    """_pagination.html must link keyset pages through cursor tokens."""
+
+    def setUp(self):
+        site.register(Author, KeysetAuthorFrontend)
+        for name in ("Ada", "Bea", "Cy"):
+            Author.objects.create(name=name, title="Dr")
+        self.client = Client()
+        self.client.force_login(User.objects.create_user(username="keyset", password="top_secret"))
+
+    def tearDown(self):
+        site.register(Author, AuthorFrontend)
+
+    def test_next_link_uses_cursor_and_keeps_sort(self):
+        response = self.client.get("/app/author/", {"s": "name"})
+        page = response.context["table"]["objects"]
+
+        self.assertContains(response, "?" + escape(urlencode({"s": "name", "cursor": page.next_cursor})))
+        self.assertNotContains(response, "page=")
+
+        response = self.client.get("/app/author/", {"s": "name", "cursor": page.next_cursor})
+        self.assertContains(response, "Cy")
+        self.assertNotContains(response, "Ada")
+
+
+class CountAuthorFrontend(ModelFrontend):
+    fields = ("name", "title")
+    list_filter = ("title",)
+    list_per_page = 2
+    count_cap = 3
+
+
+class TestCountStrategies(TestCase):
+    """count_strategy must avoid full COUNT(*) scans while keeping paging correct."""
+
+    def setUp(self):
+        cache.clear()
+        for name in ("Ada", "Bea", "Cy", "Dee", "Eve"):
+            Author.objects.create(name=name, title="Dr" if name < "D" else "Ms")
+
+    def _page(self, strategy, params=None):
+        mf = CountAuthorFrontend(model=Author)
+        mf.count_strategy = strategy
+        request = RequestFactory().get("/", params or {})
+        objects, _ = mf.queryset(request)
+        objects = mf.get_filter_results(objects, mf.list_filter, mf.get_filter_args(request.GET))
+        return mf.get_pagination(request, objects)
+
+    def test_exact_strategy_keeps_plain_paginator(self):
+        page = self._page("exact")
+        self.assertNotIsInstance(page.paginator, CountStrategyPaginator)
+        self.assertEqual(page.paginator.count, 5)
+
+    def test_capped_strategy_reports_cap_plus(self):
+        with self.assertNumQueries(2):
+            page = self._page("capped")
+
+        self.assertEqual(page.paginator.count_display, "3+")
+        self.assertTrue(page.has_next())
+
+    def test_capped_strategy_pages_past_the_cap(self):
+        """Pages beyond the cap must stay reachable and end exactly at the last row."""
+        page = self._page("capped", {"page": "3"})
+
+        self.assertEqual([row["name"] for row in page], ["Eve"])
+        self.assertFalse(page.has_next())
+        self.assertTrue(page.has_previous())
+
+    def test_capped_strategy_below_cap_is_exact(self):
+        page = self._page("capped", {"title": "Ms"})
+
+        self.assertEqual(page.paginator.count_display, "2")
+        self.assertFalse(page.has_next())
+
+    def test_estimate_uses_sqlite_stat1_for_unfiltered_listing(self):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        page = self._page("estimate")
+
+        self.assertEqual(page.paginator.count_display, "~5")
+
+    def test_estimate_without_statistics_falls_back_to_capped(self):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+            cursor.execute("DELETE FROM sqlite_stat1 WHERE tbl = %s", [Author._meta.db_table])
+
+        result = estimated_count(Author.objects.values("id"), 3)
+
+        self.assertEqual(result.display, "3+")
+
+    def test_estimate_with_filters_falls_back_to_capped(self):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        page = self._page("estimate", {"title": "Dr"})
+
+        self.assertEqual(page.paginator.count_display, "3")
+
+    def test_cached_strategy_reuses_count_per_filter_signature(self):
+        self._page("cached")
+        with self.assertNumQueries(1):
+            page = self._page("cached")
+        self.assertEqual(page.paginator.count_display, "5")
+
+        filtered = self._page("cached", {"title": "Ms"})
+        self.assertEqual(filtered.paginator.count_display, "2")
+
+    def test_cached_strategy_probes_next_page_when_count_is_stale(self):
+        self._page("cached")
+        Author.objects.create(name="Fay", title="Ms")
+        Author.objects.create(name="Gus", title="Ms")
+
+        page = self._page("cached", {"page": "3"})
+
+        self.assertEqual(page.paginator.count_display, "5")
+        self.assertTrue(page.has_next())
@@ -0,0 +1,121 @@
+"""
+Tests for the precompiled per-model view plan.
+
+Ensures the site compiles one immutable plan per registered model, reuses it
+across requests and drops it when the registration changes.
+"""
+
+from dataclasses import FrozenInstanceError
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import Client, TestCase
+
+from app.frontend import AuthorFrontend
+from app.models import Author
+from app2.models import People
+from frontend import site
+from frontend.sites.model import ModelFrontend
+from frontend.sites.plan import ModelViewPlan
+
+
+class TestModelViewPlanCompile(TestCase):
+    """ModelViewPlan.compile must resolve request-independent metadata once."""
+
+    def test_plans_are_compiled_at_startup(self):
+        """FrontendConfig.ready() must precompile plans for registered models."""
+        self.assertIn(Author, site._model_plans)
+        self.assertIn(People, site._model_plans)
+
+    def test_plan_resolves_fields_actions_and_permissions(self):
+        plan = site.get_model_plan(Author)
+
+        self.assertEqual(plan.app_name, "app")
+        self.assertEqual(plan.model_name, "author")
+        self.assertEqual(plan.url_kwargs, {"app_name": "app", "model_name": "author"})
+        self.assertEqual(plan.fields, ("name", "title", "created_at"))
+        self.assertEqual(plan.form_fields, ("name", "title"))
+        self.assertEqual(plan.non_editable_fields, ("created_at",))
+        self.assertEqual(plan.toolbar_actions[0]["label"], "Do Everything")
+        self.assertEqual(plan.inline_actions[1]["name"], "uncheck")
+        self.assertTrue(plan.option["table"]["add"])
+        self.assertFalse(plan.option["table"]["delete"])
+        self.assertEqual(plan.site["title"], "authors")
+
+    def test_empty_fields_fall_back_to_concrete_columns_without_queries(self):
+        """The fields=() fallback must be resolved from _meta, not from a query."""
+        with self.assertNumQueries(0):
+            plan = ModelViewPlan.compile(ModelFrontend(model=People))
+
+        self.assertEqual(plan.table_fields, ("name", "title", "birth_date"))
+        self.assertEqual(plan.form_fields, ())
+
+    def test_plan_is_immutable(self):
+        plan = site.get_model_plan(Author)
+
+        with self.assertRaises(FrozenInstanceError):
+            plan.fields = ("name",)
+        with self.assertRaises(TypeError):
+            plan.option["table"]["add"] = False
+        with self.assertRaises(TypeError):
+            plan.inline_actions[0]["label"] = "Changed"
+
+
+class TestModelViewPlanLifecycle(TestCase):
+    """Plans must be reused until the registration changes."""
+
+    def tearDown(self):
+        site.register(Author, AuthorFrontend)
+
+    def test_plan_is_reused_between_lookups(self):
+        self.assertIs(site.get_model_plan(Author), site.get_model_plan(Author))
+
+    def test_model_config_is_bound_once(self):
+        model_config = site.get_model_config(Author)
+
+        self.assertIs(model_config, site.get_model_plan(Author).model_config)
+        self.assertIs(model_config.model, Author)
+        site.register(Author, AuthorFrontend)
+        self.assertIsNot(site.get_model_config(Author), model_config)
+
+    def test_requests_do_not_instantiate_the_frontend(self):
+        user = User.objects.create_user(username="bounduser", password="top_secret")
+        client = Client()
+        client.force_login(user)
+        site.get_model_plan(Author)
+
+        with mock.patch.object(AuthorFrontend, "__init__", side_effect=AssertionError("instantiated")):
+            response = client.get("/app/author/")
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_register_invalidates_plan(self):
+        previous = site.get_model_plan(Author)
+
+        class ReadOnlyAuthorFrontend(ModelFrontend):
+            fields = ("name",)
+
+        site.register(Author, ReadOnlyAuthorFrontend)
+        plan = site.get_model_plan(Author)
+
+        self.assertIsNot(plan, previous)
+        self.assertEqual(plan.fields, ("name",))
+        self.assertFalse(plan.option["table"]["add"])
+
+    def test_unregister_drops_plan(self):
+        site.get_model_plan(Author)
+        site.unregister(Author)
+
+        self.assertNotIn(Author, site._model_plans)
+
+    def test_list_view_renders_from_plan(self):
+        user = User.objects.create_user(username="planuser", password="top_secret")
+        Author.objects.create(name="Ada", title="Dr")
+        client = Client()
+        client.force_login(user)
+
+        response = client.get("/app/author/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIs(response.context["option"], site.get_model_plan(Author).option)
+        self.assertContains(response, "Mark As Checked")
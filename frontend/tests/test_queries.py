@@ -0,0 +1,147 @@
+"""
+Tests for per-request query tracking.
+
+Ensures the QueryTracker attributes queries to request stages, flags
+repeated statements as likely N+1 queries, and that FrontendModelView
+reports Server-Timing and enforces a model's `query_budget`.
+"""
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+
+from app.frontend import AuthorFrontend
+from app.models import Author
+from frontend import site
+from frontend.queries import QueryBudgetExceeded, QueryTracker, normalize_sql
+
+
+class TestQueryTracker(TestCase):
+    """QueryTracker records queries per stage."""
+
+    def test_queries_are_grouped_by_stage(self):
+        tracker = QueryTracker("test")
+        with tracker.track():
+            tracker.stage = "first"
+            Author.objects.count()
+            tracker.stage = "second"
+            Author.objects.count()
+            Author.objects.exists()
+
+        self.assertEqual(tracker.count, 3)
+        self.assertEqual([(stage, count) for stage, (count, _) in tracker.get_stages().items()],
+                         [("first", 1), ("second", 2)])
+        self.assertGreaterEqual(tracker.duration, 0)
+
+    def test_queries_outside_track_are_ignored(self):
+        tracker = QueryTracker("test")
+        with tracker.track():
+            pass
+        Author.objects.count()
+
+        self.assertEqual(tracker.count, 0)
+
+    def test_in_lists_are_normalized(self):
+        self.assertEqual(
+            normalize_sql('SELECT * FROM t WHERE id IN (%s, %s, %s)'),
+            normalize_sql('SELECT * FROM t WHERE id IN (%s, %s)'),
+        )
+
+    def test_repeated_queries_are_flagged(self):
+        authors = [Author.objects.create(name=f"Author {index}", title="Dr") for index in range(6)]
+        tracker = QueryTracker("test")
+        with tracker.track():
+            for author in authors:
+                Author.objects.get(pk=author.pk)
+            Author.objects.count()
+
+        repeated = tracker.get_repeated_queries()
+        self.assertEqual(len(repeated), 1)
+        self.assertEqual(repeated[0][1], 6)
+        with self.assertLogs("frontend.queries", level="WARNING") as logs:
+            tracker.report()
+        self.assertIn("likely N+1, 6 similar queries", logs.output[0])
+
+    def test_server_timing_lists_stages(self):
+        tracker = QueryTracker("test")
+        with tracker.track():
+            tracker.stage = "render"
+            Author.objects.count()
+
+        self.assertRegex(tracker.get_server_timing(), r'^db;dur=[\d.]+;desc="1 queries", db-render;dur=[\d.]+;desc="1 queries"$')
+
+
+class BudgetAuthorFrontend(AuthorFrontend):
+    query_budget = 1
+
+
+class TestViewQueryTracking(TestCase):
+    """FrontendModelView tracks queries when enabled and enforces budgets."""
+
+    def setUp(self):
+        cache.clear()
+        Author.objects.create(name="Ada", title="Dr")
+        self.client = Client()
+        self.client.force_login(User.objects.create_user(username="queries", password="top_secret"))
+
+    def tearDown(self):
+        site.register(Author, AuthorFrontend)
+
+    def test_disabled_by_default(self):
+        response = self.client.get("/app/author/")
+
+        self.assertNotIn("Server-Timing", response)
+        self.assertFalse(hasattr(response.wsgi_request, "frontend_queries"))
+
+    @override_settings(FRONTEND_QUERY_TRACKING=True)
+    def test_list_page_reports_stages(self):
+        response = self.client.get("/app/author/")
+
+        # auth queries depend on the global login configuration, so they are not asserted
+        stages = response.wsgi_request.frontend_queries.get_stages()
+        self.assertEqual(stages["filter_options"][0], 2)
+        self.assertEqual(stages["pagination"][0], 1)
+        self.assertEqual(stages["render"][0], 1)
+        self.assertIn('db-pagination;dur=', response["Server-Timing"])
+
+    @override_settings(FRONTEND_QUERY_TRACKING=True)
+    def test_form_page_reports_form_stage(self):
+        author = Author.objects.get()
+        response = self.client.get(f"/app/author/table_change/{author.pk}")
+
+        stages = response.wsgi_request.frontend_queries.get_stages()
+        self.assertEqual(stages["form"][0], 1)
+        self.assertNotIn("pagination", stages)
+
+    @override_settings(FRONTEND_QUERY_BUDGET_RAISE=True)
+    def test_budget_raises_when_enabled(self):
+        site.register(Author, BudgetAuthorFrontend)
+
+        with self.assertRaisesMessage(QueryBudgetExceeded, "exceed the query budget of 1"):
+            self.client.get("/app/author/")
+
+    @override_settings(FRONTEND_QUERY_BUDGET_RAISE=False)
+    def test_budget_logs_otherwise(self):
+        site.register(Author, BudgetAuthorFrontend)
+
+        with self.assertLogs("frontend.queries", level="WARNING") as logs:
+            response = self.client.get("/app/author/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("exceed the query budget of 1", logs.output[-1])
+
+    @override_settings(DEBUG=False, FRONTEND_QUERY_TRACKING=False, FRONTEND_QUERY_BUDGET_RAISE=False)
+    def test_budget_alone_sends_no_server_timing(self):
+        site.register(Author, BudgetAuthorFrontend)
+
+        with self.assertLogs("frontend.queries", level="WARNING"):
+            response = self.client.get("/app/author/")
+
+        self.assertNotIn("Server-Timing", response)
+        self.assertTrue(hasattr(response.wsgi_request, "frontend_queries"))
+
+    @override_settings(FRONTEND_QUERY_BUDGET_RAISE=True)
+    def test_budget_within_limit_passes(self):
+        site.register(Author, type("RoomyAuthorFrontend", (AuthorFrontend,), {"query_budget": 50}))
+
+        self.assertEqual(self.client.get("/app/author/").status_code, 200)
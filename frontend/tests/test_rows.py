@@ -0,0 +1,65 @@
+"""
+Tests for the compiled row renderer.
+
+Ensures RowRenderer emits one cell per configured column in column order,
+ignores extra row keys such as annotations, escapes values and builds the
+inline action and edit URLs of every row.
+"""
+
+from django.contrib.auth.models import User
+from django.template import Context
+from django.test import Client, TestCase
+
+from app.models import Author
+from frontend.rows import RowRenderer
+
+INLINE_ACTIONS = ({"name": "check", "label": "Check"},)
+
+
+class TestRowRenderer(TestCase):
+    """Rows are rendered from the precompiled columns, URLs and buttons."""
+
+    def setUp(self):
+        self.context = Context({"csrf_token": "token"})
+        self.renderer = RowRenderer(
+            columns=("title", "name"),
+            segments=["", "app", "author", ""],
+            inline_actions=INLINE_ACTIONS,
+            change=True,
+            csrf_input='<input type="hidden" name="csrfmiddlewaretoken" value="token">',
+        )
+
+    def test_column_order_and_extra_keys(self):
+        html = self.renderer.render_table([{"name": "Ann", "id": 1, "title": "Dr", "search_rank": 0.5}], self.context)
+        self.assertTrue(html.startswith("<tr><td>Dr</td><td>Ann</td><td>"))
+        self.assertNotIn("0.5", html)
+
+    def test_values_escaped(self):
+        html = self.renderer.render_table([{"name": "<b>Ann</b>", "title": "Dr", "id": 1}], self.context)
+        self.assertIn("&lt;b&gt;Ann&lt;/b&gt;", html)
+
+    def test_row_urls(self):
+        html = self.renderer.render_table([{"name": "Ann", "title": "Dr", "id": 7}], self.context)
+        self.assertIn('action="/app/author/check/7"', html)
+        self.assertIn('href="/app/author/table_change/7"', html)
+        self.assertIn('value="token"', html)
+        self.assertIn("<i class='bi bi-pencil'></i> Edit</button>", html)
+
+    def test_cards(self):
+        html = self.renderer.render_cards([{"name": "Ann", "title": "Dr", "id": 7}], self.context)
+        self.assertIn('<p class="card-text">title: Dr</p><p class="card-text">name: Ann</p>', html)
+        self.assertIn('action="/app/author/check/7"', html)
+
+
+class TestListRows(TestCase):
+    """The list page renders the configured columns of every row."""
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(User.objects.create_user("rows", password="rows"))
+        Author.objects.create(name="Ann", title="Dr")
+
+    def test_card_fields(self):
+        response = self.client.get("/app/author/", {"q": "Ann"})
+        self.assertContains(response, '<p class="card-text">name: Ann</p><p class="card-text">title: Dr</p>')
+        self.assertContains(response, 'class="card-text"', count=2)
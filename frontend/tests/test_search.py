@@ -0,0 +1,171 @@
+"""
+Tests for the pluggable search backends.
+
+Ensures the icontains backend keeps the historical behavior, backends are
+resolved from names, paths, classes and instances, and the SQLite FTS5
+backend serves prefix matches ranked by relevance from an index that is
+rebuilt by its management command and kept in sync through signals.
+"""
+
+from importlib.util import find_spec
+from io import StringIO
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import Client, TestCase, TransactionTestCase
+
+from app.frontend import AuthorFrontend
+from app.models import Author
+from frontend import site
+from frontend.search import IContainsSearchBackend, PostgresSearchBackend, SQLiteFTS5SearchBackend, \
+                            get_search_backend
+
+
+class TestSearchBackendResolution(TestCase):
+    """search_backend accepts names, dotted paths, classes and instances."""
+
+    def test_default_is_icontains(self):
+        self.assertIsInstance(site.get_model_config(Author).get_search_backend(), IContainsSearchBackend)
+
+    def test_names_paths_and_classes_share_one_instance(self):
+        backend = get_search_backend("sqlite_fts5")
+
+        self.assertIsInstance(backend, SQLiteFTS5SearchBackend)
+        self.assertIs(get_search_backend(SQLiteFTS5SearchBackend), get_search_backend(SQLiteFTS5SearchBackend))
+        self.assertIsInstance(get_search_backend("frontend.search.PostgresSearchBackend"), PostgresSearchBackend)
+
+    def test_instances_are_used_as_is(self):
+        backend = IContainsSearchBackend()
+
+        self.assertIs(get_search_backend(backend), backend)
+
+    def test_postgres_backend_falls_back_on_sqlite(self):
+        model_config = site.get_model_config(Author)
+        Author.objects.create(name="Ada", title="Dr")
+        model_config.search_backend = "postgres"
+        try:
+            objects = model_config.get_search_results(Author.objects.all(), ("name",), "da")
+        finally:
+            del model_config.search_backend
+
+        self.assertEqual([author.name for author in objects], ["Ada"])
+
+    @skipUnless(find_spec("psycopg") or find_spec("psycopg2"), "django.contrib.postgres needs psycopg")
+    def test_postgres_backend_selects_rank_only(self):
+        objects = PostgresSearchBackend().search(Author.objects.all(), ("name",), "ada")
+
+        self.assertEqual(list(objects.query.annotation_select), ["search_rank"])
+
+
+class TestIContainsSearch(TestCase):
+    """The default backend keeps substring matching over every search field."""
+
+    def setUp(self):
+        Author.objects.create(name="Ada", title="Dr")
+        Author.objects.create(name="Bob", title="Drs")
+        Author.objects.create(name="Cyd", title="Mr")
+
+    def test_substring_matches_any_field(self):
+        model_config = site.get_model_config(Author)
+        objects = model_config.get_search_results(Author.objects.order_by("pk"), ("name", "title"), "d")
+
+        self.assertEqual([author.name for author in objects], ["Ada", "Bob", "Cyd"])
+
+    def test_empty_query_returns_objects(self):
+        objects = Author.objects.all()
+
+        self.assertIs(site.get_model_config(Author).get_search_results(objects, ("name",), ""), objects)
+
+
+class FTS5AuthorFrontend(AuthorFrontend):
+    search_fields = ("name", "title")
+    search_backend = "sqlite_fts5"
+
+
+class TestSQLiteFTS5Search(TransactionTestCase):
+    """FTS5 searches an external-content table kept in sync by signals.
+
+    SQLite cannot roll back a CREATE VIRTUAL TABLE cleanly inside the
+    per-test transaction of TestCase, so the table is dropped explicitly.
+    """
+
+    def setUp(self):
+        site.register(Author, FTS5AuthorFrontend)
+        self.model_config = site.get_model_config(Author)
+        self.backend = self.model_config.get_search_backend()
+        Author.objects.create(name="Ada Lovelace", title="Ms")
+        Author.objects.create(name="Grace Hopper", title="Dr")
+
+    def tearDown(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TABLE IF EXISTS "app_author_fts"')
+        self.backend._existing_tables.clear()
+        site.register(Author, AuthorFrontend)
+
+    def _search(self, query):
+        objects = self.model_config.get_search_results(Author.objects.all(), self.model_config.search_fields, query)
+        return [author.name for author in objects]
+
+    def _rebuild(self):
+        call_command("frontend_search_rebuild", "app.Author", stdout=StringIO())
+
+    def test_falls_back_to_icontains_without_index(self):
+        self.assertEqual(self._search("race"), ["Grace Hopper"])
+
+    def test_prefix_terms_match_after_rebuild(self):
+        self._rebuild()
+
+        self.assertEqual(self._search("lov"), ["Ada Lovelace"])
+        self.assertEqual(self._search("race"), [])
+        self.assertEqual(self._search("grace dr"), ["Grace Hopper"])
+
+    def test_results_are_ordered_by_relevance(self):
+        Author.objects.create(name="Ada", title="Ada")
+        self._rebuild()
+
+        self.assertEqual(self._search("ada"), ["Ada", "Ada Lovelace"])
+
+    def test_signals_keep_index_in_sync(self):
+        self._rebuild()
+        author = Author.objects.create(name="Marie Curie", title="Prf")
+        self.assertEqual(self._search("curie"), ["Marie Curie"])
+
+        author.name = "Marie Sklodowska"
+        author.save()
+        self.assertEqual(self._search("curie"), [])
+        self.assertEqual(self._search("sklodowska"), ["Marie Sklodowska"])
+
+        author.delete()
+        self.assertEqual(self._search("marie"), [])
+
+    def test_query_syntax_is_escaped(self):
+        self._rebuild()
+
+        # operators and quotes are matched as plain terms instead of raising
+        self.assertEqual(self._search('"ada OR NEAR('), [])
+        self.assertEqual(self._search('ada"'), ["Ada Lovelace"])
+        self.assertEqual(self._search("ada* -grace"), [])
+
+    def test_related_lookups_fall_back(self):
+        self._rebuild()
+
+        self.assertFalse(self.backend.supports(Author.objects.all(), ("name", "user__username")))
+
+    def test_list_page_uses_index(self):
+        self._rebuild()
+        client = Client()
+        client.force_login(User.objects.create_user(username="search-viewer", password="top_secret"))
+        response = client.get("/app/author/", {"q": "hop"})
+
+        self.assertEqual([row["name"] for row in response.context["table"]["objects"]], ["Grace Hopper"])
+
+    def test_rebuild_command_without_models(self):
+        call_command("frontend_search_rebuild", stdout=StringIO())
+
+        self.assertEqual(self._search("lov"), ["Ada Lovelace"])
+
+    def test_rebuild_command_rejects_unregistered_models(self):
+        with self.assertRaises(CommandError):
+            call_command("frontend_search_rebuild", "auth.Group", stdout=StringIO())
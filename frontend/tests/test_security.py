@@ -18,14 +18,43 @@ from unittest.mock import MagicMock, patch, PropertyMock
 from django.contrib.admin.utils import display_for_field
 from django.test import Client, RequestFactory, TestCase, override_settings
 from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.http import HttpResponseRedirect
 
+from app.frontend import AuthorFrontend
 from app.models import Author
 from frontend.forms import generate_form_for_model
-from frontend import action
+from frontend import action, site
 from frontend.sites.model import ModelFrontend
 
 
+class ScopedAuthorFrontend(AuthorFrontend):
+    """Requires a login and hides the author named "Hidden" from get_queryset()."""
+
+    login_required = True
+    bulk_button = ('retitle',)
+    toolbar_button = ('retitle_matching', 'recount')
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).exclude(name="Hidden")
+
+    @action(description='Retitle')
+    def retitle(self, queryset):
+        queryset.update(title="Dr")
+
+    @action(description='Retitle Matching', filtered=True)
+    def retitle_matching(self, queryset):
+        queryset.update(title="Dr")
+
+    @action(description='Recount', background=True)
+    def recount(self):
+        return Author.objects.count()
+
+    @action(description='Purge')
+    def purge(self, queryset):
+        queryset.delete()
+
+
 # ---------------------------------------------------------------------------
 # CRITICAL-4: fields="__all__" default must be removed
 # ---------------------------------------------------------------------------
@@ -112,7 +141,7 @@ class TestActionDispatchSafety(TestCase):
                 login_required=False,
                 authentication=False,
             )
-            mock_site.get_model_config.return_value = model_config
+            mock_site.get_model_plan.return_value.model_config = model_config
 
             with patch("frontend.views.apps") as mock_apps:
                 mock_apps.get_model.return_value = MagicMock()
@@ -153,7 +182,7 @@ class TestActionDispatchSafety(TestCase):
                 login_required=False,
                 authentication=False,
             )
-            mock_site.get_model_config.return_value = model_config
+            mock_site.get_model_plan.return_value.model_config = model_config
 
             with patch("frontend.views.apps") as mock_apps:
                 mock_apps.get_model.return_value = MagicMock()
@@ -197,7 +226,7 @@ class TestActionDispatchSafety(TestCase):
                 login_required=False,
                 authentication=False,
             )
-            mock_site.get_model_config.return_value = model_config
+            mock_site.get_model_plan.return_value.model_config = model_config
 
             with patch("frontend.views.apps") as mock_apps:
                 mock_apps.get_model.return_value = MagicMock()
@@ -214,6 +243,35 @@ class TestActionDispatchSafety(TestCase):
                 action_spy.assert_called_once_with(mock_obj)
                 self.assertEqual(response.status_code, 302)
 
+    def scoped_client(self):
+        site.register(Author, ScopedAuthorFrontend)
+        self.addCleanup(site.register, Author, AuthorFrontend)
+        self.authors = [Author.objects.create(name=name, title="Mr") for name in ("Ann", "Bob", "Hidden")]
+        client = Client()
+        client.force_login(User.objects.create_user("security", password="security"))
+        return client
+
+    def test_bulk_action_rejects_undeclared_method(self):
+        """A callable not in bulk_button must not run on the posted ids."""
+        client = self.scoped_client()
+        response = client.post("/app/author/table_bulk", {"bulk_action": "purge", "ids": [a.pk for a in self.authors]})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Author.objects.count(), 3)
+
+    def test_bulk_action_ignores_ids_outside_queryset(self):
+        """Posted ids of rows hidden by get_queryset(request) must not be changed."""
+        client = self.scoped_client()
+        client.post("/app/author/table_bulk", {"bulk_action": "retitle", "ids": [a.pk for a in self.authors]})
+        self.assertEqual(dict(Author.objects.values_list("name", "title")), {"Ann": "Dr", "Bob": "Dr", "Hidden": "Mr"})
+
+    def test_filtered_action_query_cannot_widen_scope(self):
+        """A posted query may only narrow get_queryset(request) with list_filter fields."""
+        client = self.scoped_client()
+        # filters on hidden rows and lookups outside list_filter match nothing more
+        client.post("/app/author/retitle_matching", {"query": "name=Hidden"})
+        client.post("/app/author/retitle_matching", {"query": "name=Ann&pk__gte=0&name__startswith=&title__in=Mr"})
+        self.assertEqual(dict(Author.objects.values_list("name", "title")), {"Ann": "Dr", "Bob": "Mr", "Hidden": "Mr"})
+
 
 class TestActionLabelMetadata(TestCase):
     """Action labels should resolve from metadata first, then fallback safely."""
@@ -363,6 +421,92 @@ class TestAuthNormalization(TestCase):
         self.assertIn(response.status_code, [301, 302, 403],
                       "Unauthenticated POST must be rejected")
 
+    def require_login(self):
+        site.register(Author, ScopedAuthorFrontend)
+        self.addCleanup(site.register, Author, AuthorFrontend)
+        # other tests may have switched the global login off
+        config = site.get_global_config()
+        self.addCleanup(setattr, config, "login_required", config.login_required)
+        config.login_required = True
+
+    def assertLoginRedirect(self, response):
+        self.assertEqual(response.status_code, 302)
+        self.assertIn("login", response["Location"])
+
+    def test_export_without_auth_redirects(self):
+        """Anonymous exports must not stream any rows."""
+        self.require_login()
+        Author.objects.create(name="Ann", title="Dr")
+        response = Client().get("/app/author/table_export", {"format": "csv"})
+        self.assertFalse(response.streaming)
+        self.assertLoginRedirect(response)
+
+    def test_import_without_auth_redirects(self):
+        """Anonymous users must neither see the import form nor insert rows."""
+        self.require_login()
+        client = Client()
+        self.assertLoginRedirect(client.get("/app/author/table_import"))
+        upload = SimpleUploadedFile("authors.csv", b"name,title\nAnn,Dr\n", content_type="text/csv")
+        self.assertLoginRedirect(client.post("/app/author/table_import", {"file": upload}))
+        self.assertFalse(Author.objects.exists())
+
+    def test_jobs_without_auth_redirects(self):
+        """Anonymous users must neither queue background jobs nor poll their status."""
+        from frontend.models import FrontendJob
+
+        self.require_login()
+        FrontendJob.objects.create(model="app.Author", action="recount", label="Recount", kind="toolbar")
+        client = Client()
+        self.assertLoginRedirect(client.get("/app/author/table_jobs"))
+        self.assertLoginRedirect(client.post("/app/author/recount"))
+        self.assertEqual(FrontendJob.objects.count(), 1)
+
+    @override_settings(ROOT_URLCONF="frontend.tests.test_async")
+    def test_async_views_without_auth_redirect(self):
+        """The async list, change, export and delete paths must redirect anonymous users too."""
+        from frontend.views import AsyncFrontendModelView
+
+        self.require_login()
+        author = Author.objects.create(name="Ann", title="Dr")
+        client = Client()
+        for path in ("/app/author/", f"/app/author/table_change/{author.pk}", "/app/author/table_export?format=csv"):
+            response = client.get(path)
+            self.assertIs(response.resolver_match.func.view_class, AsyncFrontendModelView)
+            self.assertLoginRedirect(response)
+        self.assertLoginRedirect(client.post(f"/app/author/table_change/{author.pk}", {"name": "Bob", "title": "Mr"}))
+        self.assertLoginRedirect(client.post(f"/app/author/table_delete/{author.pk}"))
+        self.assertEqual(list(Author.objects.values_list("name", flat=True)), ["Ann"])
+
+
+# ---------------------------------------------------------------------------
+# Background jobs: anonymous users only see the jobs of their session
+# ---------------------------------------------------------------------------
+
+class TestJobIsolation(TestCase):
+    """Job labels and results must not leak between anonymous visitors."""
+
+    def setUp(self):
+        site.register(Author, type("OpenAuthorFrontend", (ScopedAuthorFrontend,), {"login_required": False}))
+        self.addCleanup(site.register, Author, AuthorFrontend)
+        config = site.get_global_config()
+        self.addCleanup(setattr, config, "login_required", config.login_required)
+        config.login_required = False
+
+    def test_anonymous_clients_do_not_see_each_others_jobs(self):
+        from frontend.models import FrontendJob
+
+        first, second = Client(), Client()
+        for client, result in ((first, "first secret"), (second, "second secret")):
+            client.post("/app/author/recount")
+            FrontendJob.objects.filter(pk=FrontendJob.objects.latest("pk").pk).update(result=result)
+        self.assertEqual(FrontendJob.objects.filter(user__isnull=True).count(), 2)
+
+        response = first.get("/app/author/table_jobs")
+        self.assertContains(response, "first secret")
+        self.assertNotContains(response, "second secret")
+        self.assertNotContains(second.get("/app/author/table_jobs"), "first secret")
+        self.assertNotContains(Client().get("/app/author/table_jobs"), "secret")
+
 
 # ---------------------------------------------------------------------------
 # Template: SRI integrity on CDN resources
@@ -471,7 +615,7 @@ class TestPostFallbackReturn(TestCase):
                 login_required=False,
                 authentication=False,
             )
-            mock_site.get_model_config.return_value = model_config
+            mock_site.get_model_plan.return_value.model_config = model_config
 
             with patch("frontend.views.apps") as mock_apps:
                 mock_apps.get_model.return_value = MagicMock()
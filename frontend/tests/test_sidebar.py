@@ -12,6 +12,7 @@ Covers:
 - Auth-aware filtering (anonymous → account links only)
 - Request-aware meta building (meta.sidebar in context)
 - Accounts auto-append behavior
+- Precomputed navbar, cards, sidebars and sidebar HTML
 """
 
 import pytest
@@ -308,3 +309,67 @@ class TestMetaSidebar:
         context = site.get_site_meta(context)
         assert 'sidebar' in context['meta']
         assert isinstance(context['meta']['sidebar'], list)
+
+
+# ---------------------------------------------------------------------------
+# Precomputed navigation
+# ---------------------------------------------------------------------------
+
+@pytest.mark.django_db
+class TestPrecomputedNavigation:
+    """Navbar, cards and sidebars are built once per visibility state."""
+
+    @pytest.fixture(autouse=True)
+    def reset_sidebar(self):
+        yield
+        site._sidebar_navigation = None
+
+    def test_sidebar_is_reused_per_state(self):
+        """Repeated lookups return the same precomputed sidebar per state."""
+        assert site.get_sidebar_for_state(False) is site.get_sidebar_for_state(False)
+        assert site.get_sidebar_for_state(True) is not site.get_sidebar_for_state(False)
+
+    def test_request_lookup_uses_precomputed_sidebar(self):
+        """An authenticated request gets the visible-models sidebar."""
+        request = RequestFactory().get("/")
+        request.user = User.objects.create_user(username="precomputed", password="pass")
+        assert site.get_sidebar_registry(request=request) is site.get_sidebar_for_state(False)
+
+    def test_set_sidebar_navigation_rebuilds(self):
+        """A new sidebar structure replaces the precomputed sidebar."""
+        from app.models import Author
+        before = site.get_sidebar_for_state(False)
+        site.set_sidebar_navigation({"Writers": [Author]})
+        after = site.get_sidebar_for_state(False)
+        assert after is not before
+        assert [group['group'] for group in after] == ["Writers"]
+
+    def test_register_rebuilds_navigation(self):
+        """Registering a model drops the precomputed navbar and sidebars."""
+        from django.contrib.auth.models import Group
+        from frontend import ModelFrontend
+        navbar = site.get_navbar_registry()
+        site.register(Group, ModelFrontend)
+        try:
+            assert site.get_navbar_registry() is not navbar
+            items = [item['name'] for group in site.get_sidebar_for_state(False) for item in group['items']]
+            assert 'group' in items
+        finally:
+            site.unregister(Group)
+        assert 'django.contrib.auth' not in site.get_navbar_registry()
+
+    def test_navbar_and_cards_are_reused(self):
+        """The navbar registry and home cards are built once."""
+        assert site.get_navbar_registry() is site.get_navbar_registry()
+        assert site.get_cards() is site.get_cards()
+        assert 'accounts' not in site.get_cards() or not site.get_global_config()().authentication
+
+    def test_sidebar_html_is_rendered_once(self):
+        """The sidebar HTML is rendered once per precomputed sidebar."""
+        site.clear_navigation_cache()
+        sidebar = site.get_sidebar_for_state(False)
+        with patch("frontend.sites.abstract.render_to_string", return_value="<ul></ul>") as render:
+            assert site.get_sidebar_html(sidebar) == "<ul></ul>"
+            assert site.get_sidebar_html(sidebar) == "<ul></ul>"
+        assert render.call_count == 1
+        site.clear_navigation_cache()
@@ -1,17 +1,25 @@
 from django.urls import path
 from . import views
 
-urlpatterns = [
-    path('', views.FrontendModelView.as_view(), name='frontend'),
-    path('favicon.ico', views.favicon_view, name='favicon'),
-]
 
-urlpatterns += [
-    path('<str:app_name>/', views.FrontendModelView.as_view(), name='frontend'),
-    path('<str:app_name>/<str:model_name>/', views.FrontendModelView.as_view(), name='frontend'),
-    path('<str:app_name>/<str:model_name>/<str:action>', views.FrontendModelView.as_view(), name='frontend'),
-    path('<str:app_name>/<str:model_name>/<str:action>/<str:id>', views.FrontendModelView.as_view(), name='frontend'),
-]
+def get_urlpatterns(view_class=views.FrontendModelView):
+    """
+    Returns the frontend urlpatterns served by `view_class`, FrontendModelView
+    or AsyncFrontendModelView.
+    """
+
+    view = view_class.as_view()
+    return [
+        path('', view, name='frontend'),
+        path('favicon.ico', views.favicon_view, name='favicon'),
+        path('<str:app_name>/', view, name='frontend'),
+        path('<str:app_name>/<str:model_name>/', view, name='frontend'),
+        path('<str:app_name>/<str:model_name>/<str:action>', view, name='frontend'),
+        path('<str:app_name>/<str:model_name>/<str:action>/<str:id>', view, name='frontend'),
+    ]
+
+
+urlpatterns = get_urlpatterns()
 
 urlpatterns_account = [
     path('login/', views.FrontendLoginView.as_view(template_name='accounts/form.html'), name='account_login'),
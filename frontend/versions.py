@@ -0,0 +1,185 @@
+import hashlib
+import time
+from datetime import datetime, timezone
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+
+MODEL_VERSION_CACHE_PREFIX = 'frontend:model-version'
+DEPLOY_CACHE_PREFIX = 'frontend:deploy'
+
+# backends whose entries only exist in the current process
+PROCESS_LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def get_version_cache_alias():
+    return getattr(settings, 'FRONTEND_VERSION_CACHE', 'default')
+
+
+def get_version_cache():
+    """
+    Returns the cache that holds the model change versions, the
+    FRONTEND_VERSION_CACHE alias ('default'). Every worker has to read the
+    same versions, so it must be shared between processes.
+    """
+
+    return caches[get_version_cache_alias()]
+
+
+def model_version_cache_key(model):
+    return f'{MODEL_VERSION_CACHE_PREFIX}:{model._meta.label_lower}'
+
+
+def get_model_version(model):
+    """
+    Returns the change version of a model: the time of its last write seen
+    through signals, or of the first lookup when none is cached yet. A lost
+    cache entry restarts at the current time, so a version is never reused.
+    """
+
+    cache = get_version_cache()
+    key = model_version_cache_key(model)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time(), None)
+        version = cache.get(key, time.time())
+    return version
+
+
+def bump_model_version(model):
+    """
+    Moves the change version of a model forward; call it after writes that
+    bypass signals, such as QuerySet.update() or bulk_create().
+    """
+
+    cache = get_version_cache()
+    key = model_version_cache_key(model)
+    previous = cache.get(key) or 0
+    version = max(time.time(), previous + 0.000001)
+    cache.set(key, version, None)
+    return version
+
+
+def get_deploy_version():
+    """
+    Returns FRONTEND_DEPLOY_VERSION, which names the deployed code,
+    templates and settings; the package version by default. Pages rendered
+    by another deploy never match, so set it per deploy, e.g. to the commit.
+    """
+
+    from frontend import __version__
+
+    return str(getattr(settings, 'FRONTEND_DEPLOY_VERSION', None) or __version__)
+
+
+def get_deploy_time():
+    """
+    Returns when the current deploy version was first seen by any worker,
+    as a timestamp kept in the version cache.
+    """
+
+    cache = get_version_cache()
+    key = f'{DEPLOY_CACHE_PREFIX}:{get_deploy_version()}'
+    cache.add(key, time.time(), None)
+    return cache.get(key, time.time())
+
+
+def version_datetime(version):
+    return datetime.fromtimestamp(version, tz=timezone.utc)
+
+
+def user_fingerprint(request):
+    """
+    Returns what a rendered page may depend on about the requesting user:
+    identity, flags and the CSRF secret embedded in its forms.
+    """
+
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return ('anonymous', request.META.get('CSRF_COOKIE', ''))
+    return (user.pk, user.is_staff, user.is_superuser, request.META.get('CSRF_COOKIE', ''))
+
+
+def get_request_validators(request, state, last_modified=None):
+    """
+    Returns (etag, last_modified) for a page rendered from `state` for the
+    request. The ETag covers the deploy version, state, path, query string
+    (search, filters, sort and page) and the user fingerprint; Last-Modified
+    is moved past the deploy and the user's last login so a page rendered by
+    an older deploy or for another user is never revalidated.
+    """
+
+    payload = repr((
+        get_deploy_version(), state, request.path, sorted(request.GET.lists()), user_fingerprint(request),
+    ))
+    etag = '"%s"' % hashlib.sha256(payload.encode()).hexdigest()[:32]
+    if last_modified is not None:
+        last_modified = max(last_modified, version_datetime(get_deploy_time()))
+        last_login = getattr(getattr(request, 'user', None), 'last_login', None)
+        if last_login is not None:
+            last_modified = max(last_modified, last_login)
+    return etag, last_modified
+
+
+def _is_versioned(model):
+    """
+    Whether the version of a model is read: registered models, and models
+    shown as foreign key labels in the list of a registered model.
+    """
+
+    from frontend import site
+
+    if model in site._registry:
+        return True
+    return any(model in site.get_model_plan(registered).display_models for registered in site.get_registered_models())
+
+
+def model_version_post_save(sender, instance, **kwargs):
+    if _is_versioned(sender):
+        bump_model_version(sender)
+
+
+def model_version_post_delete(sender, instance, **kwargs):
+    if _is_versioned(sender):
+        bump_model_version(sender)
+
+
+def connect_model_version_signals():
+    post_save.connect(model_version_post_save, dispatch_uid='frontend_model_version_post_save')
+    post_delete.connect(model_version_post_delete, dispatch_uid='frontend_model_version_post_delete')
+
+
+def check_version_cache(app_configs=None, **kwargs):
+    """
+    System check: models with `conditional_get` (without a
+    `conditional_get_field`) or `table_cache` need a version cache shared by
+    all workers. In a per-process cache a write only moves the version of
+    the worker that handled it, and the others keep serving stale pages.
+    """
+
+    from frontend import site
+
+    alias = get_version_cache_alias()
+    if alias not in settings.CACHES:
+        return [checks.Error(
+            f"FRONTEND_VERSION_CACHE '{alias}' is not configured in CACHES.",
+            id='frontend.E001',
+        )]
+    users = []
+    for model in site.get_registered_models():
+        model_config = site.get_model_plan(model).model_config
+        if model_config.get_table_cache() or (model_config.get_conditional_get() and not model_config.conditional_get_field):
+            users.append(model._meta.label)
+    backend = settings.CACHES[alias].get('BACKEND', '')
+    if users and backend in PROCESS_LOCAL_CACHE_BACKENDS:
+        return [checks.Warning(
+            f"Model change versions are kept in the per-process cache '{alias}' ({backend}).",
+            hint=f"Conditional GET and table caching of {', '.join(users)} go stale with more than one worker "
+                 "process. Set FRONTEND_VERSION_CACHE to a shared cache such as Redis, Memcached or the database.",
+            id='frontend.W001',
+        )]
+    return []
@@ -1,8 +1,12 @@
+import asyncio
 import logging
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from django.http import HttpResponse, HttpResponseRedirect
-from django.utils.http import url_has_allowed_host_and_scheme
+from django.core.exceptions import ValidationError
+from django.http import Http404, HttpResponse, HttpResponseRedirect
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, url_has_allowed_host_and_scheme
 from django.views.generic import TemplateView
 from django.contrib.auth import views as auth_views
 from django.apps import apps
@@ -10,6 +14,15 @@ from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth import login
 from django.shortcuts import render, redirect
 from . import site
+from .actions import call_action
+from .exports import EXPORT_FORMATS, export_response
+from .forms import ImportForm
+from .imports import ROW_READERS, import_rows
+from .queries import QueryTracker, is_tracking_enabled
+from .fragments import get_table_fragment, inject_csrf_token, render_table_fragment, set_table_fragment, \
+                       table_fragment_cache_key
+from .jobs import enqueue_job, get_jobs
+from .versions import get_request_validators
 
 logger = logging.getLogger(__name__)
 
@@ -42,16 +55,75 @@ class FrontendModelView(TemplateView):
     creating, updating, and deleting model instances. This view also handles pagination and searching.
     """
 
+    def dispatch(self, request, *args, **kwargs):
+        """
+        Runs the request under a QueryTracker when query tracking is enabled
+        (FRONTEND_QUERY_TRACKING, DEBUG or a model `query_budget`) and
+        reports it. The Server-Timing header with the per-stage DB time is
+        only added under FRONTEND_QUERY_TRACKING or DEBUG, so a budget alone
+        does not expose backend timings to clients.
+        """
+
+        query_budget = None
+        if kwargs.get('app_name') and kwargs.get('model_name'):
+            try:
+                model = apps.get_model(kwargs['app_name'], kwargs['model_name'])
+                query_budget = site.get_model_plan(model).query_budget
+            except (LookupError, KeyError):
+                pass
+        if not is_tracking_enabled(query_budget):
+            return super().dispatch(request, *args, **kwargs)
+
+        tracker = QueryTracker(f"{request.method} {request.path}", query_budget=query_budget)
+        request.frontend_queries = tracker
+        tracker.stage = 'auth'
+        with tracker.track():
+            response = super().dispatch(request, *args, **kwargs)
+        if is_tracking_enabled():
+            response['Server-Timing'] = tracker.get_server_timing()
+        tracker.report()
+        return response
+
+    @staticmethod
+    def _query_stage(request, stage):
+        """
+        Attributes the following queries of a tracked request to `stage`.
+        """
+
+        tracker = getattr(request, 'frontend_queries', None)
+        if tracker is not None:
+            tracker.stage = stage
+
+    @staticmethod
+    def _conditional_response(request, etag, last_modified):
+        """
+        Returns a 304 Not Modified response when the request validators
+        match, or None when the page has to be rendered.
+        """
+
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        return get_conditional_response(request, etag=etag, last_modified=timestamp)
+
+    @staticmethod
+    def _set_validators(response, etag, last_modified):
+        """
+        Adds ETag/Last-Modified and makes browsers revalidate instead of
+        sharing the per-user page with other caches.
+        """
+
+        response.headers['ETag'] = etag
+        if last_modified:
+            response.headers['Last-Modified'] = http_date(last_modified.timestamp())
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
     @staticmethod
     def _check_global_auth(request):
         """
         Centralised global authentication check used by both GET and POST.
         Returns a redirect response if the user must log in, or None if OK.
         """
-        global_config = site.get_global_config()
-        login_required = getattr(global_config, 'login_required', True)
-        authentication = getattr(global_config(), 'authentication', True)
-        if login_required and authentication and not request.user.is_authenticated:
+        if site.login_required and not request.user.is_authenticated:
             return site.http_login_redirect(request)
         return None
 
@@ -61,13 +133,22 @@ class FrontendModelView(TemplateView):
         Centralised per-model authentication check used by both GET and POST.
         Returns a redirect response if the user must log in, or None if OK.
         """
-        global_config = site.get_global_config()
-        model_login_required = model_config.get_login_required()
-        authentication = getattr(global_config(), 'authentication', True)
-        if model_login_required and authentication and not request.user.is_authenticated:
+        if model_config.get_login_required() and site.authentication and not request.user.is_authenticated:
             return redirect(f"{settings.LOGIN_URL}?next={request.path}")
         return None
 
+    @staticmethod
+    def _form_redirect(request, action, fallback_url):
+        """
+        Redirect policy after an add, change or delete POST, shared by the
+        sync and async views: back to the referring page when it is on this
+        host, except after a delete, which returns to the model list because
+        the referring change page is gone.
+        """
+        if action == 'table_delete':
+            return HttpResponseRedirect(fallback_url)
+        return _safe_redirect(request, fallback=fallback_url)
+
     def get(self, request, *args, app_name=None, model_name=None, action=None, id=None):
         """
         A generic frontend view that can be used to display models and handle common actions like
@@ -82,63 +163,72 @@ class FrontendModelView(TemplateView):
         # pre-get navbar
         navbar_registry = site.get_navbar_registry()
 
-        # landing page for website
-        if app_name is None:
-            cards = site.get_cards()
-            return site.http_home_response(
-                request,
-                context={
-                    "meta": {
-                        "cards": cards,
-                        "title": "Home",
-                    },
-                })
-
-        # Landing page for app
+        # landing pages for website and app
         if model_name is None:
-            return site.http_home_response(
+            validators = None
+            if getattr(site.get_global_config(), 'conditional_get', False):
+                models = tuple(model._meta.label_lower for model in site.get_registered_models())
+                validators = get_request_validators(request, ('home', models))
+                not_modified = self._conditional_response(request, *validators)
+                if not_modified is not None:
+                    return not_modified
+
+            if app_name is None:
+                cards = site.get_cards()
+            else:
+                cards = site.get_navbar_registry_by_app(navbar_registry, app_name)
+            response = site.http_home_response(
                 request,
                 context={
                     "meta": {
-                        "cards": site.get_navbar_registry_by_app(navbar_registry, app_name),
+                        "cards": cards,
                         "title": "Home",
                     },
                 })
+            return self._set_validators(response, *validators) if validators else response
 
-        # get model site config
+        # get model site config and its precompiled view plan
         model = apps.get_model(app_name, model_name)
-        model_config = site.get_model_config(model)
+        plan = site.get_model_plan(model)
+        model_config = plan.model_config
 
         # Centralised per-model authentication check
         model_auth_response = self._check_model_auth(request, model_config)
         if model_auth_response:
             return model_auth_response
 
-        # create model forms
-        form_class = model_config.get_form()
-        form = form_class()
-        form_layout = model_config.get_form_layout(form=form)
-
-        if action in ['table_add', 'table_change', 'table_delete']:
+        # exports stream the filtered rows without rendering the list page
+        if action == 'table_export':
+            self._query_stage(request, 'export')
+            return self.export_response(request, model_config, plan)
+
+        if action == 'table_import':
+            self._query_stage(request, 'form')
+            return self.import_response(request, model_config, plan)
+
+        if action == 'table_jobs':
+            self._query_stage(request, 'render')
+            return self.jobs_response(request, model_config, plan)
+
+        # add/change pages only render the form, so skip all list-page work
+        if action is not None:
+            self._query_stage(request, 'form')
+            return self.form_response(request, model_config, plan, action=action, id=id)
+
+        # answer conditional GETs before any list-page work
+        validators = None
+        if model_config.get_conditional_get():
+            self._query_stage(request, 'conditional')
+            validators = model_config.get_list_validators(request)
+            not_modified = self._conditional_response(request, *validators)
+            if not_modified is not None:
+                return not_modified
 
-            if id and action in ['table_change'] and model_config.has_change_permission():
-                qs = model_config.get_queryset(request)
-                object = qs.get(id=id)
-                form = form_class(request.POST or None, initial=object.__dict__)
-                if model_config.get_readonly_fields():
-                    for readonly_field in model_config.get_readonly_fields():
-                        if readonly_field in form.fields:
-                            form.fields[readonly_field].widget.attrs['readonly'] = True
-                form_layout = model_config.get_form_layout(form=form, obj=object)
-
-        list_display = model_config.get_list_display()
         # initiate data object
         objects, table_fields = model_config.queryset(request)
 
         # get search, filter and sort
-        search_fields = model_config.get_search_fields()
-        list_filter = model_config.get_list_filter()
-        sortable_by = model_config.get_sortable_by()
+        self._query_stage(request, 'filter_options')
         list_filter_options = model_config.get_filter_options()
 
         search_query = request.GET.get("q", "")
@@ -147,64 +237,250 @@ class FrontendModelView(TemplateView):
 
 
         # Apply search, filter and sort
-        objects = model_config.get_search_results(objects, search_fields, search_query)
-        objects = model_config.get_filter_results(objects, list_filter, filter_args)
-        objects = model_config.get_sort_results(objects, sortable_by, sort_args)
+        objects = model_config.get_search_results(objects, plan.search_fields, search_query)
+        self._query_stage(request, 'facets')
+        facet_counts = model_config.get_facet_counts(objects, list_filter_options, filter_args)
+        objects = model_config.get_filter_results(objects, plan.list_filter, filter_args)
+        objects = model_config.get_sort_results(objects, plan.sortable_by, sort_args)
 
         # Pagination
+        self._query_stage(request, 'pagination')
         objects = model_config.get_pagination(request, objects)
 
-        inline_button = model_config.get_inline_button()
-        inline_actions = model_config.get_inline_actions()
-        toolbar_actions = model_config.get_toolbar_actions()
-        table_fields += model_config.get_model_actions(inline_button)
+        # a cached table body skips the page rows query and the row rendering
+        fragment_key, fragment = self._get_table_fragment(request, model_config, plan)
+        if fragment is None:
+            objects = model_config.resolve_display_values(objects, table_fields)
+
+        return self.list_page_response(
+            request, model_config, plan, objects, table_fields, list_filter_options, facet_counts,
+            fragment_key=fragment_key, fragment=fragment, validators=validators,
+        )
 
+    @staticmethod
+    def _fragment_template(plan):
+        return 'frontend/_cards.html' if plan.option['table']['cards'] else 'frontend/_table.html'
+
+    def _get_table_fragment(self, request, model_config, plan):
+        """
+        Returns (cache key, cached table body or None); (None, None) without `table_cache`.
+        """
+
+        if not model_config.get_table_cache():
+            return None, None
+        fragment_key = table_fragment_cache_key(model_config, request, self._fragment_template(plan))
+        return fragment_key, get_table_fragment(model_config.table_cache_backend, fragment_key)
+
+    def list_page_response(self, request, model_config, plan, objects, table_fields, list_filter_options,
+                           facet_counts, fragment_key=None, fragment=None, validators=None, filter_specs=None):
+        """
+        Renders the list page from the page of rows and the filter options and
+        counts, storing the rendered table body when `table_cache` is on.
+        `filter_specs` are built here unless given; their relation labels
+        query the database, so async callers build them in a thread.
+        """
+
+        search_query = request.GET.get("q", "")
+        sort_args = request.GET.get("s", "")
+        filter_args = model_config.get_filter_args(request.GET)
+        columns = tuple(table_fields)
+        table_fields += plan.inline_button
+        if filter_specs is None:
+            filter_specs = model_config.get_filter_specs(list_filter_options, filter_args, facet_counts)
+
+        self._query_stage(request, 'render')
+
+        table = {
+            "objects": objects,
+            "columns": columns,
+            "fields": table_fields,
+            "inline_button": plan.inline_button,
+            "inline_actions": plan.inline_actions,
+            "bulk_actions": plan.bulk_actions,
+            "toolbar_button": plan.toolbar_button,
+            "toolbar_actions": plan.toolbar_actions,
+            "search_query": search_query,
+            "filter_fields": plan.list_filter,
+            "list_filter_options": list_filter_options,
+            "facet_counts": facet_counts,
+            "filter_specs": filter_specs,
+            "filter_args": filter_args,
+            "sort_fields": plan.sortable_by,
+            "sort_args": sort_args,
+        }
+        if fragment_key is not None:
+            if fragment is None:
+                fragment = render_table_fragment(self._fragment_template(plan), {
+                    "option": plan.option,
+                    "table": table,
+                    "segments": request.path.split("/"),
+                })
+                set_table_fragment(model_config.table_cache_backend, fragment_key, fragment,
+                                   model_config.table_cache_timeout)
+            table["fragment"] = inject_csrf_token(request, fragment)
+
+        response = site.http_model_response(
+            request,
+            context={
+                "option": plan.option,
+                "site": plan.site,
+                "table": table,
+            })
+        return self._set_validators(response, *validators) if validators else response
+
+    @staticmethod
+    def _export_format(request, plan):
+        export_format = request.GET.get('format', '')
+        if not plan.option['table']['show'] or export_format not in plan.option['table']['export_formats'] \
+                or export_format not in EXPORT_FORMATS:
+            raise Http404(f"Export format '{export_format}' is not available.")
+        return export_format
+
+    def export_response(self, request, model_config, plan):
+        """
+        Streams the rows of the current list view (search, filters and sort
+        from the query string) in `?format=`, which must be one of the
+        model's `export_formats`. Rows are read with iterator(chunk_size),
+        which uses server-side cursors where the database supports them.
+        """
+
+        export_format = self._export_format(request, plan)
+        chunk_size = model_config.export_chunk_size
+        rows = model_config.get_export_queryset(request).iterator(chunk_size=chunk_size)
+        return export_response(rows, model_config.get_export_fields(), export_format, plan.model_name, chunk_size)
+
+    def import_response(self, request, model_config, plan):
+        """
+        Renders the import page and, for a POST, imports the uploaded file in
+        `import_batch_size` batches validated with the model's generated form.
+        Needs add permission and a format in `import_formats`.
+        """
+
+        formats = [name for name in plan.option['table']['import_formats'] if name in ROW_READERS]
+        if not plan.option['table']['add'] or not formats:
+            raise Http404("Import is not available.")
+
+        result = None
+        if request.method == 'POST':
+            form = ImportForm(request.POST, request.FILES, formats=formats)
+            if form.is_valid():
+                rows = ROW_READERS[form.cleaned_data['format']](form.cleaned_data['file'])
+                result = import_rows(model_config.model, model_config.get_form(), rows,
+                                     batch_size=model_config.import_batch_size,
+                                     max_errors=model_config.import_max_errors)
+                form = ImportForm(formats=formats)
+        else:
+            form = ImportForm(formats=formats)
+
+        self._query_stage(request, 'render')
         return site.http_model_response(
             request,
             context={
-                "option": {
-                    "site": {
-                        "title": getattr(model_config, 'title', True),
-                        "description": getattr(model_config, 'description', False),
-                    },
-                    "table": {
-                        "toolbar_button": model_config.get_toolbar_button(),
-                        "toolbar_actions": toolbar_actions,
-                        "cards": model_config.get_cards(),
-                        "show": model_config.has_view_permission(),
-                        "add": model_config.has_add_permission(),
-                        "change": model_config.has_change_permission(),
-                        "delete": model_config.has_delete_permission(),
-                        "search": model_config.get_search_fields(),
-                        "filter": model_config.get_list_filter(),
-                        "sort": model_config.get_sortable_by(),
-                        "inline_button": model_config.get_inline_button(),
-                        "inline_actions": inline_actions,
-                    },
-                },
-                "site": {
-                    "title": getattr(model._meta, 'verbose_name_plural',
-                                     getattr(model._meta, 'verbose_name', model._meta.model_name)),
-                    "description": getattr(model_config, 'description', False),
+                "option": plan.option,
+                "site": plan.site,
+                "table": {
+                    "import_form": form,
+                    "import_result": result,
+                    "import_formats": formats,
                 },
+            })
+
+    def jobs_response(self, request, model_config, plan):
+        """
+        Renders the status of the user's latest background jobs of the model,
+        the fragment the list toolbar polls while any of them is active.
+        """
+
+        if not plan.option['table']['background_actions']:
+            raise Http404("This model has no background actions.")
+
+        jobs = get_jobs(request, model_config.model)
+        response = HttpResponse(site.render_to_string('frontend/_jobs.html', {
+            "jobs": jobs,
+            "active": any(job.active for job in jobs),
+        }, request))
+        patch_cache_control(response, no_store=True)
+        return response
+
+    def form_response(self, request, model_config, plan, action=None, id=None, object=None):
+        """
+        Renders the add/change form page. Only the single-object lookup and
+        form construction run here; no list queryset, filter options, search,
+        sort or pagination work is done. `object` skips the lookup when the
+        caller already fetched it.
+        """
+
+        form_class = model_config.get_form()
+
+        if id and action == 'table_change' and plan.option['table']['change']:
+            if object is None:
+                qs = model_config.get_queryset(request)
+                object = qs.get(id=id)
+            form = form_class(request.POST or None, initial=object.__dict__)
+            for readonly_field in plan.readonly_fields:
+                if readonly_field in form.fields:
+                    form.fields[readonly_field].widget.attrs['readonly'] = True
+        else:
+            form = form_class()
+        form_layout = model_config.get_form_layout(form=form, obj=object)
+
+        self._query_stage(request, 'render')
+        return site.http_model_response(
+            request,
+            context={
+                "option": plan.option,
+                "site": plan.site,
                 "table": {
-                    "form": form or None,
+                    "form": form,
                     "form_layout": form_layout,
-                    "objects": objects,
-                    "fields": table_fields,
-                    "inline_button": inline_button,
-                    "inline_actions": inline_actions,
-                    "toolbar_button": model_config.get_toolbar_button(),
-                    "toolbar_actions": toolbar_actions,
-                    "search_query": search_query,
-                    "filter_fields": list_filter,
-                    "list_filter_options": list_filter_options,
-                    "filter_args": filter_args,
-                    "sort_fields": sortable_by,
-                    "sort_args": sort_args,
+                    "inline_button": plan.inline_button,
+                    "inline_actions": plan.inline_actions,
                 }
             })
 
+    @staticmethod
+    def run_action(request, model_config, kind, name, handler, **arguments):
+        """
+        Calls an action handler within the request, or queues handlers marked
+        `@action(background=True)` as a FrontendJob for a local worker, so the
+        request returns at once.
+        """
+
+        if getattr(handler, 'background', False) is True:
+            enqueue_job(request, model_config, kind, name, **arguments)
+        else:
+            call_action(model_config, request, kind, handler, **arguments)
+
+    def bulk_action(self, request, model_config):
+        """
+        Runs the `bulk_action` named in the POST, which must be declared in
+        `bulk_button`, on the rows whose ids are posted as `ids`. The handler
+        gets one queryset of the selected rows, scoped by get_queryset(), so
+        it can change them with a single UPDATE or DELETE; handlers marked
+        with `@action(per_object=True)` are called once per object instead.
+        """
+
+        name = request.POST.get('bulk_action', '')
+        if name not in model_config.get_bulk_button():
+            return
+        handler = getattr(model_config, name, None)
+        if not callable(handler):
+            logger.warning(
+                "Action '%s' declared in bulk_button for %s is not callable.",
+                name, model_config.__class__.__name__,
+            )
+            return
+
+        pk = model_config.model._meta.pk
+        try:
+            ids = {pk.to_python(value) for value in request.POST.getlist('ids')}
+        except ValidationError:
+            return
+        if not ids:
+            return
+
+        self.run_action(request, model_config, 'bulk', name, handler, ids=ids)
+
     def post(self, request, *args, app_name=None, model_name=None, action=None, id=None):
         """
         Handles POST requests for the FrontendModelView.
@@ -225,7 +501,8 @@ class FrontendModelView(TemplateView):
 
         # get model site config
         model = apps.get_model(app_name, model_name)
-        model_config = site.get_model_config(model)
+        plan = site.get_model_plan(model)
+        model_config = plan.model_config
 
         # Centralised per-model authentication check (same as GET)
         model_auth_response = self._check_model_auth(request, model_config)
@@ -234,6 +511,14 @@ class FrontendModelView(TemplateView):
 
         # Fallback URL for safe redirects
         fallback_url = f"/{app_name}/{model_name}/"
+        self._query_stage(request, 'action')
+
+        if action == 'table_import':
+            return self.import_response(request, model_config, plan)
+
+        if action == 'table_bulk':
+            self.bulk_action(request, model_config)
+            return _safe_redirect(request, fallback=fallback_url)
 
         # create model forms
         form_class = model_config.get_form()
@@ -244,26 +529,27 @@ class FrontendModelView(TemplateView):
             form = form_class(request.POST, instance=object)
             if form.is_valid():
                 form.save()
-            return _safe_redirect(request, fallback=fallback_url)
+            return self._form_redirect(request, action, fallback_url)
 
         if action == 'table_add' and model_config.add_permission:
             form = form_class(request.POST)
             if form.is_valid():
                 form.save()
-            return _safe_redirect(request, fallback=fallback_url)
+            return self._form_redirect(request, action, fallback_url)
 
         if action == 'table_delete' and model_config.delete_permission:
             qs = model_config.get_queryset(request)
             object = qs.get(id=id)
             object.delete()
-            return HttpResponseRedirect(fallback_url)
+            return self._form_redirect(request, action, fallback_url)
 
         # Toolbar button dispatch — validate action is declared AND callable
         toolbar_actions = getattr(model_config, 'toolbar_button', ())
         if action and action in toolbar_actions:
             handler = getattr(model_config, action, None)
             if callable(handler):
-                handler()
+                # the list's query string is posted along, so filtered handlers get the rows the user sees
+                self.run_action(request, model_config, 'toolbar', action, handler, query=request.POST.get('query', ''))
             else:
                 logger.warning(
                     "Action '%s' declared in toolbar_button for %s is not callable.",
@@ -276,9 +562,7 @@ class FrontendModelView(TemplateView):
         if action and action in inline_actions:
             handler = getattr(model_config, action, None)
             if callable(handler):
-                qs = model_config.get_queryset(request)
-                object = qs.get(id=id)
-                handler(object)
+                self.run_action(request, model_config, 'inline', action, handler, object_id=id)
             else:
                 logger.warning(
                     "Action '%s' declared in inline_button for %s is not callable.",
@@ -290,6 +574,164 @@ class FrontendModelView(TemplateView):
         return HttpResponseRedirect(fallback_url)
 
 
+class AsyncFrontendModelView(FrontendModelView):
+    """
+    FrontendModelView with async handlers, for ASGI deployments
+    (`FRONTEND_ASYNC_VIEWS = True`). The list page counts and reads its page
+    rows with the async ORM while the filter options and facet counts load,
+    the change page and the change and delete actions fetch their object
+    with aget(), and exports stream from aiterator(). The landing, add,
+    import and job pages and all action handlers run the synchronous view
+    code in a thread.
+
+    Query tracking is not applied: it wraps the connections of the request
+    thread, and the async ORM runs its queries in another thread.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        # load the user once, so the sync auth checks below do not query
+        if hasattr(request, 'auser'):
+            request.user = await request.auser()
+        return await TemplateView.dispatch(self, request, *args, **kwargs)
+
+    async def get(self, request, *args, app_name=None, model_name=None, action=None, id=None):
+        if model_name is None or action not in (None, 'table_change', 'table_export'):
+            return await sync_to_async(super().get)(
+                request, *args, app_name=app_name, model_name=model_name, action=action, id=id,
+            )
+
+        auth_response = self._check_global_auth(request)
+        if auth_response:
+            return auth_response
+
+        model = apps.get_model(app_name, model_name)
+        plan = site.get_model_plan(model)
+        model_config = plan.model_config
+
+        model_auth_response = self._check_model_auth(request, model_config)
+        if model_auth_response:
+            return model_auth_response
+
+        if action == 'table_export':
+            return await self.aexport_response(request, model_config, plan)
+        if action == 'table_change':
+            return await self.aform_response(request, model_config, plan, id=id)
+        return await self.alist_response(request, model_config, plan)
+
+    async def alist_response(self, request, model_config, plan):
+        """
+        Async list page: the page rows and count (aget_pagination()) are
+        awaited together with the filter options and facet counts.
+        """
+
+        validators = None
+        if model_config.get_conditional_get():
+            validators = await sync_to_async(model_config.get_list_validators)(request)
+            not_modified = self._conditional_response(request, *validators)
+            if not_modified is not None:
+                return not_modified
+
+        objects, table_fields = model_config.queryset(request)
+        search_query = request.GET.get("q", "")
+        sort_args = request.GET.get("s", "")
+        filter_args = model_config.get_filter_args(request.GET)
+
+        # search backends may inspect the database before searching
+        if plan.search_fields and search_query:
+            objects = await sync_to_async(model_config.get_search_results)(objects, plan.search_fields, search_query)
+        filtered = objects
+        if plan.list_filter and filter_args:
+            # search input filters look up the cached filter options
+            filtered = await sync_to_async(model_config.get_filter_results)(objects, plan.list_filter, filter_args)
+        filtered = model_config.get_sort_results(filtered, plan.sortable_by, sort_args)
+
+        fragment_key = fragment = None
+        if model_config.get_table_cache():
+            fragment_key, fragment = await sync_to_async(self._get_table_fragment)(request, model_config, plan)
+
+        def load_filters():
+            options = model_config.get_filter_options()
+            counts = model_config.get_facet_counts(objects, options, filter_args)
+            # relation filters label their options with in_bulk()
+            return options, counts, model_config.get_filter_specs(options, filter_args, counts)
+
+        pagination = model_config.aget_pagination(request, filtered, fetch_rows=fragment is None)
+        if plan.list_filter:
+            (list_filter_options, facet_counts, filter_specs), page = await asyncio.gather(
+                sync_to_async(load_filters)(), pagination,
+            )
+        else:
+            (list_filter_options, facet_counts, filter_specs), page = ({}, {}, []), await pagination
+
+        if fragment is None:
+            if model_config.get_relation_columns(table_fields):
+                # foreign key labels are loaded with in_bulk()
+                page = await sync_to_async(model_config.resolve_display_values)(page, table_fields)
+            else:
+                page = model_config.resolve_display_values(page, table_fields)
+
+        return self.list_page_response(
+            request, model_config, plan, page, table_fields, list_filter_options, facet_counts,
+            fragment_key=fragment_key, fragment=fragment, validators=validators, filter_specs=filter_specs,
+        )
+
+    async def aform_response(self, request, model_config, plan, id=None):
+        object = None
+        if id and plan.option['table']['change']:
+            object = await model_config.get_queryset(request).aget(id=id)
+        # form fields may query while rendering, e.g. model choices
+        return await sync_to_async(self.form_response)(
+            request, model_config, plan, action='table_change', id=id, object=object,
+        )
+
+    async def aexport_response(self, request, model_config, plan):
+        export_format = self._export_format(request, plan)
+        chunk_size = model_config.export_chunk_size
+        objects = await sync_to_async(model_config.get_export_queryset)(request)
+        return export_response(objects.aiterator(chunk_size=chunk_size), model_config.get_export_fields(),
+                               export_format, plan.model_name, chunk_size)
+
+    async def post(self, request, *args, app_name=None, model_name=None, action=None, id=None):
+        if action not in ('table_change', 'table_delete'):
+            return await sync_to_async(super().post)(
+                request, *args, app_name=app_name, model_name=model_name, action=action, id=id,
+            )
+
+        auth_response = self._check_global_auth(request)
+        if auth_response:
+            return auth_response
+
+        model = apps.get_model(app_name, model_name)
+        plan = site.get_model_plan(model)
+        model_config = plan.model_config
+
+        model_auth_response = self._check_model_auth(request, model_config)
+        if model_auth_response:
+            return model_auth_response
+
+        fallback_url = f"/{app_name}/{model_name}/"
+
+        if action == 'table_change' and model_config.change_permission:
+            object = await model_config.get_queryset(request).aget(id=id)
+            form = model_config.get_form()(request.POST, instance=object)
+
+            # validation may query too, e.g. unique checks
+            def save():
+                if form.is_valid():
+                    form.save()
+
+            await sync_to_async(save)()
+            return self._form_redirect(request, action, fallback_url)
+
+        if action == 'table_delete' and model_config.delete_permission:
+            object = await model_config.get_queryset(request).aget(id=id)
+            await object.adelete()
+            return self._form_redirect(request, action, fallback_url)
+
+        # no matching action, as in the sync view
+        return HttpResponseRedirect(fallback_url)
+
+
 class FrontendAbstractView(TemplateView):
     """
     An abstract view that serves as a base for frontend views, providing common context data.
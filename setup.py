@@ -32,5 +32,8 @@ setup(
         'django>=4.2',
         'django_bootstrap5>=26.2',
     ],
+    extras_require={
+        'jinja2': ['Jinja2>=3.1'],
+    },
     include_package_data=True,
 )